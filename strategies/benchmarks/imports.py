@@ -0,0 +1,152 @@
+"""
+Import-time budget of the strategies package.
+
+    python -m strategies.benchmarks.imports --budget-ms 250
+
+Every module of `strategies.src` is imported alone in a fresh
+interpreter under `-X importtime`. The report lists its
+cumulative import time, the total of the process, the peak RSS
+and the heavy numeric packages it loaded eagerly. The check
+fails when a module exceeds the budget or loads a forbidden
+package at import time; modules that fail to import are listed
+without failing the check.
+"""
+import argparse
+import json
+import pkgutil
+import subprocess
+import sys
+from typing import Any
+
+import strategies.src
+
+# Packages that must be loaded on first use, not on import
+HEAVY = ("pandas", "numba", "scipy", "talib", "pandas_ta", "matplotlib")
+
+_PROBE = (
+    "import resource, sys; import {module}; "
+    "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+)
+
+
+def modules() -> list[str]:
+    """
+    Names of every module of `strategies.src`.
+    """
+    return sorted(
+        info.name
+        for info in pkgutil.walk_packages(
+            strategies.src.__path__, "strategies.src.", onerror=lambda _: None
+        )
+    )
+
+
+def measure(module: str) -> dict[str, Any]:
+    """
+    Imports `module` in a fresh interpreter.
+    Returns:
+        dict[str, Any]: "cumulative_us" of the module itself,
+          "total_us" of the process, "rss_kb", the eagerly
+          loaded "heavy" packages, and "error" (None on success).
+    """
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module)],
+        capture_output=True, text=True,
+    )
+    cumulative = total = 0
+    loaded = set()
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self, cumulative_us, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            # Imports at the top level of the process
+            total += int(cumulative_us)
+        name = name.strip()
+        loaded.add(name.split(".")[0])
+        if name == module:
+            cumulative = int(cumulative_us)
+    error = None
+    if out.returncode != 0:
+        error = (out.stderr.strip().splitlines() or ["unknown error"])[-1]
+    return {
+        "module": module,
+        "cumulative_us": cumulative,
+        "total_us": total,
+        "rss_kb": int(out.stdout.strip() or 0) if error is None else None,
+        "heavy": sorted(loaded.intersection(HEAVY)),
+        "error": error,
+    }
+
+
+def check(
+    results: list[dict[str, Any]],
+    budget_ms: float,
+    forbidden: tuple[str, ...]
+) -> list[str]:
+    """
+    Returns:
+        list[str]: Budget and eager-import violations, one line each.
+    """
+    violations = []
+    for row in results:
+        if row["error"] is not None:
+            continue
+        if row["cumulative_us"] > budget_ms * 1000:
+            violations.append(
+                f"{row['module']}: {row['cumulative_us'] / 1000:.1f} ms "
+                f"over the {budget_ms:g} ms budget"
+            )
+        eager = [name for name in row["heavy"] if name in forbidden]
+        if eager:
+            violations.append(
+                f"{row['module']}: imports {', '.join(eager)} eagerly"
+            )
+    return violations
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m strategies.benchmarks.imports",
+        description="Import-time budget of the strategies package.",
+    )
+    parser.add_argument(
+        "--budget-ms", type=float, default=250.0,
+        help="Cumulative import time allowed per module.",
+    )
+    parser.add_argument(
+        "--forbid", nargs="*", default=list(HEAVY),
+        help="Packages a module may not import eagerly.",
+    )
+    parser.add_argument("--out", help="JSON report path.")
+    args = parser.parse_args(argv)
+
+    results = [measure(module) for module in modules()]
+    for row in sorted(results, key=lambda row: -row["cumulative_us"]):
+        if row["error"] is not None:
+            print(f"{row['module']:60} error: {row['error']}")
+            continue
+        print(
+            f"{row['module']:60} {row['cumulative_us'] / 1000:8.1f} ms "
+            f"{row['total_us'] / 1000:8.1f} ms total "
+            f"{row['rss_kb'] / 1024:7.1f} MB "
+            f"{' '.join(row['heavy'])}"
+        )
+    violations = check(results, args.budget_ms, tuple(args.forbid))
+    for line in violations:
+        print(line)
+    if args.out:
+        with open(args.out, "w") as out:
+            json.dump(
+                {
+                    "budget_ms": args.budget_ms,
+                    "results": results,
+                    "violations": violations,
+                },
+                out, indent=2,
+            )
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
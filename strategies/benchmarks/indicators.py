@@ -0,0 +1,1050 @@
+"""
+Throughput benchmarks of the indicator classes on synthetic candles.
+
+    python -m strategies.benchmarks.indicators run --out new.json
+    python -m strategies.benchmarks.indicators compare old.json new.json
+
+Every public method of every indicator class is a case named
+`Class.method`; `Class.method[pandas_ta]` times the pandas-ta
+backend of the indicators that have one. A case is timed warm (numba kernels compiled,
+best and median of `--repeats` calls) for every regime and size,
+and cold (first call in a fresh interpreter, compilation
+included) once at the smallest size. Peak memory is the
+tracemalloc peak of one warm call: numpy buffers are traced,
+allocations made inside compiled numba code are not.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+import numba
+import numpy as np
+import pandas as pd
+
+from strategies.benchmarks.synthetic import REGIMES, synthetic_ohlcv
+from strategies.src.domain.entities import (
+    AcceletrationBandsDM,
+    AdxConfigDM,
+    AvslConfigDM,
+    OrderBlockDetectorDM,
+    RsiCloudsConfigDM,
+    ScrsiConfigDM,
+    StochRsiConfigDM,
+)
+from strategies.src.infrastructure._types import OhlcvBlock, PriceDataFrame
+from strategies.src.infrastructure.indicators.acceleration_bands import (
+    AccelerationBands,
+)
+from strategies.src.infrastructure.indicators.adx import ADXTrend, StreamingAdx
+from strategies.src.infrastructure.indicators.avsl import AVSL
+from strategies.src.infrastructure.indicators.graph import IndicatorGraph
+from strategies.src.infrastructure.indicators.order_block import (
+    OrderBlockDetector,
+    StreamingOrderBlocks,
+)
+from strategies.src.infrastructure.indicators.rsi_clouds import (
+    RsiClouds,
+    StreamingRsiClouds,
+)
+from strategies.src.infrastructure.indicators.scrsi import (
+    SmoothCicleRsi,
+    StreamingScrsi,
+)
+from strategies.src.infrastructure.indicators.signals import IndicatorSignals
+from strategies.src.infrastructure.indicators.stoch_rsi import StochRSI
+from strategies.src.infrastructure.indicators.sweep import IndicatorSweep
+from strategies.src.infrastructure.indicators.zones import OrderBlockZones
+from strategies.src.infrastructure.resample import BarResampler, resample
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+SEED = 0
+
+# Indicator classes whose public methods must all have a case
+BENCHMARKED = (
+    AccelerationBands,
+    ADXTrend,
+    StreamingAdx,
+    AVSL,
+    IndicatorGraph,
+    OrderBlockDetector,
+    StreamingOrderBlocks,
+    RsiClouds,
+    StreamingRsiClouds,
+    SmoothCicleRsi,
+    StreamingScrsi,
+    StochRSI,
+    IndicatorSignals,
+    IndicatorSweep,
+    OrderBlockZones,
+    BarResampler,
+)
+
+ADX = AdxConfigDM()
+AVSL_CONFIG = AvslConfigDM(length_fast=5, length_slow=20, stand_div=2.0)
+STOCH_RSI = StochRsiConfigDM(
+    timeperiod=14, fastk_period=14, fastd_period=3, fastd_matype=0
+)
+RSI_CLOUDS = RsiCloudsConfigDM()
+ACC_BANDS = AcceletrationBandsDM(length=20, drift=1, offset=0)
+ORDER_BLOCKS = OrderBlockDetectorDM()
+SCRSI = ScrsiConfigDM()
+
+# Instruments of the batch cases, each a scaled copy of the candles
+_BLOCK_ROWS = 4
+# Instruments of the zone store cases
+_ZONE_INSTRUMENTS = 64
+
+
+@dataclass(slots=True, frozen=True)
+class BenchmarkCase:
+    """
+    One benchmarked call.
+    `setup` prepares the call for given candles and returns it
+    with the number of bars (or items) one call processes.
+    `fresh` cases consume their state and are set up again
+    before every call; `max_bars` caps the sizes of per-bar
+    Python loops.
+    """
+    name: str
+    setup: Callable[[PriceDataFrame], tuple[Callable[[], Any], int]]
+    max_bars: int | None = None
+    fresh: bool = False
+
+
+CASES: dict[str, BenchmarkCase] = {}
+
+
+def case(
+    name: str,
+    max_bars: int | None = None,
+    fresh: bool = False
+) -> Callable:
+    def register(setup: Callable) -> Callable:
+        CASES[name] = BenchmarkCase(name, setup, max_bars, fresh)
+        return setup
+    return register
+
+
+def uncovered() -> list[str]:
+    """
+    Public methods of the benchmarked classes without a case.
+    """
+    return [
+        f"{cls.__name__}.{name}"
+        for cls in BENCHMARKED
+        for name, member in vars(cls).items()
+        if not name.startswith("_")
+        and not isinstance(member, property)
+        and f"{cls.__name__}.{name}" not in CASES
+    ]
+
+
+def _block(data: PriceDataFrame) -> OhlcvBlock:
+    scale = 1.0 + 0.01 * np.arange(_BLOCK_ROWS)[:, None]
+    return OhlcvBlock(
+        open=data.open_price * scale,
+        high=data.high_prices * scale,
+        low=data.low_prices * scale,
+        close=data.close_prices * scale,
+        volume=np.broadcast_to(data.volumes, (_BLOCK_ROWS, len(data))),
+    )
+
+
+def _bars(data: PriceDataFrame) -> tuple[np.ndarray, ...]:
+    return (
+        data.open_price, data.high_prices,
+        data.low_prices, data.close_prices,
+    )
+
+
+# Acceleration Bands
+
+@case("AccelerationBands.calc_accbands")
+def _(data):
+    return lambda: AccelerationBands().calc_accbands(data, ACC_BANDS), len(data)
+
+
+@case("AccelerationBands.calc_accbands[pandas_ta]")
+def _(data):
+    config = replace(ACC_BANDS, backend="pandas_ta")
+    return lambda: AccelerationBands().calc_accbands(data, config), len(data)
+
+
+@case("AccelerationBands.calc_accbands_batch")
+def _(data):
+    block = _block(data)
+    return (
+        lambda: AccelerationBands().calc_accbands_batch(block, ACC_BANDS),
+        block.close.size,
+    )
+
+
+@case("AccelerationBands.generate_signals")
+def _(data):
+    bands = AccelerationBands().calc_accbands(data, ACC_BANDS)
+    return lambda: AccelerationBands().generate_signals(bands), len(data)
+
+
+@case("AccelerationBands.signals")
+def _(data):
+    return lambda: AccelerationBands().signals(data, ACC_BANDS), len(data)
+
+
+@case("AccelerationBands.check_last_signal")
+def _(data):
+    return (
+        lambda: AccelerationBands().check_last_signal(data, ACC_BANDS),
+        len(data),
+    )
+
+
+# ADX
+
+@case("ADXTrend.calculate_adx")
+def _(data):
+    return lambda: ADXTrend().calculate_adx(data, ADX), len(data)
+
+
+@case("ADXTrend.calculate_adx[pandas_ta]")
+def _(data):
+    config = replace(ADX, backend="pandas_ta")
+    return lambda: ADXTrend().calculate_adx(data, config), len(data)
+
+
+@case("ADXTrend.calculate_adx_batch")
+def _(data):
+    block = _block(data)
+    return lambda: ADXTrend().calculate_adx_batch(block, ADX), block.close.size
+
+
+@case("ADXTrend.get_signal")
+def _(data):
+    adx = ADXTrend().calculate_adx(data, ADX)
+    return lambda: ADXTrend().get_signal(25, adx), len(data)
+
+
+@case("StreamingAdx.from_history")
+def _(data):
+    return lambda: StreamingAdx.from_history(data, ADX), len(data)
+
+
+@case("StreamingAdx.backfill", fresh=True)
+def _(data):
+    stream = StreamingAdx(ADX)
+    return (
+        lambda: stream.backfill(
+            data.high_prices, data.low_prices, data.close_prices
+        ),
+        len(data),
+    )
+
+
+@case("StreamingAdx.update", max_bars=1_000_000, fresh=True)
+def _(data):
+    stream = StreamingAdx(ADX)
+    bars = list(zip(data.high_prices.tolist(), data.low_prices.tolist(),
+                    data.close_prices.tolist()))
+
+    def run():
+        for high, low, close in bars:
+            stream.update(high, low, close)
+    return run, len(data)
+
+
+@case("StreamingAdx.is_trending", max_bars=1_000_000)
+def _(data):
+    stream = StreamingAdx.from_history(data, ADX)
+    thresholds = np.linspace(0.0, 100.0, len(data)).tolist()
+
+    def run():
+        for threshold in thresholds:
+            stream.is_trending(threshold)
+    return run, len(data)
+
+
+# AVSL
+
+@case("AVSL.calculate_avsl")
+def _(data):
+    return lambda: AVSL().calculate_avsl(data, AVSL_CONFIG), len(data)
+
+
+@case("AVSL.calculate_avsl[pandas_ta]")
+def _(data):
+    config = replace(AVSL_CONFIG, backend="pandas_ta")
+    return lambda: AVSL().calculate_avsl(data, config), len(data)
+
+
+@case("AVSL.calculate_avsl_batch")
+def _(data):
+    block = _block(data)
+    return lambda: AVSL().calculate_avsl_batch(block, AVSL_CONFIG), block.close.size
+
+
+def _vpci_inputs(data: PriceDataFrame) -> tuple[np.ndarray, ...]:
+    rng = np.random.default_rng(SEED)
+    n = len(data)
+    return (
+        rng.normal(0.0, 2.0, (1, n)),
+        rng.lognormal(0.0, 0.1, (1, n)),
+        rng.normal(0.0, 2.0, (1, n)),
+    )
+
+
+@case("AVSL.compute_price_v_block")
+def _(data):
+    vpc, vpr, vpci = _vpci_inputs(data)
+    low = data.low_prices[None]
+    return lambda: AVSL.compute_price_v_block(low, vpc, vpr, vpci), len(data)
+
+
+@case("AVSL.compute_len_v")
+def _(data):
+    vpc, _vpr, vpci = _vpci_inputs(data)
+    return lambda: AVSL.compute_len_v(vpc, vpci), len(data)
+
+
+@case("AVSL.compute_vpcc")
+def _(data):
+    vpc, _vpr, _vpci = _vpci_inputs(data)
+    return lambda: AVSL.compute_vpcc(vpc), len(data)
+
+
+@case("AVSL.get_last_avsl_signal")
+def _(data):
+    return lambda: AVSL().get_last_avsl_signal(data, AVSL_CONFIG), len(data)
+
+
+# Indicator graph, every call on a new graph so nothing is reused
+
+def _graph_case(name: str, call: Callable[[IndicatorGraph], Any]) -> None:
+    @case(f"IndicatorGraph.{name}")
+    def _(data):
+        return lambda: call(IndicatorGraph(data)), len(data)
+
+
+_graph_case("get", lambda g: g.get(("rsi", "close", 14)))
+_graph_case("sma", lambda g: g.sma("close", 20))
+_graph_case("ema", lambda g: g.ema("close", 20))
+_graph_case("rma", lambda g: g.rma("close", 20))
+_graph_case("ma", lambda g: g.ma(0, "close", 20))
+_graph_case("rsi", lambda g: g.rsi("close", 14))
+_graph_case("vwma", lambda g: g.vwma("close", 20))
+_graph_case("diff", lambda g: g.diff("close"))
+_graph_case("rolling_max", lambda g: g.rolling_max("high", 20))
+_graph_case("rolling_min", lambda g: g.rolling_min("low", 20))
+_graph_case("atr", lambda g: g.atr(14))
+_graph_case("average_price", lambda g: g.average_price())
+
+
+# Order blocks
+
+@case("OrderBlockDetector.zigzag_indicator")
+def _(data):
+    return (
+        lambda: OrderBlockDetector().zigzag_indicator(data, ORDER_BLOCKS),
+        len(data),
+    )
+
+
+@case("OrderBlockDetector.zigzag_indicator_batch")
+def _(data):
+    block = _block(data)
+    return (
+        lambda: OrderBlockDetector().zigzag_indicator_batch(block, ORDER_BLOCKS),
+        block.close.size,
+    )
+
+
+@case("StreamingOrderBlocks.backfill", max_bars=100_000, fresh=True)
+def _(data):
+    stream = StreamingOrderBlocks(ORDER_BLOCKS)
+    return lambda: stream.backfill(data), len(data)
+
+
+@case("StreamingOrderBlocks.update", max_bars=100_000, fresh=True)
+def _(data):
+    stream = StreamingOrderBlocks(ORDER_BLOCKS)
+    bars = list(zip(data.high_prices.tolist(), data.low_prices.tolist()))
+
+    def run():
+        for high, low in bars:
+            stream.update(high, low)
+    return run, len(data)
+
+
+@case("StreamingOrderBlocks.flush", max_bars=100_000, fresh=True)
+def _(data):
+    stream = StreamingOrderBlocks(ORDER_BLOCKS, lookback=len(data))
+    stream.backfill(data)
+    return stream.flush, len(data)
+
+
+# RSI Clouds
+
+@case("RsiClouds.prepare_data")
+def _(data):
+    return lambda: RsiClouds().prepare_data(data), len(data)
+
+
+@case("RsiClouds.calculate_rsi_clouds")
+def _(data):
+    return (
+        lambda: RsiClouds().calculate_rsi_clouds(data, RSI_CLOUDS),
+        len(data),
+    )
+
+
+@case("RsiClouds.calculate_rsi_clouds_batch")
+def _(data):
+    block = _block(data)
+    return (
+        lambda: RsiClouds().calculate_rsi_clouds_batch(block, RSI_CLOUDS),
+        block.close.size,
+    )
+
+
+@case("RsiClouds.create_signals")
+def _(data):
+    clouds = RsiClouds().calculate_rsi_clouds(data, RSI_CLOUDS)
+    # create_signals adds its columns to the given frame
+    return lambda: RsiClouds().create_signals(clouds.copy()), len(data)
+
+
+@case("RsiClouds.signals")
+def _(data):
+    return lambda: RsiClouds().signals(data, RSI_CLOUDS), len(data)
+
+
+@case("RsiClouds.get_last_signal")
+def _(data):
+    indicator = RsiClouds()
+    signals = indicator.create_signals(
+        indicator.calculate_rsi_clouds(data, RSI_CLOUDS)
+    )
+    return lambda: indicator.get_last_signal(signals), len(data)
+
+
+@case("StreamingRsiClouds.backfill", fresh=True)
+def _(data):
+    stream = StreamingRsiClouds(RSI_CLOUDS)
+    return lambda: stream.backfill(data), len(data)
+
+
+@case("StreamingRsiClouds.update", max_bars=1_000_000, fresh=True)
+def _(data):
+    stream = StreamingRsiClouds(RSI_CLOUDS)
+    bars = list(zip(*(column.tolist() for column in _bars(data))))
+
+    def run():
+        for open_, high, low, close in bars:
+            stream.update(open_, high, low, close)
+    return run, len(data)
+
+
+@case("StreamingRsiClouds.signals", max_bars=1_000_000)
+def _(data):
+    stream = StreamingRsiClouds(RSI_CLOUDS)
+    stream.backfill(data)
+
+    def run():
+        for _bar in range(len(data)):
+            stream.signals()
+    return run, len(data)
+
+
+@case("StreamingRsiClouds.last_signal", max_bars=1_000_000)
+def _(data):
+    stream = StreamingRsiClouds(RSI_CLOUDS)
+    stream.backfill(data)
+
+    def run():
+        for _bar in range(len(data)):
+            stream.last_signal()
+    return run, len(data)
+
+
+# SCRSI
+
+@case("SmoothCicleRsi.calculate_scrsi")
+def _(data):
+    return lambda: SmoothCicleRsi().calculate_scrsi(data, SCRSI), len(data)
+
+
+@case("SmoothCicleRsi.calculate_scrsi_batch")
+def _(data):
+    block = _block(data)
+    return (
+        lambda: SmoothCicleRsi().calculate_scrsi_batch(block, SCRSI),
+        block.close.size,
+    )
+
+
+@case("SmoothCicleRsi.generate_scrsi_signals")
+def _(data):
+    scrsi = SmoothCicleRsi().calculate_scrsi(data, SCRSI)
+    return lambda: SmoothCicleRsi().generate_scrsi_signals(scrsi), len(data)
+
+
+@case("SmoothCicleRsi.signals")
+def _(data):
+    return lambda: SmoothCicleRsi().signals(data, SCRSI), len(data)
+
+
+@case("SmoothCicleRsi.get_last_signal")
+def _(data):
+    return lambda: SmoothCicleRsi().get_last_signal(data, SCRSI), len(data)
+
+
+@case("StreamingScrsi.backfill", fresh=True)
+def _(data):
+    stream = StreamingScrsi(SCRSI)
+    return lambda: stream.backfill(data.close_prices), len(data)
+
+
+@case("StreamingScrsi.update", max_bars=1_000_000, fresh=True)
+def _(data):
+    stream = StreamingScrsi(SCRSI)
+    closes = data.close_prices.tolist()
+
+    def run():
+        for close in closes:
+            stream.update(close)
+    return run, len(data)
+
+
+@case("StreamingScrsi.last_signal", max_bars=1_000_000)
+def _(data):
+    stream = StreamingScrsi(SCRSI)
+    stream.backfill(data.close_prices)
+
+    def run():
+        for _bar in range(len(data)):
+            stream.last_signal()
+    return run, len(data)
+
+
+# Stochastic RSI
+
+@case("StochRSI.calculate_stochrsi")
+def _(data):
+    return lambda: StochRSI().calculate_stochrsi(data, STOCH_RSI), len(data)
+
+
+@case("StochRSI.calculate_stochrsi_batch")
+def _(data):
+    block = _block(data)
+    return (
+        lambda: StochRSI().calculate_stochrsi_batch(block, STOCH_RSI),
+        block.close.size,
+    )
+
+
+@case("StochRSI.create_signals")
+def _(data):
+    stoch = StochRSI().calculate_stochrsi(data, STOCH_RSI)
+    return lambda: StochRSI().create_signals(stoch), len(data)
+
+
+@case("StochRSI.signals")
+def _(data):
+    return lambda: StochRSI().signals(data, STOCH_RSI), len(data)
+
+
+@case("StochRSI.get_last_signal")
+def _(data):
+    return lambda: StochRSI().get_last_signal(data, STOCH_RSI), len(data)
+
+
+# Fused signals of all indicators, throughput counts bars
+
+_SIGNAL_CONFIGS = (ACC_BANDS, RSI_CLOUDS, SCRSI, STOCH_RSI)
+
+
+@case("IndicatorSignals.evaluate")
+def _(data):
+    return (
+        lambda: IndicatorSignals().evaluate(data, _SIGNAL_CONFIGS),
+        len(data),
+    )
+
+
+@case("IndicatorSignals.last")
+def _(data):
+    return (
+        lambda: IndicatorSignals().last(data, _SIGNAL_CONFIGS),
+        len(data),
+    )
+
+
+# Lookbacks of the last-signal checks, throughput counts calls
+
+_LOOKBACKS = {
+    AccelerationBands: ACC_BANDS,
+    ADXTrend: ADX,
+    AVSL: AVSL_CONFIG,
+    RsiClouds: RSI_CLOUDS,
+    SmoothCicleRsi: SCRSI,
+    StochRSI: STOCH_RSI,
+}
+for _cls, _config in _LOOKBACKS.items():
+    case(f"{_cls.__name__}.lookback")(
+        lambda data, cls=_cls, config=_config: (
+            lambda: cls().lookback(config), 1
+        )
+    )
+
+
+@case("IndicatorSignals.lookback")
+def _(data):
+    configs = (*_SIGNAL_CONFIGS, ADX, AVSL_CONFIG)
+    return lambda: IndicatorSignals().lookback(configs), 1
+
+
+@case("IndicatorSignals.last_records")
+def _(data):
+    return (
+        lambda: IndicatorSignals().last_records(
+            "BTC-USDT", "1m", _SIGNAL_CONFIGS
+        ),
+        1,
+    )
+
+
+# Higher timeframes from 1m candles, throughput counts base bars
+
+_TIMEFRAMES = ("3m", "5m", "15m", "1H", "4H", "1D")
+
+
+@case("resample")
+def _(data):
+    def run():
+        for bar in _TIMEFRAMES:
+            resample(data, bar)
+    return run, len(data)
+
+
+@case("BarResampler.backfill", fresh=True)
+def _(data):
+    resampler = BarResampler(_TIMEFRAMES, dtype=data.dtype)
+    return lambda: resampler.backfill(data), len(data)
+
+
+@case("BarResampler.update", max_bars=1_000_000, fresh=True)
+def _(data):
+    resampler = BarResampler(_TIMEFRAMES, dtype=data.dtype)
+    bars = list(zip(
+        data.epoch.tolist(),
+        *(column.tolist() for column in _bars(data)),
+        data.volumes.tolist(),
+        data.turnover.tolist(),
+    ))
+
+    def run():
+        for date, open_, high, low, close, volume, turnover in bars:
+            resampler.update(date, open_, high, low, close, volume, turnover)
+    return run, len(data)
+
+
+@case("BarResampler.frame", max_bars=1_000_000)
+def _(data):
+    resampler = BarResampler(_TIMEFRAMES, dtype=data.dtype)
+    resampler.backfill(data)
+
+    def run():
+        for bar in _TIMEFRAMES:
+            resampler.frame(bar, forming=True)
+    return run, len(_TIMEFRAMES)
+
+
+# Parameter sweeps, throughput counts bars times configs
+
+_STOCH_RSI_GRID = [
+    StochRsiConfigDM(timeperiod, fastk, fastd, matype)
+    for timeperiod, fastk, fastd, matype in itertools.product(
+        (7, 14, 21), (7, 14), (3, 5), (0, 1)
+    )
+]
+_ADX_GRID = [
+    AdxConfigDM(length=length, lensig=lensig, mamode=mamode)
+    for length, lensig, mamode in itertools.product(
+        (7, 14, 21), (7, 14), ("rma", "ema")
+    )
+]
+_AVSL_GRID = [
+    AvslConfigDM(fast, slow, stand_div)
+    for fast, slow, stand_div in itertools.product(
+        (3, 5, 8), (20, 30), (1.5, 2.0)
+    )
+]
+_RSI_CLOUDS_GRID = [
+    RsiCloudsConfigDM(
+        rsi_length=length, macd_fast=fast, macd_slow=slow, macd_signal=9
+    )
+    for length, fast, slow in itertools.product((7, 14, 21), (8, 12), (21, 26))
+]
+
+
+def _sweep_case(name: str, grid: list) -> None:
+    @case(f"IndicatorSweep.{name}", max_bars=1_000_000)
+    def _(data):
+        sweep = getattr(IndicatorSweep(), name)
+        return lambda: sweep(data, grid), len(data) * len(grid)
+
+
+_sweep_case("sweep_stochrsi", _STOCH_RSI_GRID)
+_sweep_case("sweep_adx", _ADX_GRID)
+_sweep_case("sweep_avsl", _AVSL_GRID)
+_sweep_case("sweep_rsi_clouds", _RSI_CLOUDS_GRID)
+
+
+# Order block zones, sized by zones or queries instead of bars
+
+_INSTRUMENTS = [f"SYN{i}-USDT-SWAP" for i in range(_ZONE_INSTRUMENTS)]
+
+
+def _zone_store(data: PriceDataFrame) -> OrderBlockZones:
+    """
+    Store with one zone per bar, spread over the instruments.
+    """
+    store = OrderBlockZones()
+    low, high = data.low_prices, data.high_prices
+    for bar in range(len(data)):
+        store.add_zone(
+            _INSTRUMENTS[bar % _ZONE_INSTRUMENTS],
+            "peak" if bar % 2 else "valley",
+            float(low[bar]), float(high[bar]), bar,
+        )
+    return store
+
+
+@case("OrderBlockZones.instrument_ids", max_bars=100_000)
+def _(data):
+    store = _zone_store(data[:_ZONE_INSTRUMENTS])
+    instruments = [
+        _INSTRUMENTS[bar % _ZONE_INSTRUMENTS] for bar in range(len(data))
+    ]
+    return lambda: store.instrument_ids(instruments), len(data)
+
+
+@case("OrderBlockZones.add_zone", max_bars=100_000)
+def _(data):
+    return lambda: _zone_store(data), len(data)
+
+
+@case("OrderBlockZones.add_blocks", max_bars=100_000)
+def _(data):
+    blocks = StreamingOrderBlocks(ORDER_BLOCKS).backfill(data)
+
+    def run():
+        store = OrderBlockZones()
+        for instId in _INSTRUMENTS:
+            store.add_blocks(instId, blocks, data)
+    return run, len(blocks) * _ZONE_INSTRUMENTS
+
+
+@case("OrderBlockZones.query", max_bars=100_000)
+def _(data):
+    store = _zone_store(data)
+    queries = list(zip(
+        itertools.cycle(_INSTRUMENTS), data.close_prices[::-1].tolist()
+    ))
+
+    def run():
+        for instId, price in queries:
+            store.query(instId, price)
+    return run, len(data)
+
+
+@case("OrderBlockZones.query_many", max_bars=1_000_000)
+def _(data):
+    store = _zone_store(data[:min(len(data), 100_000)])
+    codes = store.instrument_ids(_INSTRUMENTS)[
+        np.arange(len(data)) % _ZONE_INSTRUMENTS
+    ]
+    prices = data.close_prices[::-1].copy()
+    return lambda: store.query_many(codes, prices), len(data)
+
+
+@case("OrderBlockZones.mitigate", max_bars=100_000, fresh=True)
+def _(data):
+    store = _zone_store(data)
+    price = float(np.median(data.close_prices))
+
+    def run():
+        for instId in _INSTRUMENTS:
+            store.mitigate(instId, price)
+    return run, len(data)
+
+
+@case("OrderBlockZones.expire", max_bars=100_000, fresh=True)
+def _(data):
+    store = _zone_store(data)
+    before_bar = len(data) // 2
+
+    def run():
+        for instId in _INSTRUMENTS:
+            store.expire(instId, before_bar)
+    return run, len(data)
+
+
+@case("OrderBlockZones.zones", max_bars=100_000)
+def _(data):
+    store = _zone_store(data)
+
+    def run():
+        for instId in _INSTRUMENTS:
+            store.zones(instId)
+    return run, len(data)
+
+
+def measure(
+    bench: BenchmarkCase,
+    data: PriceDataFrame,
+    repeats: int
+) -> dict[str, float]:
+    """
+    Warm timing and memory peak of a case.
+    Returns:
+        dict[str, float]: "items" per call, "best_s", "median_s",
+          "bars_per_s" (items over the best time) and
+          "peak_bytes" (tracemalloc peak of one call).
+    """
+    call, items = bench.setup(data)
+    # The first call compiles whatever the case still needs
+    call()
+    times = []
+    for _repeat in range(repeats):
+        if bench.fresh:
+            call, items = bench.setup(data)
+        start = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - start)
+    if bench.fresh:
+        call, items = bench.setup(data)
+    tracemalloc.start()
+    try:
+        call()
+        _size, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    best = min(times)
+    return {
+        "items": items,
+        "best_s": best,
+        "median_s": statistics.median(times),
+        "bars_per_s": items / best if best > 0 else float("inf"),
+        "peak_bytes": peak,
+    }
+
+
+def measure_cold(name: str, regime: str, n_bars: int) -> float:
+    """
+    Duration of the first call of a case in a fresh interpreter,
+      numba compilation included.
+    """
+    out = subprocess.run(
+        [
+            sys.executable, "-m", __spec__.name, "cold",
+            name, "--regime", regime, "--bars", str(n_bars),
+        ],
+        capture_output=True, text=True, check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def run(
+    sizes: list[int],
+    regimes: list[str],
+    names: list[str],
+    repeats: int,
+    cold: bool,
+    log: Callable[[str], None] = print
+) -> dict[str, Any]:
+    """
+    Runs the selected cases for every regime and size.
+    Returns:
+        dict[str, Any]: Report with "meta", warm "results",
+          "cold" timings and the "uncovered" methods.
+    """
+    results = []
+    for regime in regimes:
+        for n_bars in sizes:
+            data = synthetic_ohlcv(n_bars, regime, seed=SEED)
+            for name in names:
+                bench = CASES[name]
+                if bench.max_bars is not None and n_bars > bench.max_bars:
+                    continue
+                row = {
+                    "case": name, "regime": regime, "bars": n_bars,
+                    **measure(bench, data, repeats),
+                }
+                results.append(row)
+                log(
+                    f"{name:48} {regime:15} {n_bars:>9} "
+                    f"{row['bars_per_s']:>14,.0f} bars/s"
+                )
+    cold_results = []
+    if cold:
+        for name in names:
+            seconds = measure_cold(name, regimes[0], min(sizes))
+            cold_results.append({
+                "case": name, "regime": regimes[0],
+                "bars": min(sizes), "seconds": seconds,
+            })
+            log(f"{name:48} cold {seconds:.3f} s")
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "numpy": np.__version__,
+            "numba": numba.__version__,
+            "pandas": pd.__version__,
+            "numba_threads": numba.get_num_threads(),
+            "seed": SEED,
+            "repeats": repeats,
+        },
+        "results": results,
+        "cold": cold_results,
+        "uncovered": uncovered(),
+    }
+
+
+def compare(
+    old: dict[str, Any],
+    new: dict[str, Any],
+    threshold: float
+) -> list[str]:
+    """
+    Compares two reports of `run`.
+    Args:
+        old (dict): Baseline report.
+        new (dict): Candidate report.
+        threshold (float): Tolerated relative slowdown,
+          0.1 flags cases more than 10% slower.
+    Returns:
+        list[str]: Regressions, one line each.
+    """
+    regressions = []
+    baseline = {
+        (row["case"], row["regime"], row["bars"]): row
+        for row in old["results"]
+    }
+    for row in new["results"]:
+        before = baseline.get((row["case"], row["regime"], row["bars"]))
+        if before is None:
+            continue
+        ratio = row["bars_per_s"] / before["bars_per_s"]
+        if ratio < 1.0 - threshold:
+            regressions.append(
+                f"{row['case']} [{row['regime']}, {row['bars']} bars]: "
+                f"{before['bars_per_s']:,.0f} -> {row['bars_per_s']:,.0f} "
+                f"bars/s ({ratio - 1.0:+.1%})"
+            )
+    cold_baseline = {row["case"]: row for row in old.get("cold", ())}
+    for row in new.get("cold", ()):
+        before = cold_baseline.get(row["case"])
+        if before is None:
+            continue
+        ratio = row["seconds"] / before["seconds"]
+        if ratio > 1.0 + threshold:
+            regressions.append(
+                f"{row['case']} [cold]: {before['seconds']:.3f} -> "
+                f"{row['seconds']:.3f} s ({ratio - 1.0:+.1%})"
+            )
+    return regressions
+
+
+def _select(patterns: list[str] | None) -> list[str]:
+    if not patterns:
+        return list(CASES)
+    names = [
+        name for name in CASES
+        if any(pattern in name for pattern in patterns)
+    ]
+    if not names:
+        raise SystemExit(f"No case matches {patterns}")
+    return names
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m strategies.benchmarks.indicators",
+        description="Indicator throughput benchmarks on synthetic candles.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks.")
+    run_parser.add_argument(
+        "--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+        help="Bar counts, up to 10000000.",
+    )
+    run_parser.add_argument(
+        "--regimes", nargs="+", choices=REGIMES, default=list(REGIMES)
+    )
+    run_parser.add_argument(
+        "--cases", nargs="+",
+        help="Substrings of the case names to run, all by default.",
+    )
+    run_parser.add_argument("--repeats", type=int, default=5)
+    run_parser.add_argument(
+        "--no-cold", action="store_true",
+        help="Skip the cold (compilation included) timings.",
+    )
+    run_parser.add_argument("--out", help="JSON report path.")
+
+    compare_parser = commands.add_parser(
+        "compare", help="Flag regressions between two reports."
+    )
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+
+    cold_parser = commands.add_parser(
+        "cold", help="Time the first call of one case (used by run)."
+    )
+    cold_parser.add_argument("case", choices=list(CASES))
+    cold_parser.add_argument("--regime", choices=REGIMES, default=REGIMES[0])
+    cold_parser.add_argument("--bars", type=int, default=DEFAULT_SIZES[0])
+
+    args = parser.parse_args(argv)
+    if args.command == "cold":
+        data = synthetic_ohlcv(args.bars, args.regime, seed=SEED)
+        call, _items = CASES[args.case].setup(data)
+        start = time.perf_counter()
+        call()
+        print(time.perf_counter() - start)
+        return 0
+    if args.command == "compare":
+        with open(args.old) as old, open(args.new) as new:
+            regressions = compare(json.load(old), json.load(new), args.threshold)
+        for line in regressions:
+            print(line)
+        print(f"{len(regressions)} regression(s)")
+        return 1 if regressions else 0
+    report = run(
+        args.sizes, args.regimes, _select(args.cases),
+        args.repeats, not args.no_cold,
+    )
+    for name in report["uncovered"]:
+        print(f"Not benchmarked: {name}")
+    if args.out:
+        with open(args.out, "w") as out:
+            json.dump(report, out, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
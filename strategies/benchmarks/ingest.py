@@ -0,0 +1,184 @@
+"""
+Candle ingestion: ILP writer against the SQL insert path.
+
+    python -m strategies.benchmarks.ingest --rows 100000
+    python -m strategies.benchmarks.ingest --url http://127.0.0.1:9000/exec \\
+        --ilp-host 127.0.0.1 --ilp-port 9009
+
+Without `--url` only the client side is measured: building the
+`insert_many_data` SQL query against encoding the same candles
+as ILP lines, per batch size. With `--url` each batch is also
+sent to QuestDB through `DataQueryRepo.insert_many_data` and
+through `IlpWriter` (written and drained into the socket; QuestDB
+commits ILP rows asynchronously). Batches go to a
+`bench_<path>_ingest_data` table per path.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+from strategies.benchmarks.synthetic import synthetic_ohlcv
+from strategies.src.config import QuestConfig
+from strategies.src.domain.entities import Data, InsertManyRecordsDM
+from strategies.src.infrastructure.database import DataQueryRepo
+from strategies.src.infrastructure.ilp import IlpWriter, encode_records
+
+SEED = 0
+
+
+def records(n_rows: int) -> list[Data]:
+    """
+    Synthetic candles as insert records with ISO dates.
+    """
+    data = synthetic_ohlcv(n_rows, "trending", SEED)
+    return [
+        Data(
+            date=datetime.fromtimestamp(
+                epoch / 1e6, tz=timezone.utc
+            ).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            open_price=open_,
+            close_price=close,
+            high_price=high,
+            low_price=low,
+            volume=volume,
+            turnover=turnover,
+        )
+        for epoch, open_, close, high, low, volume, turnover in zip(
+            data.epoch.tolist(),
+            data.open_price.tolist(),
+            data.close_prices.tolist(),
+            data.high_prices.tolist(),
+            data.low_prices.tolist(),
+            data.volumes.tolist(),
+            data.turnover.tolist(),
+        )
+    ]
+
+
+def _batches(
+    rows: list[Data],
+    batch: int,
+    path: str
+) -> list[InsertManyRecordsDM]:
+    return [
+        InsertManyRecordsDM(
+            instId=f"bench_{path}", bar="ingest", data=rows[i:i + batch]
+        )
+        for i in range(0, len(rows), batch)
+    ]
+
+
+def measure_encoding(rows: list[Data], batch: int) -> dict[str, Any]:
+    """
+    Client-side cost of both paths for one batch size.
+    Returns:
+        dict[str, Any]: Rows per second and bytes per row of
+          the SQL query and of the ILP lines.
+    """
+    result: dict[str, Any] = {"batch": batch, "mode": "encode"}
+    for path, encode in (
+        ("sql", DataQueryRepo._insert_many_query),
+        ("ilp", lambda p: encode_records(f"{p.instId}_{p.bar}_data", p.data)),
+    ):
+        batches = _batches(rows, batch, path)
+        started = time.perf_counter()
+        size = sum(len(encode(params)) for params in batches)
+        seconds = time.perf_counter() - started
+        result[f"{path}_rows_per_s"] = len(rows) / seconds
+        result[f"{path}_bytes_per_row"] = size / len(rows)
+    return result
+
+
+async def measure_questdb(
+    rows: list[Data],
+    batch: int,
+    config: QuestConfig
+) -> dict[str, Any]:
+    """
+    End-to-end rows per second of both paths for one batch size.
+    A failing SQL path (QuestDB rejecting the query, e.g. past
+      the URL length limit) is reported, not raised.
+    """
+    async def timed(
+        path: str,
+        send: Callable[[InsertManyRecordsDM], Awaitable[Any]],
+        done: Callable[[], Awaitable[Any]]
+    ) -> float:
+        started = time.perf_counter()
+        for params in _batches(rows, batch, path):
+            await send(params)
+        await done()
+        return len(rows) / (time.perf_counter() - started)
+
+    result: dict[str, Any] = {"batch": batch, "mode": "questdb"}
+    async with httpx.AsyncClient() as client:
+        repo = DataQueryRepo(client, config)
+        try:
+            result["sql_rows_per_s"] = await timed(
+                "sql", repo.insert_many_data, asyncio.sleep
+            )
+        except (ValueError, httpx.HTTPError) as error:
+            result["sql_rows_per_s"] = None
+            result["sql_error"] = str(error)[:200]
+    async with IlpWriter(
+        config.ilp_host, config.ilp_port, flush_interval=0
+    ) as writer:
+        result["ilp_rows_per_s"] = await timed(
+            "ilp", writer.write, writer.flush
+        )
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m strategies.benchmarks.ingest",
+        description="ILP writer against the SQL insert path.",
+    )
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument(
+        "--batches", nargs="*", type=int, default=[100, 1_000, 10_000]
+    )
+    parser.add_argument(
+        "--url", help="QuestDB /exec URL; client side only if omitted."
+    )
+    parser.add_argument("--ilp-host", default="127.0.0.1")
+    parser.add_argument("--ilp-port", type=int, default=9009)
+    parser.add_argument("--out", help="JSON report path.")
+    args = parser.parse_args(argv)
+
+    rows = records(args.rows)
+    results = [measure_encoding(rows, batch) for batch in args.batches]
+    if args.url:
+        config = QuestConfig(
+            url=args.url, ilp_host=args.ilp_host, ilp_port=args.ilp_port
+        )
+        results += [
+            asyncio.run(measure_questdb(rows, batch, config))
+            for batch in args.batches
+        ]
+    for row in results:
+        sql = row["sql_rows_per_s"]
+        print(
+            f"{row['mode']:8} batch {row['batch']:7} "
+            f"sql {'failed' if sql is None else f'{sql:12.0f}'} rows/s "
+            f"ilp {row['ilp_rows_per_s']:12.0f} rows/s"
+            + (
+                f"  ({row['sql_bytes_per_row']:.0f} / "
+                f"{row['ilp_bytes_per_row']:.0f} bytes per row)"
+                if row["mode"] == "encode" else ""
+            )
+        )
+    if args.out:
+        with open(args.out, "w") as out:
+            json.dump(results, out, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
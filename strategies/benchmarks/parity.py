@@ -0,0 +1,267 @@
+"""
+Parity of the compiled indicators with pandas-ta and TA-Lib.
+
+    python -m strategies.benchmarks.parity --bars 5000 --seeds 0 1 2
+
+Each compiled primitive of `_kernels` is run on random synthetic
+candles next to the library function whose semantics it follows,
+and every indicator with a pandas-ta backend is computed with
+`backend="numba"` and `backend="pandas_ta"` for a set of
+configurations. Outputs must agree bar by bar within `RTOL` and
+`ATOL`, with NaN in the same places. The check fails when any
+output of any regime and seed does not.
+
+The kernels follow pandas-ta 0.3.14b, the version in `uv.lock`.
+pandas-ta 0.4 changed `rma` to an unadjusted EWM without warm-up
+and `adx` to a TA-Lib based ADX with `signal_length` instead of
+`lensig`, so rma, rsi_rma and ADX do not match under it: the
+check refuses to run against another release line and exits with
+code 2. The report records the library versions it was produced
+with. `tests/test_parity.py` runs the same pairs under pytest.
+"""
+import argparse
+import dataclasses
+import json
+import sys
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+import pandas_ta as ta
+import talib
+from numpy.typing import NDArray
+
+from strategies.benchmarks.synthetic import REGIMES, synthetic_ohlcv
+from strategies.src.domain.entities import (
+    AcceletrationBandsDM,
+    AdxConfigDM,
+    AvslConfigDM,
+)
+from strategies.src.infrastructure._types import PriceDataFrame
+from strategies.src.infrastructure.indicators import _kernels as k
+from strategies.src.infrastructure.indicators.acceleration_bands import (
+    AccelerationBands,
+)
+from strategies.src.infrastructure.indicators.adx import ADXTrend
+from strategies.src.infrastructure.indicators.avsl import AVSL
+
+RTOL = 1e-9
+ATOL = 1e-9
+# Release line of pandas-ta the kernels follow (uv.lock pins 0.3.14b0)
+PANDAS_TA_SERIES = "0.3."
+
+Pair = tuple[Callable[[PriceDataFrame], Any], Callable[[PriceDataFrame], Any]]
+
+
+def _close(data: PriceDataFrame) -> pd.Series:
+    return pd.Series(data.close_prices)
+
+
+def _hlc(data: PriceDataFrame) -> tuple[NDArray, NDArray, NDArray]:
+    return data.high_prices, data.low_prices, data.close_prices
+
+
+# Compiled primitive and its library counterpart, both returning
+# an array or a tuple of arrays
+PRIMITIVES: dict[str, Pair] = {
+    "sma": (
+        lambda d: k.sma(d.close_prices, 20),
+        lambda d: talib.SMA(d.close_prices, 20),
+    ),
+    "ema": (
+        lambda d: k.ema(d.close_prices, 20),
+        lambda d: talib.EMA(d.close_prices, 20),
+    ),
+    "rma": (
+        lambda d: k.rma(d.close_prices, 14),
+        lambda d: ta.rma(_close(d), 14).to_numpy(),
+    ),
+    "vwma": (
+        lambda d: (
+            k.sma(d.close_prices * d.volumes, 20)
+            / k.sma(d.volumes.astype(np.float64), 20)
+        ),
+        lambda d: ta.vwma(
+            _close(d), pd.Series(d.volumes, dtype=np.float64), 20
+        ).to_numpy(),
+    ),
+    "rsi_talib": (
+        lambda d: k.rsi_talib(d.close_prices, 14),
+        lambda d: talib.RSI(d.close_prices, 14),
+    ),
+    "rsi_rma": (
+        lambda d: k.rsi_rma(d.close_prices, 14, 100.0, 1),
+        lambda d: ta.rsi(_close(d), 14, talib=False).to_numpy(),
+    ),
+    "atr_talib": (
+        lambda d: k.atr_talib(*_hlc(d), 14),
+        lambda d: talib.ATR(*_hlc(d), 14),
+    ),
+    "rolling_max": (
+        lambda d: k.rolling_max(d.close_prices, 14),
+        lambda d: talib.MAX(d.close_prices, 14),
+    ),
+    "rolling_min": (
+        lambda d: k.rolling_min(d.close_prices, 14),
+        lambda d: talib.MIN(d.close_prices, 14),
+    ),
+    "stochrsi_talib": (
+        lambda d: k.stochrsi_talib(d.close_prices, 14, 14, 3, 0),
+        lambda d: talib.STOCHRSI(d.close_prices, 14, 14, 3, 0),
+    ),
+    "macd_talib": (
+        lambda d: k.macd_talib(d.close_prices, 12, 26, 9),
+        lambda d: talib.MACD(d.close_prices, 12, 26, 9),
+    ),
+}
+
+ACC_BANDS = (
+    AcceletrationBandsDM(length=20, drift=1, offset=0),
+    AcceletrationBandsDM(length=10, drift=1, offset=0, mamode="ema"),
+    AcceletrationBandsDM(length=20, drift=1, offset=2),
+)
+ADX = (
+    AdxConfigDM(),
+    AdxConfigDM(length=20, mamode="rma", scalar=50),
+    AdxConfigDM(length=10, drift=2, offset=1),
+)
+AVSL_CONFIGS = (
+    AvslConfigDM(length_fast=5, length_slow=20, stand_div=2.0),
+    AvslConfigDM(length_fast=10, length_slow=50, stand_div=1.0),
+)
+
+
+def _frames(call: Callable[..., pd.DataFrame], config: Any) -> Pair:
+    """
+    The same indicator method on both backends.
+    """
+    return (
+        lambda d: call(d, config).to_numpy().T,
+        lambda d: call(
+            d, dataclasses.replace(config, backend="pandas_ta")
+        ).to_numpy().T,
+    )
+
+
+INDICATORS: dict[str, Pair] = {
+    **{
+        f"AccelerationBands.calc_accbands[{i}]": _frames(
+            AccelerationBands().calc_accbands, config
+        )
+        for i, config in enumerate(ACC_BANDS)
+    },
+    **{
+        f"ADXTrend.calculate_adx[{i}]": _frames(
+            ADXTrend().calculate_adx, config
+        )
+        for i, config in enumerate(ADX)
+    },
+    **{
+        f"AVSL.calculate_avsl[{i}]": _frames(AVSL().calculate_avsl, config)
+        for i, config in enumerate(AVSL_CONFIGS)
+    },
+}
+
+
+def check_pandas_ta() -> None:
+    """
+    Raises:
+        RuntimeError: If the installed pandas-ta is not from the
+          release line the kernels follow.
+    """
+    if not ta.version.startswith(PANDAS_TA_SERIES):
+        raise RuntimeError(
+            f"pandas-ta {ta.version} is installed, the kernels follow "
+            f"pandas-ta {PANDAS_TA_SERIES}x (pandas-ta>=0.3.14b0,<0.4)"
+        )
+
+
+def compare(compiled: Any, reference: Any) -> dict[str, Any]:
+    """
+    Bar-by-bar difference of two outputs (arrays or tuples
+      of arrays).
+    Returns:
+        dict[str, Any]: Largest absolute difference "max_abs",
+          count of bars outside the tolerance "mismatched"
+          (NaN placed differently included) and "ok".
+    """
+    compiled = np.atleast_2d(np.asarray(compiled, dtype=np.float64))
+    reference = np.atleast_2d(np.asarray(reference, dtype=np.float64))
+    if compiled.shape != reference.shape:
+        return {"max_abs": float("inf"), "mismatched": -1, "ok": False}
+    both = ~np.isnan(compiled) & ~np.isnan(reference)
+    error = np.abs(compiled[both] - reference[both])
+    mismatched = int(
+        np.count_nonzero(np.isnan(compiled) != np.isnan(reference))
+        + np.count_nonzero(error > ATOL + RTOL * np.abs(reference[both]))
+    )
+    return {
+        "max_abs": float(error.max()) if error.size else 0.0,
+        "mismatched": mismatched,
+        "ok": mismatched == 0,
+    }
+
+
+def run(
+    n_bars: int,
+    regimes: tuple[str, ...],
+    seeds: tuple[int, ...]
+) -> list[dict[str, Any]]:
+    """
+    Compares every primitive and indicator backend pair on
+      the candles of each regime and seed.
+    Returns:
+        list[dict[str, Any]]: One row per regime, seed and pair.
+    """
+    results = []
+    for regime in regimes:
+        for seed in seeds:
+            data = synthetic_ohlcv(n_bars, regime, seed)
+            for name, (compiled, reference) in {
+                **PRIMITIVES, **INDICATORS
+            }.items():
+                results.append({
+                    "regime": regime,
+                    "seed": seed,
+                    "name": name,
+                    **compare(compiled(data), reference(data)),
+                })
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m strategies.benchmarks.parity",
+        description="Compiled indicators against pandas-ta and TA-Lib.",
+    )
+    parser.add_argument("--bars", type=int, default=5_000)
+    parser.add_argument(
+        "--regimes", nargs="*", default=list(REGIMES), choices=REGIMES
+    )
+    parser.add_argument("--seeds", nargs="*", type=int, default=[0, 1, 2])
+    parser.add_argument("--out", help="JSON report path.")
+    args = parser.parse_args(argv)
+
+    try:
+        check_pandas_ta()
+    except RuntimeError as error:
+        print(error, file=sys.stderr)
+        return 2
+    results = run(args.bars, tuple(args.regimes), tuple(args.seeds))
+    versions = {"pandas_ta": ta.version, "talib": talib.__version__}
+    print(", ".join(f"{name} {version}" for name, version in versions.items()))
+    for row in results:
+        print(
+            f"{row['regime']:15} {row['seed']:4} {row['name']:40} "
+            f"max {row['max_abs']:10.3g} "
+            f"mismatched {row['mismatched']:6} "
+            f"{'ok' if row['ok'] else 'FAIL'}"
+        )
+    if args.out:
+        with open(args.out, "w") as out:
+            json.dump({"versions": versions, "results": results}, out, indent=2)
+    return 0 if all(row["ok"] for row in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
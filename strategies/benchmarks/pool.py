@@ -0,0 +1,131 @@
+"""
+Scaling of `IndicatorPool` with the number of workers.
+
+    python -m strategies.benchmarks.pool --instruments 64 --workers 1 2 4 8
+
+Every instrument gets its own synthetic candles (the regimes in
+turn) and all of them are evaluated with the fused signal configs
+of `strategies.benchmarks.indicators` in each round. A round is
+timed after one warm round, so kernel loading in the workers is
+not counted. `pickled` rounds send the candle tail of every
+evaluation to a plain process pool instead, the cost the shared
+buffers avoid.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any
+
+from numpy.typing import NDArray
+
+from strategies.benchmarks.indicators import (
+    ACC_BANDS,
+    RSI_CLOUDS,
+    SCRSI,
+    STOCH_RSI,
+)
+from strategies.benchmarks.synthetic import REGIMES, synthetic_ohlcv
+from strategies.src.infrastructure._types import PriceDataFrame
+from strategies.src.infrastructure.indicators.pool import (
+    IndicatorPool,
+    _init_worker,
+)
+from strategies.src.infrastructure.indicators.signals import IndicatorSignals
+
+CONFIGS = (ACC_BANDS, RSI_CLOUDS, SCRSI, STOCH_RSI)
+SEED = 0
+
+
+def _evaluate(data: PriceDataFrame) -> NDArray:
+    return IndicatorSignals().last(data, CONFIGS)
+
+
+def _timed_rounds(run: Any, rounds: int) -> float:
+    run()
+    started = time.perf_counter()
+    for _round in range(rounds):
+        run()
+    return (time.perf_counter() - started) / rounds
+
+
+def measure(
+    frames: dict[str, PriceDataFrame],
+    workers: int,
+    rounds: int
+) -> dict[str, Any]:
+    """
+    Round time of the shared and the pickled pool.
+    Returns:
+        dict[str, Any]: Workers, seconds per round and
+          evaluations per second of both.
+    """
+    requests = {inst_id: CONFIGS for inst_id in frames}
+    with IndicatorPool(workers=workers) as pool:
+        for inst_id, data in frames.items():
+            pool.append(inst_id, data)
+        shared = _timed_rounds(lambda: pool.last_signals(requests), rounds)
+    lookback = IndicatorSignals().lookback(CONFIGS)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=get_context("spawn"),
+        initializer=_init_worker,
+    ) as executor:
+        pickled = _timed_rounds(
+            lambda: list(executor.map(
+                _evaluate,
+                [data.tail(lookback) for data in frames.values()],
+            )),
+            rounds,
+        )
+    return {
+        "workers": workers,
+        "shared_s": shared,
+        "shared_per_s": len(frames) / shared,
+        "pickled_s": pickled,
+        "pickled_per_s": len(frames) / pickled,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m strategies.benchmarks.pool",
+        description="IndicatorPool throughput by number of workers.",
+    )
+    parser.add_argument("--instruments", type=int, default=64)
+    parser.add_argument("--bars", type=int, default=5_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--workers", nargs="*", type=int, default=[1, 2, 4])
+    parser.add_argument("--out", help="JSON report path.")
+    args = parser.parse_args(argv)
+
+    frames = {
+        f"INST{i}": synthetic_ohlcv(
+            args.bars, REGIMES[i % len(REGIMES)], SEED + i
+        )
+        for i in range(args.instruments)
+    }
+    results = [
+        measure(frames, workers, args.rounds) for workers in args.workers
+    ]
+    # Speedup in units of one worker of the first pool
+    base = results[0]["shared_per_s"] / results[0]["workers"]
+    for row in results:
+        print(
+            f"{row['workers']:3} workers "
+            f"shared {row['shared_per_s']:10.1f}/s "
+            f"(x{row['shared_per_s'] / base:5.2f}) "
+            f"pickled {row['pickled_per_s']:10.1f}/s"
+        )
+    if args.out:
+        cpus = len(os.sched_getaffinity(0))
+        with open(args.out, "w") as out:
+            json.dump({"cpus": cpus, "results": results}, out, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""
+Accuracy of the compact (float32) indicator mode.
+
+    python -m strategies.benchmarks.precision --bars 1000000
+
+Every batch method is evaluated on the same synthetic candles
+twice: in float64 and on `PriceDataFrame.astype(np.float32)`.
+Each output is compared with its float64 counterpart bar by bar
+against the documented tolerance of `TOLERANCES`.
+
+Most outputs only carry the rounding of the float32 inputs
+(about 6e-8 of the price) through their recursions. A few
+indicators branch on comparisons of nearly equal values, and
+rounding the prices can flip such a branch on isolated bars:
+
+- ADX: +DM and -DM ties (`up > dn`) move a bar's movement from
+  one side to the other, DMP/DMN and ADX follow for a few bars.
+- AVSL: the sign of VPC near zero switches `VPCc` between -1
+  and 1, moving the bar's price term by about 2% of the price.
+- SCRSI: windows without losses (`down == 0`) jump the scaled
+  RSI between -100 and 100.
+- ZigZag: equal highs or lows decide which bar is the peak.
+
+`outliers` is the share of bars allowed outside the bound for
+these; NaN placed differently counts as an outlier. The check
+fails when any output of any regime breaks its tolerance.
+"""
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from strategies.benchmarks.indicators import (
+    ACC_BANDS,
+    ADX,
+    AVSL_CONFIG,
+    ORDER_BLOCKS,
+    RSI_CLOUDS,
+    SCRSI,
+    STOCH_RSI,
+)
+from strategies.benchmarks.synthetic import REGIMES, synthetic_ohlcv
+from strategies.src.infrastructure._types import OhlcvBlock
+from strategies.src.infrastructure.indicators.acceleration_bands import (
+    AccelerationBands,
+)
+from strategies.src.infrastructure.indicators.adx import ADXTrend
+from strategies.src.infrastructure.indicators.avsl import AVSL
+from strategies.src.infrastructure.indicators.order_block import (
+    OrderBlockDetector,
+)
+from strategies.src.infrastructure.indicators.rsi_clouds import RsiClouds
+from strategies.src.infrastructure.indicators.scrsi import SmoothCicleRsi
+from strategies.src.infrastructure.indicators.stoch_rsi import StochRSI
+
+SEED = 0
+
+
+@dataclass(slots=True, frozen=True)
+class Tolerance:
+    """
+    Allowed float32 deviation of one output.
+    A bar is within tolerance when
+    |float32 - float64| <= atol + rtol * |float64|, as in
+    `np.isclose`; at most `outliers` of the bars may not be.
+    """
+    atol: float
+    rtol: float = 0.0
+    outliers: float = 0.0
+
+
+# Price-scale outputs are bounded relatively, oscillators in
+# their own units
+TOLERANCES: dict[str, Tolerance] = {
+    "AccelerationBands.ACCbands_lower": Tolerance(0.0, 1e-6),
+    "AccelerationBands.ACCbands_mid": Tolerance(0.0, 1e-6),
+    "AccelerationBands.ACCbands_upper": Tolerance(0.0, 1e-6),
+    "ADXTrend.adx": Tolerance(0.01, outliers=5e-3),
+    "ADXTrend.dmp": Tolerance(0.01, outliers=5e-3),
+    "ADXTrend.dmn": Tolerance(0.01, outliers=5e-3),
+    "AVSL.avsl": Tolerance(0.0, 1e-5, outliers=1e-2),
+    "RsiClouds.avg": Tolerance(0.0, 1e-6),
+    "RsiClouds.rsi": Tolerance(0.01),
+    "RsiClouds.macd_line": Tolerance(0.01),
+    "RsiClouds.macd_signal": Tolerance(0.01),
+    "RsiClouds.histogram": Tolerance(0.01),
+    "SmoothCicleRsi.CRSI Scaled": Tolerance(0.01, outliers=1e-4),
+    "SmoothCicleRsi.CRSI": Tolerance(0.01, outliers=1e-3),
+    "SmoothCicleRsi.Lower Bound": Tolerance(0.01),
+    "SmoothCicleRsi.Upper Bound": Tolerance(0.01),
+    "StochRSI.fastk": Tolerance(0.05),
+    "StochRSI.fastd": Tolerance(0.05),
+    "OrderBlockDetector.peaks": Tolerance(0.0, 1e-6, outliers=1e-3),
+    "OrderBlockDetector.valleys": Tolerance(0.0, 1e-6, outliers=1e-3),
+}
+
+# Batch method of every indicator, keyed by class name
+_BATCHES: dict[str, Callable[[OhlcvBlock], dict[str, NDArray]]] = {
+    "AccelerationBands": lambda block: (
+        AccelerationBands().calc_accbands_batch(block, ACC_BANDS)
+    ),
+    "ADXTrend": lambda block: ADXTrend().calculate_adx_batch(block, ADX),
+    "AVSL": lambda block: {
+        "avsl": AVSL().calculate_avsl_batch(block, AVSL_CONFIG)
+    },
+    "RsiClouds": lambda block: RsiClouds().calculate_rsi_clouds_batch(
+        block, RSI_CLOUDS
+    ),
+    "SmoothCicleRsi": lambda block: SmoothCicleRsi().calculate_scrsi_batch(
+        block, SCRSI
+    ),
+    "StochRSI": lambda block: StochRSI().calculate_stochrsi_batch(
+        block, STOCH_RSI
+    ),
+    "OrderBlockDetector": lambda block: (
+        OrderBlockDetector().zigzag_indicator_batch(block, ORDER_BLOCKS)
+    ),
+}
+
+
+def compare(
+    reference: NDArray,
+    compact: NDArray,
+    tolerance: Tolerance
+) -> dict[str, Any]:
+    """
+    Bar-by-bar deviation of a float32 output from float64.
+    Returns:
+        dict[str, Any]: Largest absolute ("max_abs") and
+          relative ("max_rel") deviation, "outliers" (share of
+          bars outside the bound, NaN mismatches included)
+          and "ok".
+    """
+    reference = np.asarray(reference, dtype=np.float64).ravel()
+    compact = np.asarray(compact, dtype=np.float64).ravel()
+    both = ~np.isnan(reference) & ~np.isnan(compact)
+    error = np.abs(compact[both] - reference[both])
+    scale = np.abs(reference[both])
+    relative = error / np.maximum(scale, 1e-12)
+    bound = tolerance.atol + tolerance.rtol * scale
+    mismatched = int(
+        np.count_nonzero(np.isnan(reference) != np.isnan(compact))
+        + np.count_nonzero(error > bound)
+    )
+    outliers = mismatched / max(reference.shape[0], 1)
+    return {
+        "max_abs": float(error.max()) if error.size else 0.0,
+        "max_rel": float(relative.max()) if error.size else 0.0,
+        "outliers": outliers,
+        "ok": outliers <= tolerance.outliers,
+    }
+
+
+def run(n_bars: int, regimes: tuple[str, ...]) -> dict[str, Any]:
+    """
+    Compares every output of every batch method in float32
+      with float64 for each regime.
+    Returns:
+        dict[str, Any]: "results" (one row per regime and
+          output) and "memory" (bytes of the block and the
+          outputs in each precision, per regime).
+    """
+    results = []
+    memory = []
+    for regime in regimes:
+        data = synthetic_ohlcv(n_bars, regime, SEED)
+        full = OhlcvBlock.from_frames([data])
+        compact = OhlcvBlock.from_frames([data.astype(np.float32)])
+        nbytes = {
+            "float64": full.close.nbytes * 5,
+            "float32": compact.close.nbytes * 5,
+        }
+        for cls, batch in _BATCHES.items():
+            reference = batch(full)
+            outputs = batch(compact)
+            for name, values in reference.items():
+                key = f"{cls}.{name}"
+                nbytes["float64"] += values.nbytes
+                nbytes["float32"] += outputs[name].nbytes
+                results.append({
+                    "regime": regime,
+                    "output": key,
+                    "dtype": str(outputs[name].dtype),
+                    **compare(values, outputs[name], TOLERANCES[key]),
+                })
+        memory.append({"regime": regime, **nbytes})
+    return {"n_bars": n_bars, "results": results, "memory": memory}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m strategies.benchmarks.precision",
+        description="Float32 deviation of the indicators from float64.",
+    )
+    parser.add_argument("--bars", type=int, default=1_000_000)
+    parser.add_argument(
+        "--regimes", nargs="*", default=list(REGIMES), choices=REGIMES
+    )
+    parser.add_argument("--out", help="JSON report path.")
+    args = parser.parse_args(argv)
+
+    report = run(args.bars, tuple(args.regimes))
+    for row in report["results"]:
+        print(
+            f"{row['regime']:15} {row['output']:36} {row['dtype']:8} "
+            f"max {row['max_abs']:10.3g} rel {row['max_rel']:10.3g} "
+            f"outliers {row['outliers']:8.2e} "
+            f"{'ok' if row['ok'] else 'FAIL'}"
+        )
+    for row in report["memory"]:
+        print(
+            f"{row['regime']:15} {row['float64'] / 2**20:8.1f} MB float64 "
+            f"{row['float32'] / 2**20:8.1f} MB float32"
+        )
+    if args.out:
+        with open(args.out, "w") as out:
+            json.dump(report, out, indent=2)
+    return 0 if all(row["ok"] for row in report["results"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import numpy as np
+from numpy.typing import NDArray
+
+from strategies.src.infrastructure._types import PriceDataFrame
+from strategies.src.infrastructure.indicators.jit import F8, f8, kernel
+
+REGIMES = ("trending", "mean_reverting", "gappy")
+
+# 2024-01-01T00:00:00Z in epoch microseconds, one-minute bars
+_START_US = 1_704_067_200_000_000
+_BAR_US = 60_000_000
+
+
+def synthetic_ohlcv(
+    n_bars: int,
+    regime: str = "trending",
+    seed: int = 0,
+    price: float = 100.0
+) -> PriceDataFrame:
+    """
+    Seeded synthetic one-minute candles.
+    Regimes:
+    - **trending**: geometric random walk with drift.
+    - **mean_reverting**: Ornstein-Uhlenbeck log price around 
+      the starting price.
+    - **gappy**: trending prices with opening gaps, flat 
+      zero-volume bars and missing minutes in the timestamps.
+    Args:
+        n_bars (int): Number of bars.
+        regime (str): One of `REGIMES`.
+        seed (int): Random seed; equal seeds give equal candles.
+        price (float): Starting price.
+    Returns:
+        PriceDataFrame: Candles in chronological order.
+    Raises:
+        ValueError: If `regime` is unknown.
+    """
+    if regime not in REGIMES:
+        raise ValueError(f"Unknown regime '{regime}', use one of {REGIMES}")
+    rng = np.random.default_rng(seed)
+    if regime == "mean_reverting":
+        log_close = _ornstein_uhlenbeck(rng, n_bars, np.log(price))
+    else:
+        log_close = np.log(price) + np.cumsum(
+            rng.normal(2e-5, 1e-3, n_bars)
+        )
+    close = np.exp(log_close)
+    open_ = np.empty(n_bars)
+    open_[0] = price
+    open_[1:] = close[:-1]
+    epoch = _START_US + _BAR_US * np.arange(n_bars, dtype=np.int64)
+    volume = rng.lognormal(6.0, 1.0, n_bars).astype(np.int64) + 1
+    if regime == "gappy":
+        # Opening gaps move the whole rest of the series
+        gaps = rng.random(n_bars) < 0.01
+        jumps = np.where(gaps, rng.normal(0.0, 0.01, n_bars), 0.0)
+        shift = np.exp(np.cumsum(jumps))
+        open_ *= shift
+        close *= shift
+        # Missing minutes
+        epoch += _BAR_US * np.cumsum(rng.random(n_bars) < 0.05)
+    spread = np.abs(rng.normal(0.0, 5e-4, (2, n_bars)))
+    high = np.maximum(open_, close) * (1.0 + spread[0])
+    low = np.minimum(open_, close) * (1.0 - spread[1])
+    if regime == "gappy":
+        # Flat bars without trades
+        flat = rng.random(n_bars) < 0.02
+        open_[flat] = high[flat] = low[flat] = close[flat]
+        volume[flat] = 0
+    return PriceDataFrame.from_arrays(
+        date=epoch,
+        open_price=open_,
+        close_price=close,
+        high_price=high,
+        low_price=low,
+        volume=volume,
+        turnover=volume * close,
+    )
+
+
+def _ornstein_uhlenbeck(
+    rng: np.random.Generator,
+    n_bars: int,
+    mean: float
+) -> NDArray:
+    return _ar1(rng.normal(0.0, 1e-3, n_bars), mean, 1.0 - 0.02)
+
+
+@kernel((F8, f8, f8))
+def _ar1(noise: NDArray, mean: float, decay: float) -> NDArray:
+    """Exact AR(1) recursion around `mean`."""
+    out = np.empty(noise.shape[0])
+    level = mean
+    for i in range(noise.shape[0]):
+        level = mean + decay * (level - mean) + noise[i]
+        out[i] = level
+    return out
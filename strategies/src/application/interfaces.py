@@ -1,4 +1,4 @@
-from typing import Protocol
+from typing import AsyncIterator, Protocol
 
 from strategies.src.domain.entities import (
     CreateTableDM,
@@ -26,6 +26,13 @@ class IDataQuery(Protocol):
     ) -> PriceDataFrame:
         ...
 
+    def iter_records_by_date_range(
+        self,
+        params: GetRangeRecordsDM,
+        chunk_size: int = 100_000
+    ) -> AsyncIterator[PriceDataFrame]:
+        ...
+
     async def insert_record(self, params: InsertRecordDM) -> bool:
         ...
 
@@ -1,5 +1,48 @@
-from pydantic import BaseModel
+from os import environ as env
+from typing import Literal
+
+from pydantic import BaseModel, Field, field_validator
 
 
 class QuestConfig(BaseModel):
-    url: str
\ No newline at end of file
+    url: str
+    # InfluxDB line protocol endpoint (QDB_INFLUX_PORT)
+    ilp_host: str = "127.0.0.1"
+    ilp_port: int = 9009
+    # "tables": one {instId}_{bar}_data table per instrument and
+    # timeframe; "single": every candle in `candles_table`, keyed
+    # by the instId and bar symbols
+    layout: Literal["tables", "single"] = "tables"
+    candles_table: str = "candles"
+
+
+class RabbitMQConfig(BaseModel):
+    host: str = Field(alias="RABBITMQ_HOST")
+    port: int = Field(alias="RABBITMQ_PORT")
+    login: str = Field(alias="RABBITMQ_USER")
+    password: str = Field(alias="RABBITMQ_PASSWORD")
+    vhost: str = Field(alias="RABBITMQ_VHOST")
+
+
+class KernelConfig(BaseModel):
+    # Candle precisions the kernels are compiled for at startup;
+    # add float32 when candles are loaded in the compact mode
+    precisions: tuple[str, ...] = Field(
+        default=("float64",),
+        alias="STRATEGIES_KERNEL_PRECISIONS"
+    )
+
+    @field_validator("precisions", mode="before")
+    def split_precisions(cls, value):
+        if isinstance(value, str):
+            return tuple(value.split(","))
+        return value
+
+
+class Config(BaseModel):
+    rabbit: RabbitMQConfig = Field(
+        default_factory=lambda: RabbitMQConfig(**env)
+    )
+    kernels: KernelConfig = Field(
+        default_factory=lambda: KernelConfig(**env)
+    )
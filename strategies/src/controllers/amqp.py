@@ -0,0 +1,3 @@
+from faststream.rabbit import RabbitRouter
+
+controller = RabbitRouter()
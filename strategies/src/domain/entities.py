@@ -68,6 +68,8 @@ class AdxConfigDM:
     scalar: float | int | None = None 
     drift: int | None = None
     offset: int | None = None
+    # "numba" (compiled kernels) or "pandas_ta"
+    backend: str = "numba"
 
 
 @dataclass(slots=True, frozen=True)
@@ -75,6 +77,7 @@ class AvslConfigDM:
     length_fast: int
     length_slow: int
     stand_div: float
+    backend: str = "numba"
 
 
 @dataclass(slots=True, frozen=True)
@@ -92,6 +95,7 @@ class AcceletrationBandsDM:
     drift: int
     offset: int
     mamode: str | None = None
+    backend: str = "numba"
 
 
 @dataclass(slots=True, frozen=True)
@@ -108,6 +112,23 @@ class OrderBlockDetectorDM:
     plateu_size: Any | None  = None
 
 
+@dataclass(slots=True, frozen=True)
+class OrderBlockDM:
+    kind: str  # "peak" или "valley"
+    bar: int  # Номер бара экстремума
+    price: float
+    confirmed_bar: int  # Номер бара, на котором блок подтверждён
+
+
+@dataclass(slots=True, frozen=True)
+class OrderBlockZoneDM:
+    zone_id: int
+    kind: str  # "peak" или "valley"
+    lower: float
+    upper: float
+    bar: int  # Номер бара, образовавшего зону
+
+
 @dataclass(slots=True, frozen=True)
 class ScrsiConfigDM:
     domcycle: int = 20  # Основной цикл CRSI
@@ -0,0 +1,35 @@
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Imports a module on first attribute access.
+    Heavy numeric packages (pandas, TA-Lib, pandas-ta, scipy)
+    cost hundreds of milliseconds and tens of megabytes per
+    process; deferring them keeps importing the strategies
+    package cheap for processes that never compute with them.
+    Annotations using the module need
+    `from __future__ import annotations`, or they load it
+    when the function is defined.
+    Args:
+        name (str): Absolute module name.
+    Returns:
+        ModuleType: The module, or a placeholder that loads
+          it on first use.
+    Raises:
+        ModuleNotFoundError: If the module is not installed.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
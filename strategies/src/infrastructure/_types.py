@@ -1,53 +1,326 @@
-from typing import Union
-import pandas as pd
+from __future__ import annotations
 
-class PriceDataFrame(pd.DataFrame):
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Sequence
+
+import numpy as np
+from numpy.typing import DTypeLike, NDArray
+
+from strategies.src.infrastructure._lazy import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+_FLOAT_COLUMNS = ("open_price", "close_price", "high_price", "low_price")
+_COLUMNS = ("date", *_FLOAT_COLUMNS, "volume", "turnover")
+# Точность цен: float64 по умолчанию, float32 — компактный режим
+_PRICE_DTYPES = (np.dtype(np.float64), np.dtype(np.float32))
+
+
+class PriceDataFrame:
     """
-    Кастомный DataFrame с автоматической обработкой
-    типов QuestDB и доступом к колонкам через атрибуты.
+    Компактный контейнер свечей QuestDB на numpy-массивах.
+    Каждая колонка хранится одним непрерывным массивом
+    (float64, объём — int64), дата — int64 микросекунды
+    эпохи (как TIMESTAMP в QuestDB). Срезы и `tail`
+    возвращают представления без копирования, pandas
+    DataFrame собирается лениво через `to_pandas()`.
+
+    Компактный режим (`dtype=np.float32` или `astype`)
+    хранит цены во float32: кадр занимает 40 байт на бар
+    вместо 56, а блоки и результаты индикаторов,
+    посчитанные по нему, — вдвое меньше. Ядра копят суммы
+    во float64, отклонение от float64 держится в допусках
+    `strategies.benchmarks.precision`. Оборот — сумма за
+    много сделок — остаётся float64 в обоих режимах.
     """
-    def __init__(self, data, columns):
-        super().__init__(data, columns=columns)
-        self._convert_types()
-        self.set_index("date", inplace=True)
+    __slots__ = ("_epoch", "_columns", "_index", "_frame")
+
+    def __init__(
+        self,
+        data: Sequence[Sequence],
+        columns: Sequence,
+        dtype: DTypeLike = np.float64
+    ):
+        """
+        Разбирает строки ответа QuestDB (`dataset`) по колонкам
+        за один проход, без промежуточного DataFrame.
+        Args:
+            data (Sequence[Sequence]): Строки свечей.
+            columns (Sequence): Имена колонок или их описания
+              из ответа QuestDB (`{"name": ..., "type": ...}`).
+            dtype (DTypeLike): Тип цен, float64 или float32.
+        Raises:
+            ValueError: Если тип цен не float64 и не float32.
+        """
+        dtype = _price_dtype(dtype)
+        names = [c["name"] if isinstance(c, dict) else c for c in columns]
+        values = dict(zip(names, zip(*data))) if data else {}
+        self._set(
+            _to_epoch(values.get("date", ())),
+            {
+                **{
+                    name: np.array(values.get(name, ()), dtype=dtype)
+                    for name in _FLOAT_COLUMNS
+                },
+                "volume": np.array(values.get("volume", ()), dtype=np.int64),
+                "turnover": np.array(
+                    values.get("turnover", ()), dtype=np.float64
+                ),
+            },
+        )
+
+    @classmethod
+    def from_arrays(
+        cls,
+        date: NDArray,
+        open_price: NDArray,
+        close_price: NDArray,
+        high_price: NDArray,
+        low_price: NDArray,
+        volume: NDArray,
+        turnover: NDArray,
+        dtype: DTypeLike = np.float64
+    ) -> "PriceDataFrame":
+        """
+        Собирает контейнер из готовых колонок. Колонки нужного
+        типа и непрерывные в памяти не копируются.
+        Args:
+            date (np.ndarray): Микросекунды эпохи или datetime64.
+            dtype (DTypeLike): Тип цен, float64 или float32.
+        Raises:
+            ValueError: Если тип цен не float64 и не float32.
+        """
+        dtype = _price_dtype(dtype)
+        frame = cls.__new__(cls)
+        frame._set(
+            _to_epoch(date),
+            {
+                "open_price": np.ascontiguousarray(open_price, dtype=dtype),
+                "close_price": np.ascontiguousarray(close_price, dtype=dtype),
+                "high_price": np.ascontiguousarray(high_price, dtype=dtype),
+                "low_price": np.ascontiguousarray(low_price, dtype=dtype),
+                "volume": np.ascontiguousarray(volume, dtype=np.int64),
+                "turnover": np.ascontiguousarray(turnover, dtype=np.float64),
+            },
+        )
+        return frame
+
+    def astype(self, dtype: DTypeLike) -> "PriceDataFrame":
+        """
+        Копия с ценами типа `dtype`; даты и объём остаются
+        int64, оборот — float64. Кадр того же типа
+        возвращается как есть.
+        Args:
+            dtype (DTypeLike): Тип цен, float64 или float32.
+        Raises:
+            ValueError: Если тип цен не float64 и не float32.
+        """
+        dtype = _price_dtype(dtype)
+        if dtype == self.dtype:
+            return self
+        frame = PriceDataFrame.__new__(PriceDataFrame)
+        frame._set(
+            self._epoch,
+            {
+                name: column.astype(dtype) if name in _FLOAT_COLUMNS
+                else column
+                for name, column in self._columns.items()
+            },
+        )
+        return frame
 
-    def _convert_types(self):
+    def _set(self, epoch: NDArray, columns: dict[str, NDArray]) -> None:
+        for name, column in columns.items():
+            if column.shape != epoch.shape:
+                raise ValueError(
+                    f"Column '{name}' has {column.shape[0]} rows, "
+                    f"expected {epoch.shape[0]}"
+                )
+        self._epoch = epoch
+        self._columns = columns
+        self._index = None
+        self._frame = None
+
+    def __len__(self) -> int:
+        return self._epoch.shape[0]
+
+    def __getitem__(self, key: slice) -> "PriceDataFrame":
+        """
+        Срез по барам — представление тех же массивов.
+        """
+        if not isinstance(key, slice):
+            raise TypeError("PriceDataFrame supports slicing by bars only")
+        frame = PriceDataFrame.__new__(PriceDataFrame)
+        frame._set(
+            self._epoch[key],
+            {name: column[key] for name, column in self._columns.items()},
+        )
+        return frame
+
+    def tail(self, n: int) -> "PriceDataFrame":
+        """
+        Последние `n` баров без копирования.
+        """
+        return self[max(len(self) - n, 0):]
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    @property
+    def dtype(self) -> np.dtype:
+        """
+        Тип цен: float64 или float32 (компактный режим).
+        """
+        return self._columns["close_price"].dtype
+
+    @property
+    def epoch(self) -> NDArray:
         """
-        Приводим типы данных в соответствие
-        с таблицей QuestDB.
+        Время открытия баров, микросекунды эпохи (int64).
         """
-        self["date"] = pd.to_datetime(self["date"])
-        self["open_price"] = self["open_price"].astype(float)
-        self["close_price"] = self["close_price"].astype(float)
-        self["high_price"] = self["high_price"].astype(float)
-        self["low_price"] = self["low_price"].astype(float)
-        self["volume"] = self["volume"].astype(int)
-        self["turnover"] = self["turnover"].astype(float)
+        return self._epoch
 
     @property
-    def date(self) -> pd.Index:
+    def index(self) -> pd.DatetimeIndex:
+        """
+        Индекс дат для результатов индикаторов (строится лениво).
+        """
+        if self._index is None:
+            self._index = pd.DatetimeIndex(
+                self._epoch.view("datetime64[us]"), name="date"
+            )
+        return self._index
+
+    @property
+    def date(self) -> pd.DatetimeIndex:
         return self.index
 
     @property
-    def open_price(self) -> pd.Series:
-        return self["open_price"]
+    def open_price(self) -> NDArray:
+        return self._columns["open_price"]
+
+    @property
+    def close_prices(self) -> NDArray:
+        return self._columns["close_price"]
+
+    @property
+    def high_prices(self) -> NDArray:
+        return self._columns["high_price"]
 
     @property
-    def close_prices(self) -> pd.Series:
-        return self["close_price"]
+    def low_prices(self) -> NDArray:
+        return self._columns["low_price"]
 
     @property
-    def high_prices(self) -> pd.Series:
-        return self["high_price"]
+    def volumes(self) -> NDArray:
+        return self._columns["volume"]
+
+    @property
+    def turnover(self) -> NDArray:
+        return self._columns["turnover"]
+
+    def to_pandas(self) -> pd.DataFrame:
+        """
+        DataFrame с колонками таблицы QuestDB и индексом `date`
+        для кода, которому всё ещё нужен pandas. Строится один
+        раз при первом обращении.
+        """
+        if self._frame is None:
+            self._frame = pd.DataFrame(
+                {name: self._columns[name] for name in _COLUMNS[1:]},
+                index=self.index,
+            )
+        return self._frame
+
+
+def _price_dtype(dtype: DTypeLike) -> np.dtype:
+    """
+    Raises:
+        ValueError: Если тип цен не float64 и не float32.
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in _PRICE_DTYPES:
+        raise ValueError(
+            f"Price dtype {dtype} is not supported, use float64 or float32"
+        )
+    return dtype
+
+
+def _to_epoch(date: Sequence | NDArray) -> NDArray:
+    """
+    Приводит даты (ISO-строки QuestDB, datetime64 или
+    микросекунды эпохи) к int64 микросекундам эпохи.
+    """
+    values = np.asarray(date)
+    if values.dtype.kind in "iu":
+        return np.ascontiguousarray(values, dtype=np.int64)
+    if values.dtype.kind in "OU":
+        # numpy не разбирает суффикс зоны "Z", время QuestDB всегда в UTC
+        values = np.char.rstrip(values.astype(str), "Z")
+    return np.ascontiguousarray(
+        values.astype("datetime64[us]").view(np.int64)
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class OhlcvBlock:
+    """
+    Aligned OHLCV columns of several instruments.
+    Every array is a C-contiguous float64 matrix of shape
+    (instruments x bars), as expected by the batch kernels.
+    Blocks of float32 closes (compact mode) are float32
+    throughout, volume included, and so are their results.
+    """
+    open: NDArray
+    high: NDArray
+    low: NDArray
+    close: NDArray
+    volume: NDArray
+
+    def __post_init__(self) -> None:
+        close = np.atleast_2d(self.close)
+        shape = close.shape
+        dtype = np.float32 if close.dtype == np.float32 else np.float64
+        for name in ("open", "high", "low", "close", "volume"):
+            column = np.ascontiguousarray(
+                np.atleast_2d(getattr(self, name)), dtype=dtype
+            )
+            if column.shape != shape:
+                raise ValueError(
+                    f"Column '{name}' has shape {column.shape}, "
+                    f"expected {shape}"
+                )
+            object.__setattr__(self, name, column)
+
+    @classmethod
+    def from_frames(cls, frames: Sequence[PriceDataFrame]) -> "OhlcvBlock":
+        """
+        Stacks bar-aligned price frames into one block.
+        """
+        def stack(columns: list[NDArray]) -> NDArray:
+            # A single instrument is viewed, not copied
+            return columns[0][None] if len(columns) == 1 else np.stack(columns)
+
+        return cls(
+            open=stack([f.open_price for f in frames]),
+            high=stack([f.high_prices for f in frames]),
+            low=stack([f.low_prices for f in frames]),
+            close=stack([f.close_prices for f in frames]),
+            volume=stack([f.volumes for f in frames]),
+        )
 
     @property
-    def low_prices(self) -> pd.Series:
-        return self["low_price"]
+    def dtype(self) -> np.dtype:
+        return self.close.dtype
 
     @property
-    def volumes(self) -> pd.Series:
-        return self["volume"]
+    def n_instruments(self) -> int:
+        return self.close.shape[0]
 
     @property
-    def turnover(self) -> pd.Series:
-        return self["turnover"]
+    def n_bars(self) -> int:
+        return self.close.shape[1]
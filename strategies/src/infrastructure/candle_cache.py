@@ -0,0 +1,409 @@
+"""
+Read-through candle cache on local disk.
+
+Backtests and restarts read the same history from QuestDB again
+and again. `CandleCache` sits in front of a repository and keeps
+the candles of every table (instId, bar) it has read as one
+memory-mapped file per column, together with the set of date
+ranges it holds completely. A range read asks the repository
+only for the sub-ranges missing from that set and answers with
+views of the mapped columns, without copying.
+
+A covered range means every candle with its open time in the
+range is stored, so ranges without trades are remembered too.
+Bars that may still be written are never covered: a read covers
+its range up to the bars closed `settle` seconds before it. The
+part of a range after that is read from the repository every
+time, and only then is the result a copy. Inserts through the
+cache uncover their dates; candles written into covered history
+by other clients are not seen.
+
+Layout of a table in `<root>/<instId>_<bar>/`: `meta.json` holds
+the row count, the covered ranges and the generation, the columns
+are raw arrays in `g<generation>/`. Candles after every stored one
+are appended in place; a merge before them writes the next
+generation and switches `meta.json` to it. Frames mapped from an
+older generation stay valid. One process owns a cache directory.
+"""
+import asyncio
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import AsyncIterator, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+from strategies.src.application.interfaces import IDataQuery
+from strategies.src.domain.entities import (
+    CreateTableDM,
+    GetLastRecordsDM,
+    GetRangeRecordsDM,
+    InsertManyRecordsDM,
+    InsertRecordDM,
+)
+from strategies.src.infrastructure._types import PriceDataFrame, _to_epoch
+from strategies.src.infrastructure.resample import bar_length
+
+# Closed ranges of epoch microseconds, sorted and disjoint
+Intervals = list[tuple[int, int]]
+
+_COLUMNS: dict[str, np.dtype] = {
+    "epoch": np.dtype(np.int64),
+    "open_price": np.dtype(np.float64),
+    "close_price": np.dtype(np.float64),
+    "high_price": np.dtype(np.float64),
+    "low_price": np.dtype(np.float64),
+    "volume": np.dtype(np.int64),
+    "turnover": np.dtype(np.float64),
+}
+
+
+def _missing(intervals: Intervals, start: int, end: int) -> Intervals:
+    """
+    Parts of [start, end] not covered by `intervals`.
+    """
+    gaps: Intervals = []
+    for low, high in intervals:
+        if high < start:
+            continue
+        if low > end:
+            break
+        if low > start:
+            gaps.append((start, low - 1))
+        start = high + 1
+        if start > end:
+            return gaps
+    gaps.append((start, end))
+    return gaps
+
+
+def _cover(intervals: Intervals, start: int, end: int) -> Intervals:
+    """
+    `intervals` with [start, end] added; touching ranges merge.
+    """
+    merged: Intervals = []
+    for low, high in intervals:
+        if high < start - 1 or low > end + 1:
+            merged.append((low, high))
+        else:
+            start, end = min(start, low), max(end, high)
+    merged.append((start, end))
+    return sorted(merged)
+
+
+def _uncover(intervals: Intervals, start: int, end: int) -> Intervals:
+    """
+    `intervals` without [start, end].
+    """
+    kept: Intervals = []
+    for low, high in intervals:
+        if high < start or low > end:
+            kept.append((low, high))
+            continue
+        if low < start:
+            kept.append((low, start - 1))
+        if high > end:
+            kept.append((end + 1, high))
+    return kept
+
+
+def _iso(epoch: int) -> str:
+    # Epoch microseconds as a QuestDB UTC timestamp
+    return f"{np.datetime64(epoch, 'us')}Z"
+
+
+def _columns(data: PriceDataFrame) -> dict[str, NDArray]:
+    return {
+        "epoch": data.epoch,
+        "open_price": data.open_price,
+        "close_price": data.close_prices,
+        "high_price": data.high_prices,
+        "low_price": data.low_prices,
+        "volume": data.volumes,
+        "turnover": data.turnover,
+    }
+
+
+def _concat(frames: Sequence[PriceDataFrame]) -> PriceDataFrame:
+    columns = [_columns(frame) for frame in frames]
+    return PriceDataFrame.from_arrays(
+        *(
+            np.concatenate([frame[name] for frame in columns])
+            for name in (
+                "epoch", "open_price", "close_price", "high_price",
+                "low_price", "volume", "turnover",
+            )
+        )
+    )
+
+
+class _Table:
+    """
+    Mapped columns and covered ranges of one table.
+    """
+    __slots__ = ("path", "lock", "rows", "intervals", "generation", "columns")
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.lock = asyncio.Lock()
+        self.rows = 0
+        self.intervals: Intervals = []
+        self.generation = 0
+        meta = path / "meta.json"
+        if meta.exists():
+            state = json.loads(meta.read_text())
+            self.rows = state["rows"]
+            self.intervals = [tuple(pair) for pair in state["intervals"]]
+            self.generation = state["generation"]
+        self.columns: dict[str, NDArray] = {}
+        self._map()
+
+    def frame(self, start: int, end: int) -> PriceDataFrame:
+        """
+        Stored candles in [start, end], views of the mapped files.
+        """
+        epoch = self.columns["epoch"]
+        rows = slice(
+            int(np.searchsorted(epoch, start, "left")),
+            int(np.searchsorted(epoch, end, "right")),
+        )
+        columns = self.columns
+        return PriceDataFrame.from_arrays(
+            columns["epoch"][rows],
+            columns["open_price"][rows],
+            columns["close_price"][rows],
+            columns["high_price"][rows],
+            columns["low_price"][rows],
+            columns["volume"][rows],
+            columns["turnover"][rows],
+        )
+
+    def store(self, data: PriceDataFrame, start: int, end: int) -> None:
+        """
+        Stores candles read for [start, end] and covers the range.
+        Args:
+            data (PriceDataFrame): Every candle of the range in
+              chronological order; it replaces stored candles of
+              the same dates.
+        """
+        if not data.empty:
+            new = {
+                name: np.asarray(column, dtype=_COLUMNS[name])
+                for name, column in _columns(data).items()
+            }
+            if self.rows and new["epoch"][0] <= self.columns["epoch"][-1]:
+                self._merge(new)
+            else:
+                self._append(new)
+        self.cover(start, end)
+
+    def cover(self, start: int, end: int) -> None:
+        self.intervals = _cover(self.intervals, start, end)
+        self.save()
+
+    def save(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        temporary = self.path / "meta.json.tmp"
+        temporary.write_text(json.dumps({
+            "rows": self.rows,
+            "intervals": self.intervals,
+            "generation": self.generation,
+        }))
+        os.replace(temporary, self.path / "meta.json")
+
+    def _directory(self, generation: int) -> Path:
+        return self.path / f"g{generation}"
+
+    def _append(self, new: dict[str, NDArray]) -> None:
+        directory = self._directory(self.generation)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, column in new.items():
+            path = directory / name
+            # Drop bytes of an append that was not saved
+            with open(path, "r+b" if path.exists() else "wb") as file:
+                file.seek(self.rows * column.itemsize)
+                file.truncate()
+                column.tofile(file)
+        self.rows += len(new["epoch"])
+        self._map()
+
+    def _merge(self, new: dict[str, NDArray]) -> None:
+        epoch = np.concatenate([new["epoch"], self.columns["epoch"]])
+        # New candles come first, so they win ties of the stable sort
+        order = np.argsort(epoch, kind="stable")
+        unique = np.ones(len(order), dtype=np.bool_)
+        unique[1:] = epoch[order[1:]] != epoch[order[:-1]]
+        order = order[unique]
+        old = self._directory(self.generation)
+        directory = self._directory(self.generation + 1)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, column in new.items():
+            np.concatenate([column, self.columns[name]])[order].tofile(
+                directory / name
+            )
+        self.generation += 1
+        self.rows = len(order)
+        self.save()
+        self._map()
+        # Mappings of the old files stay valid after the unlink
+        shutil.rmtree(old, ignore_errors=True)
+
+    def _map(self) -> None:
+        directory = self._directory(self.generation)
+        self.columns = {
+            name: (
+                np.memmap(
+                    directory / name, dtype=dtype, mode="r",
+                    shape=(self.rows,),
+                )
+                if self.rows else np.empty(0, dtype=dtype)
+            )
+            for name, dtype in _COLUMNS.items()
+        }
+
+
+class CandleCache(IDataQuery):
+    """
+    Read-through cache of candle ranges in memory-mapped files.
+
+    Range reads are served from the cache and fill it; the frames
+      are read-only views of the mapped files, valid as long as
+      they are referenced. `get_last_records` and writes go to the
+      repository, writes first uncovering their dates.
+
+    Example:
+        cache = CandleCache(DataQueryRepo(client, config), "~/.cache/candles")
+        history = await cache.get_records_by_date_range(params)
+    """
+
+    def __init__(
+        self,
+        repo: IDataQuery,
+        root: str | os.PathLike,
+        settle: float = 60.0,
+        chunk_size: int = 100_000
+    ) -> None:
+        """
+        Args:
+            repo (IDataQuery): Repository the missing ranges are
+              read from.
+            root (str | os.PathLike): Cache directory.
+            settle (float): Seconds after the close of a bar
+              until it is assumed stored in QuestDB.
+            chunk_size (int): Candles per page read from the
+              repository.
+        """
+        self._repo = repo
+        self._root = Path(root).expanduser()
+        self._settle = int(settle * 1e6)
+        self._chunk_size = chunk_size
+        self._tables: dict[tuple[str, str], _Table] = {}
+
+    def covered(self, inst_id: str, bar: str) -> Intervals:
+        """
+        Ranges of a table held completely, in epoch microseconds.
+        """
+        return list(self._table(inst_id, bar).intervals)
+
+    async def create_datatable(self, params: CreateTableDM) -> bool:
+        return await self._repo.create_datatable(params)
+
+    async def get_last_records(
+        self,
+        params: GetLastRecordsDM
+    ) -> PriceDataFrame:
+        return await self._repo.get_last_records(params)
+
+    async def get_records_by_date_range(
+        self,
+        params: GetRangeRecordsDM
+    ) -> PriceDataFrame:
+        """
+        Candles of a date range, read from the repository only
+          for the parts the cache does not hold.
+        Returns:
+            PriceDataFrame: Views of the mapped files, or a copy
+              if the range reaches bars that are not settled.
+        Raises:
+            ValueError: If the bar is unknown or the repository
+              fails.
+        """
+        start, end = (int(epoch) for epoch in _to_epoch(
+            [params.start_date, params.end_date]
+        ))
+        table = self._table(params.instId, params.bar)
+        # Open times of the bars closed `settle` seconds ago
+        horizon = (
+            time.time_ns() // 1_000 - bar_length(params.bar) - self._settle
+        )
+        unsettled: list[PriceDataFrame] = []
+        async with table.lock:
+            for low, high in _missing(table.intervals, start, end):
+                async for chunk in self._repo.iter_records_by_date_range(
+                    GetRangeRecordsDM(
+                        params.instId, params.bar, _iso(low), _iso(high)
+                    ),
+                    self._chunk_size,
+                ):
+                    settled = int(
+                        np.searchsorted(chunk.epoch, horizon, "right")
+                    )
+                    if settled:
+                        # Pages are complete up to their last candle
+                        table.store(
+                            chunk[:settled], low, int(chunk.epoch[settled - 1])
+                        )
+                    if settled < len(chunk):
+                        unsettled.append(chunk[settled:])
+                if low <= min(high, horizon):
+                    table.cover(low, min(high, horizon))
+            cached = table.frame(start, min(end, horizon))
+        if unsettled:
+            return _concat([cached, *unsettled])
+        return cached
+
+    async def iter_records_by_date_range(
+        self,
+        params: GetRangeRecordsDM,
+        chunk_size: int = 100_000
+    ) -> AsyncIterator[PriceDataFrame]:
+        data = await self.get_records_by_date_range(params)
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+
+    async def insert_record(self, params: InsertRecordDM) -> bool:
+        epoch = int(_to_epoch([params.date])[0])
+        await self._uncover(params.instId, params.bar, epoch, epoch)
+        return await self._repo.insert_record(params)
+
+    async def insert_many_data(self, params: InsertManyRecordsDM) -> bool:
+        if params.data:
+            epoch = _to_epoch([record.date for record in params.data])
+            await self._uncover(
+                params.instId, params.bar, int(epoch.min()), int(epoch.max())
+            )
+        return await self._repo.insert_many_data(params)
+
+    async def _uncover(
+        self,
+        inst_id: str,
+        bar: str,
+        start: int,
+        end: int
+    ) -> None:
+        table = self._table(inst_id, bar)
+        async with table.lock:
+            intervals = _uncover(table.intervals, start, end)
+            if intervals != table.intervals:
+                table.intervals = intervals
+                table.save()
+
+    def _table(self, inst_id: str, bar: str) -> _Table:
+        table = self._tables.get((inst_id, bar))
+        if table is None:
+            table = _Table(self._root / f"{inst_id}_{bar}")
+            self._tables[inst_id, bar] = table
+        return table
@@ -1,6 +1,9 @@
+import asyncio
+from typing import AsyncIterator
+
+import numpy as np
 from httpx import AsyncClient, Response
-from sqlalchemy import text
-from sqlalchemy.sql import quoted_name
+from sqlalchemy import TextClause, text
 
 from strategies.src.application.interfaces import IDataQuery
 from strategies.src.config import QuestConfig
@@ -12,22 +15,81 @@ from strategies.src.domain.entities import (
     InsertRecordDM,
 )
 from strategies.src.infrastructure._types import PriceDataFrame
+from strategies.src.infrastructure.ilp import IlpWriter
+
+_CANDLE_COLUMNS = (
+    "date, open_price, close_price, high_price, low_price, volume, turnover"
+)
+
+
+def _identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _render(query: TextClause) -> str:
+    # /exec takes no bind parameters: values go into the SQL text
+    return str(query.compile(compile_kwargs={"literal_binds": True}))
 
 
 class DataQueryRepo(IDataQuery):
+    """
+    Candles in QuestDB, in one of the layouts of
+      `QuestConfig.layout`: a `{instId}_{bar}_data` table per
+      instrument and timeframe, or a single `candles_table` keyed
+      by the `instId` and `bar` symbols. `python -m
+      strategies.src.infrastructure.migrate` copies the former
+      into the latter.
+    """
+
     def __init__(
         self,
         httpx_client: AsyncClient,
-        config: QuestConfig
+        config: QuestConfig,
+        ilp_writer: IlpWriter | None = None
     ) -> None:
+        """
+        Args:
+            ilp_writer (IlpWriter | None): Connected ILP writer;
+              `insert_many_data` goes through it instead of SQL
+              over HTTP when given. With the single layout it
+              must write to `config.candles_table`.
+        Raises:
+            ValueError: If the ILP writer targets a different
+              layout or table than `config`.
+        """
+        if ilp_writer is not None:
+            expected = (
+                config.candles_table if config.layout == "single" else None
+            )
+            if ilp_writer.table != expected:
+                raise ValueError(
+                    f"ILP writer table {ilp_writer.table!r} does not match "
+                    f"the {config.layout!r} layout (expected {expected!r})"
+                )
         self._client = httpx_client
         self._config = config
+        self._ilp_writer = ilp_writer
+
+    @property
+    def single_table(self) -> bool:
+        return self._config.layout == "single"
 
     async def create_datatable(self, params: CreateTableDM) -> bool:
-        table_name = quoted_name(f"{params.instId}_{params.bar}_data", quote=True)
-        partition_type = params.partition.upper() if params.partition else "NONE"
-        query = text("""
-            CREATE TABLE :table_name (
+        """
+        Creates the table of an instrument and timeframe, or with
+          the single layout the candles table if it is missing.
+        """
+        if self.single_table:
+            return await self._create_candles_table(params.partition)
+        table_name = _identifier(f"{params.instId}_{params.bar}_data")
+        # WAL tables, which deduplication needs, must be partitioned
+        partition_type = params.partition.upper() if params.partition else "DAY"
+        if not partition_type.isalpha():
+            raise ValueError(f"Invalid partition '{params.partition}'")
+        # Identifiers and keywords cannot be bind parameters; a
+        # candle rewritten by an ILP resend replaces the stored one
+        query = f"""
+            CREATE TABLE {table_name} (
                 date TIMESTAMP,
                 open_price DOUBLE,
                 close_price DOUBLE, 
@@ -35,12 +97,12 @@ class DataQueryRepo(IDataQuery):
                 low_price DOUBLE,
                 volume LONG,
                 turnover DOUBLE 
-            ) TIMESTAMP(date) PARTITION BY :partition_type WAL;
-        """).bindparams(
-            table_name=table_name, 
-            partition_type=partition_type
+            ) TIMESTAMP(date) PARTITION BY {partition_type} WAL
+            DEDUP UPSERT KEYS(date);
+        """
+        response = await self._client.post(
+            self._config.url, params={"query": query}
         )
-        response = await self._client.post(self._config.url, params=str(query))
         if response.status_code != 200:
             raise ValueError(f"Error {response.status_code}: {response.text}")
         return True
@@ -49,102 +111,161 @@ class DataQueryRepo(IDataQuery):
         self, 
         params: GetLastRecordsDM
     ) -> PriceDataFrame:
-        table_name = quoted_name(
-            f"{params.instId}_{params.bar}_data",
-            quote=True
+        # The newest n bars, oldest first as the indicators expect
+        newest = self._select(
+            params.instId, params.bar, [], "ORDER BY date DESC LIMIT :n",
+            n=params.n,
         )
-        query = text("""
-            SELECT * FROM :table_name
-            ORDER BY date DESC
-            LIMIT :n
-        """).bindparams(
-            table_name=table_name, 
-            n=params.n
+        return await self._query(
+            f"SELECT * FROM ({newest}) ORDER BY date ASC"
         )
-        response = await self._client.post(self._config.url, params=str(query))
-        return self._response_mapper(response)
 
     async def get_records_by_date_range(
         self, 
         params: GetRangeRecordsDM
     ) -> PriceDataFrame:
-        table_name = quoted_name(
-            f"{params.instId}_{params.bar}_data", quote=True
-        )
-        query = text("""
-            SELECT * FROM :table_name
-            WHERE date BETWEEN :start_date AND :end_date
-            ORDER BY date ASC
-        """).bindparams(
-            table_name=table_name, 
+        return await self._query(self._select(
+            params.instId, params.bar,
+            ["date BETWEEN :start_date AND :end_date"],
+            "ORDER BY date ASC",
             start_date=params.start_date,
             end_date=params.end_date,
+        ))
+
+    async def iter_records_by_date_range(
+        self,
+        params: GetRangeRecordsDM,
+        chunk_size: int = 100_000
+    ) -> AsyncIterator[PriceDataFrame]:
+        """
+        Streams a date range in chunks of `chunk_size` candles.
+        Pages are read by keyset on `date`: a page starts at the
+          date of the last candle of the previous one and skips
+          the candles of that date already yielded, so candles
+          sharing a date (tables created without DEDUP) are not
+          lost at a page boundary. Every page is an indexed range
+          scan and memory stays bounded by one chunk. The next
+          page is requested while the caller processes the
+          current one.
+        Args:
+            params (GetRangeRecordsDM): Table and date range.
+            chunk_size (int): Candles per chunk.
+        Yields:
+            PriceDataFrame: Consecutive chunks in chronological
+              order; only the last one may be shorter.
+        Raises:
+            ValueError: If QuestDB rejects a page query.
+        """
+        page = asyncio.ensure_future(
+            self._range_page(params, None, 0, chunk_size)
         )
-        response = await self._client.post(
-            self._config.url, 
-            params=str(query)
-        )
-        return self._response_mapper(response)
+        # Date of the last candle yielded and candles yielded at it
+        after, seen = None, 0
+        try:
+            while page is not None:
+                chunk = await page
+                page = None
+                if chunk.empty:
+                    return
+                if len(chunk) == chunk_size:
+                    last = int(chunk.epoch[-1])
+                    tied = int(np.count_nonzero(chunk.epoch == last))
+                    seen = tied + (seen if last == after else 0)
+                    after = last
+                    page = asyncio.ensure_future(
+                        self._range_page(params, after, seen, chunk_size)
+                    )
+                yield chunk
+        finally:
+            # The caller stopped early
+            if page is not None:
+                page.cancel()
+
+    async def _range_page(
+        self,
+        params: GetRangeRecordsDM,
+        after: int | None,
+        skip: int,
+        limit: int
+    ) -> PriceDataFrame:
+        """
+        Up to `limit` candles from the date `after` on, without
+          the first `skip` of them.
+        """
+        conditions = ["date BETWEEN :start_date AND :end_date"]
+        values: dict[str, str | int] = {
+            "start_date": params.start_date,
+            "end_date": params.end_date,
+            "limit": skip + limit,
+        }
+        if after is not None:
+            conditions.append("date >= :after")
+            # Epoch microseconds as a QuestDB UTC timestamp
+            values["after"] = f"{np.datetime64(after, 'us')}Z"
+        page = await self._query(self._select(
+            params.instId, params.bar, conditions,
+            "ORDER BY date ASC LIMIT :limit", **values,
+        ))
+        return page[skip:]
 
     async def insert_record(self, params: InsertRecordDM) -> bool:
-        table_name = quoted_name(
-            f"{params.instId}_{params.bar}_data",
-            quote=True
-        )
-        query = text("""
-            BEGIN;
-            INSERT INTO :table_name 
-                (
-                    date, open_price, close_price, 
-                    high_price, low_price, volume, 
-                    turnover
-                )
-            VALUES 
-                (
-                    :date, :open_price, :close_price, 
-                    :high_price, :low_price, :volume,
-                    :turnover
-                );
-            COMMIT;
-        """).bindparams(
-            table_name=table_name, 
-            date=params.date,
-            open_price=params.open_price, 
-            close_price=params.close_price,
-            high_price=params.high_price, 
-            low_price=params.low_price, 
-            volume=params.volume, 
-            turnover=params.turnover
-        ) 
+        return await self.insert_many_data(InsertManyRecordsDM(
+            instId=params.instId, bar=params.bar, data=[params]
+        ))
+
+    async def insert_many_data(self, params: InsertManyRecordsDM) -> bool:
+        if self._ilp_writer is not None:
+            # Buffered: rows are sent by the writer's next flush
+            await self._ilp_writer.write(params)
+            return True
         response = await self._client.post(
             self._config.url, 
-            params={"query": str(query)}
+            params={"query": self._insert_many_query(
+                params,
+                self._config.candles_table if self.single_table else None,
+            )}
         )
         if response.status_code != 200:
             raise ValueError(f"Error {response.status_code}: {response.text}")
         return True
 
-    async def insert_many_data(self, params: InsertManyRecordsDM) -> bool:
-        table_name = quoted_name(f"{params.instId}_{params.bar}_data", quote=True)
+    @staticmethod
+    def _insert_many_query(
+        params: InsertManyRecordsDM,
+        candles_table: str | None = None
+    ) -> str:
+        """
+        Args:
+            candles_table (str | None): Table of the single
+              layout; the rows then carry `instId` and `bar`.
+        """
+        if candles_table is None:
+            table_name = _identifier(f"{params.instId}_{params.bar}_data")
+            symbols, symbol_values = "", ""
+        else:
+            table_name = _identifier(candles_table)
+            symbols, symbol_values = "instId, bar, ", ":inst_id, :bar, "
         values_sql = ", ".join(
             f"""(
-                :date{i}, :open_price{i}, :close_price{i},
+                {symbol_values}:date{i}, :open_price{i}, :close_price{i},
                 :high_price{i}, :low_price{i}, :volume{i},
                 :turnover{i}
             )"""
             for i in range(len(params.data))
         )
-        query = text("""
-            BEGIN;
-            INSERT INTO :table_name 
+        # One multi-row INSERT is atomic; /exec runs one statement
+        query = text(f"""
+            INSERT INTO {table_name}
                 (
-                    date, open_price, close_price, 
+                    {symbols}date, open_price, close_price, 
                     high_price, low_price, volume, 
                     turnover
                 )
-            VALUES """ + values_sql + "; COMMIT;"
-        ).bindparams(table_name=table_name)
+            VALUES """ + values_sql
+        )
         bind_params: dict[str, float | int | str] = {}
+        if candles_table is not None:
+            bind_params |= {"inst_id": params.instId, "bar": params.bar}
         for i, record in enumerate(params.data):
             bind_params |= {
                 f"date{i}": record.date,
@@ -155,18 +276,75 @@ class DataQueryRepo(IDataQuery):
                 f"volume{i}": record.volume,
                 f"turnover{i}": record.turnover,
             }
-        query = query.bindparams(**bind_params)
+        return _render(query.bindparams(**bind_params))
+
+    async def _create_candles_table(self, partition: str | None) -> bool:
+        partition_type = partition.upper() if partition else "DAY"
+        if not partition_type.isalpha():
+            raise ValueError(f"Invalid partition '{partition}'")
+        table_name = _identifier(self._config.candles_table)
+        # Rewritten candles (a resent ILP batch, a migration rerun)
+        # replace the stored ones
+        query = f"""
+            CREATE TABLE IF NOT EXISTS {table_name} (
+                instId SYMBOL,
+                bar SYMBOL,
+                date TIMESTAMP,
+                open_price DOUBLE,
+                close_price DOUBLE,
+                high_price DOUBLE,
+                low_price DOUBLE,
+                volume LONG,
+                turnover DOUBLE
+            ) TIMESTAMP(date) PARTITION BY {partition_type} WAL
+            DEDUP UPSERT KEYS(date, instId, bar);
+        """
         response = await self._client.post(
-            self._config.url, 
-            params={"query": str(query)}
+            self._config.url, params={"query": query}
         )
         if response.status_code != 200:
             raise ValueError(f"Error {response.status_code}: {response.text}")
         return True
 
+    def _select(
+        self,
+        inst_id: str,
+        bar: str,
+        conditions: list[str],
+        suffix: str,
+        **values: str | int
+    ) -> str:
+        """
+        SELECT of the candles of an instrument and timeframe in
+          the configured layout, with the values rendered.
+        Args:
+            conditions (list[str]): WHERE conditions with bind
+              parameters.
+            suffix (str): ORDER BY / LIMIT clauses.
+            **values: Values of the bind parameters.
+        """
+        if self.single_table:
+            table_name = self._config.candles_table
+            conditions = ["instId = :inst_id", "bar = :bar", *conditions]
+            values |= {"inst_id": inst_id, "bar": bar}
+        else:
+            table_name = f"{inst_id}_{bar}_data"
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = text(
+            f"SELECT {_CANDLE_COLUMNS} FROM {_identifier(table_name)} "
+            f"{where} {suffix}"
+        ).bindparams(**values)
+        return _render(query)
+
+    async def _query(self, query: str) -> PriceDataFrame:
+        response = await self._client.post(
+            self._config.url, params={"query": query}
+        )
+        return self._response_mapper(response)
+
     def _response_mapper(self, response: Response) -> PriceDataFrame:
         if response.status_code != 200:
             raise ValueError(f"Error {response.status_code}: {response.text}")
-        data = response.json()["dataset"]
-        columns = response.json()["columns"]
-        return PriceDataFrame(data, columns=columns)
\ No newline at end of file
+        payload = response.json()
+        # Columns are parsed straight into numpy arrays
+        return PriceDataFrame(payload["dataset"], columns=payload["columns"])
\ No newline at end of file
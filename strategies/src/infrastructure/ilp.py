@@ -0,0 +1,435 @@
+"""
+Candle ingestion over the InfluxDB line protocol (ILP).
+
+QuestDB accepts ILP on a plain TCP socket (port 9009), without
+SQL parsing or per-row bind parameters: `IlpWriter` keeps one
+connection open, encodes whole batches of candles into a byte
+buffer and sends it when it grows past `max_bytes` or every
+`flush_interval` seconds.
+
+ILP over TCP has no acknowledgements, and QuestDB only ever
+closes the connection (idle timeout, malformed line). A write to
+a socket the server already closed still succeeds locally, so
+the writer checks for the server's end of stream before and
+after every send. A batch stays buffered until it was drained
+with the connection still open; otherwise the writer reconnects
+and sends the whole batch again. QuestDB drops a line cut off by
+a broken connection, but lines received before the break are
+stored, so a resent batch can duplicate rows unless the table
+deduplicates on `date` (`DEDUP UPSERT KEYS(date)`, as the tables
+of `DataQueryRepo.create_datatable` do).
+
+A server that closes the connection after a send has most likely
+rejected a malformed line. A sent batch therefore stays in doubt
+until the next flush finds the connection still open; if the
+server closed it meanwhile, the batch counts as rejected and is
+sent again. A batch rejected `max_rejections` times in a row is
+moved to a small quarantine instead of being resent forever.
+The buffer never grows past `max_buffer_bytes`: a write that
+does not fit raises `BufferError` and buffers nothing. NaN and
+infinite values are rejected when encoding, ILP has no literal
+for them.
+
+With the single-table layout (`QuestConfig.layout == "single"`)
+every line goes to one table and carries the instrument and the
+timeframe as the `instId` and `bar` symbols.
+"""
+import asyncio
+import logging
+from collections import deque
+from typing import Mapping, Sequence
+
+import numpy as np
+
+from strategies.src.domain.entities import Data, InsertManyRecordsDM
+from strategies.src.infrastructure._types import PriceDataFrame, _to_epoch
+
+logger = logging.getLogger(__name__)
+
+# Characters escaped in ILP table names and symbol values
+_ESCAPES = str.maketrans({" ": "\\ ", ",": "\\,", "=": "\\="})
+
+
+def table_name(inst_id: str, bar: str) -> str:
+    """
+    Name of the candle table of an instrument and timeframe.
+    """
+    return f"{inst_id}_{bar}_data"
+
+
+def _prefix(table: str, symbols: Mapping[str, str] | None) -> str:
+    prefix = table.translate(_ESCAPES)
+    for name, value in (symbols or {}).items():
+        prefix += f",{name}={value.translate(_ESCAPES)}"
+    return prefix
+
+
+def _check_finite(table: str, values: np.ndarray) -> None:
+    """
+    Raises:
+        ValueError: If a row holds NaN or an infinite value.
+    """
+    finite = np.isfinite(values)
+    if not finite.all():
+        row = int(np.flatnonzero(~finite.all(axis=0))[0])
+        raise ValueError(
+            f"Candle {row} of {table} has a NaN or infinite value, "
+            "which ILP cannot encode"
+        )
+
+
+def encode_records(
+    table: str,
+    data: Sequence[Data],
+    symbols: Mapping[str, str] | None = None
+) -> bytes:
+    """
+    Encodes candles as ILP lines in one pass.
+    Args:
+        table (str): Target table.
+        data (Sequence[Data]): Candles; `date` is an ISO time
+          as stored by QuestDB.
+        symbols (Mapping[str, str] | None): Symbol columns and
+          their values, the same on every line.
+    Returns:
+        bytes: One line per candle, designated timestamp in
+          nanoseconds.
+    Raises:
+        ValueError: If a price or the turnover is NaN or
+          infinite.
+    """
+    if not data:
+        return b""
+    _check_finite(table, np.array([
+        [r.open_price for r in data],
+        [r.close_price for r in data],
+        [r.high_price for r in data],
+        [r.low_price for r in data],
+        [r.turnover for r in data],
+    ], dtype=np.float64))
+    epoch = _to_epoch([record.date for record in data])
+    epoch_ns = (epoch * 1000).tolist()
+    prefix = _prefix(table, symbols)
+    return "".join([
+        f"{prefix} open_price={r.open_price!r},close_price={r.close_price!r},"
+        f"high_price={r.high_price!r},low_price={r.low_price!r},"
+        f"volume={r.volume}i,turnover={r.turnover!r} {ns}\n"
+        for r, ns in zip(data, epoch_ns)
+    ]).encode()
+
+
+def encode_frame(
+    table: str,
+    data: PriceDataFrame,
+    symbols: Mapping[str, str] | None = None
+) -> bytes:
+    """
+    Encodes the candles of a `PriceDataFrame` as ILP lines.
+    Raises:
+        ValueError: If a price or the turnover is NaN or
+          infinite.
+    """
+    prefix = _prefix(table, symbols)
+    # float32 prices widen to float64 exactly
+    values = np.array([
+        data.open_price, data.close_prices, data.high_prices,
+        data.low_prices, data.turnover,
+    ], dtype=np.float64)
+    _check_finite(table, values)
+    columns = values.tolist()
+    return "".join([
+        f"{prefix} open_price={o!r},close_price={c!r},"
+        f"high_price={h!r},low_price={lo!r},"
+        f"volume={v}i,turnover={t!r} {ns}\n"
+        for o, c, h, lo, t, v, ns in zip(
+            *columns,
+            data.volumes.tolist(),
+            (data.epoch * 1000).tolist(),
+        )
+    ]).encode()
+
+
+class IlpWriter:
+    """
+    Buffered ILP writer on a persistent TCP connection.
+
+    Use it as an async context manager (or call `connect` and
+    `close`). `write` and `write_frame` only encode into the
+    buffer; it is sent once it holds `max_bytes`, by the
+    background flush every `flush_interval` seconds, or by an
+    explicit `flush`. After a failed flush, writes only buffer
+    until the last retry delay has passed, so they do not wait
+    through the backoff of an unreachable server again.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 9009,
+        max_bytes: int = 1 << 20,
+        flush_interval: float = 1.0,
+        retries: int = 3,
+        retry_delay: float = 0.5,
+        table: str | None = None,
+        max_buffer_bytes: int = 64 << 20,
+        max_rejections: int = 3
+    ) -> None:
+        """
+        Args:
+            host (str): QuestDB host.
+            port (int): ILP port.
+            max_bytes (int): Buffer size that triggers a flush.
+            flush_interval (float): Seconds between background
+              flushes; 0 disables them.
+            retries (int): Reconnects per flush before giving up.
+            retry_delay (float): First delay between reconnects,
+              doubled after every failure.
+            table (str | None): Single table all candles go to,
+              with `instId` and `bar` symbols; per-instrument
+              tables when omitted.
+            max_buffer_bytes (int): Hard cap of the buffer.
+            max_rejections (int): Sends a batch may be rejected
+              by the server before it is quarantined.
+        """
+        self._host = host
+        self._port = port
+        self._max_bytes = max_bytes
+        self._flush_interval = flush_interval
+        self._retries = retries
+        self._retry_delay = retry_delay
+        self._table = table
+        self._max_buffer_bytes = max_buffer_bytes
+        self._max_rejections = max_rejections
+        self._buffer = bytearray()
+        # Last batch sent, until the connection is seen open after it
+        self._in_doubt = b""
+        # Consecutive sends the server rejected
+        self._rejections = 0
+        # Loop time before which writes do not trigger a flush
+        self._retry_at = 0.0
+        self._quarantine: deque[bytes] = deque(maxlen=16)
+        self._lock = asyncio.Lock()
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._flusher: asyncio.Task | None = None
+
+    async def __aenter__(self) -> "IlpWriter":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    @property
+    def pending_bytes(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def quarantined(self) -> list[bytes]:
+        """
+        Latest batches dropped after `max_rejections` rejections.
+        """
+        return list(self._quarantine)
+
+    @property
+    def table(self) -> str | None:
+        """
+        Single table the candles go to, None for per-instrument
+          tables.
+        """
+        return self._table
+
+    async def connect(self) -> None:
+        """
+        Opens the connection and starts the background flush.
+        Raises:
+            OSError: If QuestDB cannot be reached.
+        """
+        await self._open()
+        if self._flush_interval > 0 and self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def write(self, params: InsertManyRecordsDM) -> None:
+        """
+        Buffers a batch of candles of one table.
+        Raises:
+            ValueError: If a candle has a NaN or infinite value.
+            BufferError: If the batch does not fit in the buffer;
+              it is not buffered.
+            ConnectionError: If a triggered flush fails.
+        """
+        table, symbols = self._target(params.instId, params.bar)
+        await self._append(encode_records(table, params.data, symbols))
+
+    async def write_frame(
+        self,
+        inst_id: str,
+        bar: str,
+        data: PriceDataFrame
+    ) -> None:
+        """
+        Buffers the candles of a `PriceDataFrame`.
+        Raises:
+            ValueError: If a candle has a NaN or infinite value.
+            BufferError: If the candles do not fit in the buffer;
+              they are not buffered.
+            ConnectionError: If a triggered flush fails.
+        """
+        table, symbols = self._target(inst_id, bar)
+        await self._append(encode_frame(table, data, symbols))
+
+    async def flush(self) -> None:
+        """
+        Sends the buffered lines, reconnecting if needed.
+        Raises:
+            ConnectionError: If the lines could not be sent
+              after `retries` reconnects; they stay buffered.
+            ValueError: If the server rejected the lines
+              `max_rejections` times; they are quarantined.
+        """
+        async with self._lock:
+            if self._in_doubt:
+                sent, self._in_doubt = self._in_doubt, b""
+                if self._connected():
+                    self._rejections = 0
+                else:
+                    # Closed after the last send: send it again
+                    self._buffer[:0] = sent
+                    self._rejected(sent)
+            if not self._buffer:
+                return
+            payload = bytes(self._buffer)
+            delay = self._retry_delay
+            for attempt in range(self._retries + 1):
+                try:
+                    if not self._connected():
+                        await self._drop_connection()
+                        await self._open()
+                    self._writer.write(payload)
+                    await self._writer.drain()
+                    # Let a close of the server during the send
+                    # reach the reader
+                    await asyncio.sleep(0)
+                    if not self._connected():
+                        self._rejected(payload)
+                        raise ConnectionResetError(
+                            "connection closed by QuestDB"
+                        )
+                except OSError as error:
+                    logger.warning(
+                        "ILP flush of %d bytes failed (attempt %d): %s",
+                        len(payload), attempt + 1, error,
+                    )
+                    await self._drop_connection()
+                    if attempt < self._retries:
+                        await asyncio.sleep(delay)
+                        delay *= 2
+                    continue
+                # Lines written meanwhile stay for the next flush
+                del self._buffer[:len(payload)]
+                self._in_doubt = payload
+                self._retry_at = 0.0
+                return
+            self._retry_at = asyncio.get_running_loop().time() + delay
+            raise ConnectionError(
+                f"ILP flush to {self._host}:{self._port} failed after "
+                f"{self._retries + 1} attempts"
+            )
+
+    async def close(self) -> None:
+        """
+        Flushes what is left and closes the connection.
+        Raises:
+            ConnectionError: If the final flush fails.
+        """
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        try:
+            await self.flush()
+        finally:
+            await self._drop_connection()
+
+    async def _append(self, lines: bytes) -> None:
+        if len(self._buffer) + len(lines) > self._max_buffer_bytes:
+            await self._flush_if_full()
+            if len(self._buffer) + len(lines) > self._max_buffer_bytes:
+                raise BufferError(
+                    f"ILP buffer holds {len(self._buffer)} of "
+                    f"{self._max_buffer_bytes} bytes; {len(lines)} bytes "
+                    f"not buffered (QuestDB at {self._host}:{self._port} "
+                    "unreachable?)"
+                )
+        self._buffer += lines
+        await self._flush_if_full()
+
+    async def _flush_if_full(self) -> None:
+        if (
+            len(self._buffer) >= self._max_bytes
+            and asyncio.get_running_loop().time() >= self._retry_at
+        ):
+            await self.flush()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            try:
+                await self.flush()
+            except (ConnectionError, ValueError) as error:
+                # Kept buffered (or quarantined), retried on the
+                # next tick
+                logger.error("%s", error)
+
+    def _rejected(self, payload: bytes) -> None:
+        """
+        Counts a rejection of the batch at the head of the buffer
+          and drops it after `max_rejections` in a row.
+        Raises:
+            ValueError: If the batch was dropped.
+        """
+        self._rejections += 1
+        if self._rejections < self._max_rejections:
+            return
+        del self._buffer[:len(payload)]
+        self._quarantine.append(payload)
+        self._rejections = 0
+        raise ValueError(
+            f"ILP batch of {len(payload)} bytes rejected by QuestDB "
+            f"{self._max_rejections} times; moved to quarantine"
+        )
+
+    def _target(
+        self,
+        inst_id: str,
+        bar: str
+    ) -> tuple[str, dict[str, str] | None]:
+        if self._table is None:
+            return table_name(inst_id, bar), None
+        return self._table, {"instId": inst_id, "bar": bar}
+
+    def _connected(self) -> bool:
+        return (
+            self._writer is not None
+            and not self._writer.is_closing()
+            and not self._reader.at_eof()
+        )
+
+    async def _open(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(
+            self._host, self._port
+        )
+
+    async def _drop_connection(self) -> None:
+        writer, self._writer = self._writer, None
+        self._reader = None
+        if writer is None:
+            return
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
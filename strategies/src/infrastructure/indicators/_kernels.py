@@ -0,0 +1,865 @@
+import math
+
+import numpy as np
+from numpy.typing import NDArray
+
+from strategies.src.infrastructure.indicators.jit import F8, P, f8, i8, kernel, p
+
+# Moving average modes understood by the compiled kernels
+MA_RMA, MA_EMA, MA_SMA = 0, 1, 2
+# Per-bar signal codes, stored as int8
+LONG, FLAT, SHORT = 1, 0, -1
+# Weight a recursive average (EMA, RMA, Wilder) still gives to the
+# bars before its lookback: below it, the value on the last bar
+# no longer depends on where the history starts, up to rounding
+SETTLE_WEIGHT = 1e-10
+# %K and %D closer than this (on their 0-100 scale) are a tie and do
+# not cross: rounding (a running SMA of saturated %K lands at 100 +-
+# 1e-13) and the settled part of the RSI would otherwise decide the
+# crossover differently for each start of the history
+STOCH_TIE = 1e-6
+
+_MA_CODES = {"rma": MA_RMA, "ema": MA_EMA, "sma": MA_SMA}
+# Moving averages known to pandas-ta that have no compiled counterpart
+_PANDAS_TA_MAS = (
+    "dema", "fwma", "hma", "linreg", "midpoint", "pwma", "sinwma",
+    "swma", "t3", "tema", "trima", "vidya", "wma", "zlma",
+)
+
+
+def mamode_code(mamode: str | None, default: str) -> int:
+    """
+    Resolves a pandas-ta style `mamode` into a kernel code.
+    Unknown names fall back to EMA, the same way `pandas_ta.ma` does.
+    Args:
+        mamode (str | None): Moving average name from the config.
+        default (str): Name used when `mamode` is not set.
+    Returns:
+        int: One of `MA_RMA`, `MA_EMA`, `MA_SMA`.
+    Raises:
+        ValueError: If the moving average has no compiled kernel.
+    """
+    name = (mamode if isinstance(mamode, str) else default).lower()
+    if name in _PANDAS_TA_MAS:
+        raise ValueError(
+            f"Moving average '{name}' is not supported by the compiled kernels"
+        )
+    return _MA_CODES.get(name, MA_EMA)
+
+
+def settle_bars(alpha: float) -> int:
+    """
+    Bars after which a recursion `y = alpha * x + (1 - alpha) * y`
+      has forgotten its seed down to `SETTLE_WEIGHT`.
+    """
+    if alpha >= 1.0:
+        return 0
+    return math.ceil(math.log(SETTLE_WEIGHT) / math.log1p(-alpha))
+
+
+def ma_lookback(mode: int, length: int) -> int:
+    """
+    Bars `ma(mode, x, length)` needs for its last value: the 
+      window of an SMA, the seed window of an EMA or RMA plus 
+      the bars it takes to settle.
+    """
+    if mode == MA_SMA:
+        return length
+    if mode == MA_EMA:
+        return length + settle_bars(2.0 / (length + 1))
+    return length + settle_bars(1.0 / length)
+
+
+def signal_name(
+    code: int,
+    names: tuple[str, str] = ("long", "short")
+) -> str | None:
+    """
+    Names a signal code: the first of `names` for `LONG`,
+      the second for `SHORT`, None for `FLAT`.
+    """
+    if code == LONG:
+        return names[0]
+    if code == SHORT:
+        return names[1]
+    return None
+
+
+def shift_rows(values: NDArray, offset: int | None) -> NDArray:
+    """
+    Shifts every row of a 2D result by `offset` bars,
+      filling the gap with NaN (pandas `shift` semantics).
+    Args:
+        values (np.ndarray): Results (instruments x bars).
+        offset (int | None): Number of bars to shift.
+    Returns:
+        np.ndarray: Shifted results.
+    """
+    if not offset:
+        return values
+    shifted = np.full_like(values, np.nan)
+    if offset > 0:
+        shifted[:, offset:] = values[:, :-offset]
+    else:
+        shifted[:, :offset] = values[:, -offset:]
+    return shifted
+
+
+@kernel((P,))
+def first_valid(x: NDArray) -> int:
+    """
+    Index of the first non-NaN value (TA-Lib `begidx`),
+      or the length of `x` if every value is NaN.
+    """
+    for i in range(x.shape[0]):
+        if not np.isnan(x[i]):
+            return i
+    return x.shape[0]
+
+
+@kernel((P, i8))
+def sma(x: NDArray, length: int) -> NDArray:
+    """
+    Simple moving average with TA-Lib `SMA` semantics:
+      leading NaNs are skipped and the running total is
+      updated in the same order as the C implementation.
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan, x.dtype)
+    begin = first_valid(x)
+    if n - begin < length:
+        return out
+    total = 0.0
+    for i in range(begin, begin + length - 1):
+        total += x[i]
+    trailing = begin
+    for i in range(begin + length - 1, n):
+        total += x[i]
+        out[i] = total / length
+        total -= x[trailing]
+        trailing += 1
+    return out
+
+
+@kernel((P, i8))
+def ema(x: NDArray, length: int) -> NDArray:
+    """
+    Exponential moving average with TA-Lib `EMA` semantics:
+      seeded with the SMA of the first `length` valid values.
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan, x.dtype)
+    begin = first_valid(x)
+    if n - begin < length:
+        return out
+    return _ema_from(x, length, 2.0 / (length + 1), begin + length - 1, out)
+
+
+@kernel((P, i8, f8, i8, P))
+def _ema_from(
+    x: NDArray,
+    length: int,
+    k: float,
+    seed_idx: int,
+    out: NDArray
+) -> NDArray:
+    """
+    TA-Lib `INT_EMA` core: seeds at `seed_idx` with the mean
+      of the `length` values ending there and recurses forward.
+    """
+    total = 0.0
+    for i in range(seed_idx - length + 1, seed_idx + 1):
+        total += x[i]
+    prev = total / length
+    out[seed_idx] = prev
+    for i in range(seed_idx + 1, x.shape[0]):
+        prev = ((x[i] - prev) * k) + prev
+        out[i] = prev
+    return out
+
+
+@kernel((P, f8, i8))
+def ewm_mean(x: NDArray, alpha: float, min_periods: int) -> NDArray:
+    """
+    Adjusted exponentially weighted mean, identical to
+      `Series.ewm(alpha=alpha, min_periods=min_periods).mean()`
+      (`adjust=True`, `ignore_na=False`). This is pandas-ta's `rma`.
+    """
+    n = x.shape[0]
+    out = np.empty(n, x.dtype)
+    if n == 0:
+        return out
+    decay = 1.0 - alpha
+    weighted = x[0]
+    nobs = 0 if np.isnan(weighted) else 1
+    out[0] = weighted if nobs >= max(min_periods, 1) else np.nan
+    old_wt = 1.0
+    for i in range(1, n):
+        cur = x[i]
+        is_obs = not np.isnan(cur)
+        nobs += is_obs
+        if not np.isnan(weighted):
+            old_wt *= decay
+            if is_obs:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + cur) / (old_wt + 1.0)
+                old_wt += 1.0
+        elif is_obs:
+            weighted = cur
+        out[i] = weighted if nobs >= max(min_periods, 1) else np.nan
+    return out
+
+
+@kernel((P, i8))
+def rma(x: NDArray, length: int) -> NDArray:
+    """pandas-ta `rma`: Wilder's smoothing as an adjusted EWM."""
+    return ewm_mean(x, 1.0 / length, length)
+
+
+@kernel((i8, P, i8))
+def ma(mode: int, x: NDArray, length: int) -> NDArray:
+    """Dispatches to the moving average selected by `mamode_code`."""
+    if mode == MA_RMA:
+        return rma(x, length)
+    if mode == MA_SMA:
+        return sma(x, length)
+    return ema(x, length)
+
+
+# Layout of a streaming moving average state: values seen, running
+# total (SMA/EMA seed) or weighted mean (RMA), previous EMA or EWM
+# weight (RMA), observations (RMA), then the SMA window
+_MA_COUNT, _MA_TOTAL, _MA_PREV, _MA_NOBS, _MA_WINDOW = range(5)
+
+
+@kernel((i8,))
+def ma_state(length: int) -> NDArray:
+    """
+    Empty state for `ma_step`.
+    """
+    return np.zeros(_MA_WINDOW + length)
+
+
+@kernel((i8, F8, f8, i8))
+def ma_step(mode: int, state: NDArray, x: float, length: int) -> float:
+    """
+    Advances a moving average by one value in O(1).
+    Feeding a series value by value reproduces `ma` over 
+      that series exactly, including its NaN handling.
+    Args:
+        mode (int): Moving average kernel code.
+        state (np.ndarray): State from `ma_state`, updated in place.
+        x (float): New value.
+        length (int): Moving average period.
+    Returns:
+        float: Moving average at the new value.
+    """
+    if mode == MA_RMA:
+        return _ewm_step(state, x, 1.0 / length, length)
+    # TA-Lib averages skip leading NaNs
+    if state[_MA_COUNT] == 0 and np.isnan(x):
+        return np.nan
+    state[_MA_COUNT] += 1
+    count = int(state[_MA_COUNT])
+    if mode == MA_SMA:
+        state[_MA_WINDOW + (count - 1) % length] = x
+        state[_MA_TOTAL] += x
+        if count < length:
+            return np.nan
+        out = state[_MA_TOTAL] / length
+        state[_MA_TOTAL] -= state[_MA_WINDOW + (count - length) % length]
+        return out
+    if count < length:
+        state[_MA_TOTAL] += x
+        return np.nan
+    if count == length:
+        state[_MA_TOTAL] += x
+        state[_MA_PREV] = state[_MA_TOTAL] / length
+    else:
+        prev = state[_MA_PREV]
+        state[_MA_PREV] = ((x - prev) * (2.0 / (length + 1))) + prev
+    return state[_MA_PREV]
+
+
+@kernel((F8, f8, f8, i8))
+def _ewm_step(
+    state: NDArray,
+    x: float,
+    alpha: float,
+    min_periods: int
+) -> float:
+    # One iteration of `ewm_mean`
+    is_obs = not np.isnan(x)
+    if state[_MA_COUNT] == 0:
+        state[_MA_TOTAL] = x
+        state[_MA_PREV] = 1.0
+    else:
+        weighted = state[_MA_TOTAL]
+        if not np.isnan(weighted):
+            state[_MA_PREV] *= 1.0 - alpha
+            if is_obs:
+                old_wt = state[_MA_PREV]
+                if weighted != x:
+                    state[_MA_TOTAL] = (old_wt * weighted + x) / (old_wt + 1.0)
+                state[_MA_PREV] = old_wt + 1.0
+        elif is_obs:
+            state[_MA_TOTAL] = x
+    state[_MA_COUNT] += 1
+    state[_MA_NOBS] += is_obs
+    if state[_MA_NOBS] >= max(min_periods, 1):
+        return state[_MA_TOTAL]
+    return np.nan
+
+
+@kernel((P, i8))
+def rsi_talib(x: NDArray, length: int) -> NDArray:
+    """
+    Relative Strength Index with TA-Lib `RSI` semantics
+      (Wilder smoothing seeded with plain averages).
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan, x.dtype)
+    begin = first_valid(x)
+    if n - begin <= length:
+        return out
+    prev_gain = 0.0
+    prev_loss = 0.0
+    for i in range(begin + 1, begin + length + 1):
+        diff = x[i] - x[i - 1]
+        if diff < 0:
+            prev_loss -= diff
+        else:
+            prev_gain += diff
+    prev_loss /= length
+    prev_gain /= length
+    out[begin + length] = _rsi_value(prev_gain, prev_loss)
+    for i in range(begin + length + 1, n):
+        diff = x[i] - x[i - 1]
+        prev_loss *= length - 1
+        prev_gain *= length - 1
+        if diff < 0:
+            prev_loss -= diff
+        else:
+            prev_gain += diff
+        prev_loss /= length
+        prev_gain /= length
+        out[i] = _rsi_value(prev_gain, prev_loss)
+    return out
+
+
+@kernel((f8, f8))
+def _rsi_value(gain: float, loss: float) -> float:
+    total = gain + loss
+    # TA_IS_ZERO guard of the C implementation
+    if -1e-14 < total < 1e-14:
+        return 0.0
+    return 100.0 * (gain / total)
+
+
+@kernel((P, i8, f8, i8), error_model="numpy")
+def rsi_rma(x: NDArray, length: int, scalar: float, drift: int) -> NDArray:
+    """pandas-ta `rsi` without TA-Lib: RMA of gains over RMA of |losses|."""
+    n = x.shape[0]
+    positive = np.full(n, np.nan, x.dtype)
+    negative = np.full(n, np.nan, x.dtype)
+    for i in range(drift, n):
+        diff = x[i] - x[i - drift]
+        positive[i] = diff if diff > 0 else 0.0
+        negative[i] = diff if diff < 0 else 0.0
+        if np.isnan(diff):
+            positive[i] = negative[i] = diff
+    positive_avg = rma(positive, length)
+    negative_avg = rma(negative, length)
+    out = np.empty(n, x.dtype)
+    for i in range(n):
+        out[i] = scalar * positive_avg[i] / (
+            positive_avg[i] + abs(negative_avg[i])
+        )
+    return out
+
+
+@kernel((P, P, P, i8))
+def atr_talib(
+    high: NDArray,
+    low: NDArray,
+    close: NDArray,
+    length: int
+) -> NDArray:
+    """Average True Range with TA-Lib `ATR` semantics."""
+    n = close.shape[0]
+    out = np.full(n, np.nan, close.dtype)
+    begin = 0
+    while begin < n and (
+        np.isnan(high[begin]) or np.isnan(low[begin]) or np.isnan(close[begin])
+    ):
+        begin += 1
+    if length <= 1:
+        for i in range(begin + 1, n):
+            out[i] = _true_range(high[i], low[i], close[i - 1])
+        return out
+    if n - begin <= length:
+        return out
+    total = 0.0
+    for i in range(begin + 1, begin + length + 1):
+        total += _true_range(high[i], low[i], close[i - 1])
+    prev = total / length
+    out[begin + length] = prev
+    for i in range(begin + length + 1, n):
+        prev *= length - 1
+        prev += _true_range(high[i], low[i], close[i - 1])
+        prev /= length
+        out[i] = prev
+    return out
+
+
+# Layout of a streaming ATR state: started, true ranges seen,
+# running total or previous ATR, previous close
+_ATR_STARTED, _ATR_COUNT, _ATR_VALUE, _ATR_CLOSE = range(4)
+
+
+@kernel(())
+def atr_state() -> NDArray:
+    """
+    Empty state for `atr_step`.
+    """
+    return np.zeros(4)
+
+
+@kernel((F8, f8, f8, f8, i8))
+def atr_step(
+    state: NDArray,
+    high: float,
+    low: float,
+    close: float,
+    length: int
+) -> float:
+    """
+    Advances `atr_talib` by one bar in O(1).
+    Args:
+        state (np.ndarray): State from `atr_state`, updated in place.
+        high (float): High price of the bar.
+        low (float): Low price of the bar.
+        close (float): Close price of the bar.
+        length (int): ATR period.
+    Returns:
+        float: ATR of the bar.
+    """
+    if state[_ATR_STARTED] == 0:
+        # TA-Lib starts at the first bar with a full HLC
+        if not (np.isnan(high) or np.isnan(low) or np.isnan(close)):
+            state[_ATR_STARTED] = 1
+            state[_ATR_CLOSE] = close
+        return np.nan
+    true_range = _true_range(high, low, state[_ATR_CLOSE])
+    state[_ATR_CLOSE] = close
+    state[_ATR_COUNT] += 1
+    if length <= 1:
+        return true_range
+    count = state[_ATR_COUNT]
+    if count <= length:
+        state[_ATR_VALUE] += true_range
+        if count < length:
+            return np.nan
+        state[_ATR_VALUE] /= length
+        return state[_ATR_VALUE]
+    prev = state[_ATR_VALUE]
+    prev *= length - 1
+    prev += true_range
+    prev /= length
+    state[_ATR_VALUE] = prev
+    return prev
+
+
+@kernel((p, p, p))
+def _true_range(high: float, low: float, prev_close: float) -> float:
+    greatest = high - low
+    val = abs(prev_close - high)
+    if val > greatest:
+        greatest = val
+    val = abs(low - prev_close)
+    if val > greatest:
+        greatest = val
+    return greatest
+
+
+@kernel((P, P, i8))
+def directional_movement(
+    high: NDArray,
+    low: NDArray,
+    drift: int
+) -> tuple[NDArray, NDArray]:
+    """
+    Positive and negative directional movement (+DM, -DM)
+      as computed by `pandas_ta.adx`.
+    """
+    n = high.shape[0]
+    pos = np.full(n, np.nan, high.dtype)
+    neg = np.full(n, np.nan, high.dtype)
+    for i in range(drift, n):
+        up = high[i] - high[i - drift]
+        dn = low[i - drift] - low[i]
+        if not np.isnan(up):
+            pos[i] = up if up > dn and up > 0 else 0.0
+            # pandas-ta `zero`: drop float noise
+            if abs(pos[i]) < 2.220446049250313e-16:
+                pos[i] = 0.0
+        if not np.isnan(dn):
+            neg[i] = dn if dn > up and dn > 0 else 0.0
+            if abs(neg[i]) < 2.220446049250313e-16:
+                neg[i] = 0.0
+    return pos, neg
+
+
+@kernel((P, i8))
+def rolling_max(x: NDArray, length: int) -> NDArray:
+    """
+    Rolling maximum over `length` bars, leading NaNs skipped
+      (NaN until the window is full).
+    """
+    return _rolling_extreme(x, length, 1.0)
+
+
+@kernel((P, i8))
+def rolling_min(x: NDArray, length: int) -> NDArray:
+    """
+    Rolling minimum over `length` bars, leading NaNs skipped
+      (NaN until the window is full).
+    """
+    return _rolling_extreme(x, length, -1.0)
+
+
+@kernel((P, i8, f8))
+def _rolling_extreme(x: NDArray, length: int, sign: float) -> NDArray:
+    # Monotonic deque of indices: O(1) amortised per bar
+    n = x.shape[0]
+    out = np.full(n, np.nan, x.dtype)
+    begin = first_valid(x)
+    dq = np.empty(n, dtype=np.int64)
+    head = 0
+    tail = 0
+    for i in range(begin, n):
+        while tail > head and sign * x[dq[tail - 1]] <= sign * x[i]:
+            tail -= 1
+        dq[tail] = i
+        tail += 1
+        if dq[head] <= i - length:
+            head += 1
+        if i >= begin + length - 1:
+            out[i] = x[dq[head]]
+    return out
+
+
+# Layout of a rolling quantile state: values pushed, then the
+# window in arrival order (ring) and the same values sorted
+_Q_COUNT, _Q_RING = range(2)
+
+
+@kernel((i8,))
+def quantile_state(length: int) -> NDArray:
+    """
+    Empty state for `quantile_push`.
+    """
+    return np.zeros(_Q_RING + 2 * length)
+
+
+@kernel((F8, f8, i8))
+def quantile_push(state: NDArray, x: float, length: int) -> int:
+    """
+    Adds a value to a rolling window of the last `length`
+      non-NaN values, evicting the oldest. The window is kept
+      sorted: both slots are found by binary search and only
+      the values between them move.
+    Args:
+        state (np.ndarray): State from `quantile_state`,
+          updated in place.
+        x (float): New value; NaN leaves the window unchanged.
+        length (int): Window length.
+    Returns:
+        int: Values in the window.
+    """
+    count = int(state[_Q_COUNT])
+    size = min(count, length)
+    if np.isnan(x):
+        return size
+    ring = state[_Q_RING:_Q_RING + length]
+    window = state[_Q_RING + length:_Q_RING + 2 * length]
+    slot = count % length
+    if count >= length:
+        # Evict the oldest value
+        j = np.searchsorted(window[:size], ring[slot])
+        for k in range(j, size - 1):
+            window[k] = window[k + 1]
+        size -= 1
+    j = np.searchsorted(window[:size], x)
+    for k in range(size, j, -1):
+        window[k] = window[k - 1]
+    window[j] = x
+    ring[slot] = x
+    state[_Q_COUNT] = count + 1
+    return size + 1
+
+
+@kernel((F8, i8, f8))
+def quantile_value(state: NDArray, length: int, q: float) -> float:
+    """
+    `np.percentile` (linear method) of the window of a
+      `quantile_push` state in O(1); NaN while it is empty.
+    Args:
+        q (float): Percentile, 0 to 100.
+    """
+    size = min(int(state[_Q_COUNT]), length)
+    if size == 0:
+        return np.nan
+    window = state[_Q_RING + length:]
+    pos = q / 100.0 * (size - 1)
+    lo = min(int(math.floor(pos)), size - 1)
+    hi = min(lo + 1, size - 1)
+    a = window[lo]
+    b = window[hi]
+    t = pos - lo
+    # numpy's lerp, exact at both ends of the interval
+    if t >= 0.5:
+        return b - (b - a) * (1.0 - t)
+    return a + (b - a) * t
+
+
+@kernel((P, i8, f8, f8))
+def rolling_percentiles(
+    x: NDArray,
+    length: int,
+    q_low: float,
+    q_high: float
+) -> tuple[NDArray, NDArray]:
+    """
+    Percentiles `q_low` and `q_high` of the last `length`
+      non-NaN values at every bar, O(log length) search per
+      bar. NaN until the first value.
+    """
+    n = x.shape[0]
+    low = np.empty(n, dtype=np.float64)
+    high = np.empty(n, dtype=np.float64)
+    state = quantile_state(length)
+    for i in range(n):
+        quantile_push(state, x[i], length)
+        low[i] = quantile_value(state, length, q_low)
+        high[i] = quantile_value(state, length, q_high)
+    return low, high
+
+
+@kernel((P, i8, i8, i8, i8))
+def stochrsi_talib(
+    x: NDArray,
+    timeperiod: int,
+    fastk_period: int,
+    fastd_period: int,
+    fastd_matype: int
+) -> tuple[NDArray, NDArray]:
+    """
+    Stochastic RSI with TA-Lib `STOCHRSI` semantics.
+      Only SMA (0) and EMA (1) are supported for `fastd_matype`.
+    """
+    raw_k = stoch_raw_k(rsi_talib(x, timeperiod), fastk_period)
+    return stoch_smooth(raw_k, fastd_period, fastd_matype)
+
+
+@kernel((P, i8))
+def stoch_raw_k(rsi: NDArray, fastk_period: int) -> NDArray:
+    """
+    Unsmoothed %K of TA-Lib `STOCHF` applied to an RSI series.
+    """
+    return stoch_k_from_range(
+        rsi,
+        rolling_max(rsi, fastk_period),
+        rolling_min(rsi, fastk_period)
+    )
+
+
+@kernel((P, P, P))
+def stoch_k_from_range(
+    rsi: NDArray,
+    highest: NDArray,
+    lowest: NDArray
+) -> NDArray:
+    """
+    Unsmoothed %K from the rolling extremes of the RSI.
+    """
+    n = rsi.shape[0]
+    raw_k = np.full(n, np.nan, rsi.dtype)
+    for i in range(n):
+        if np.isnan(highest[i]):
+            continue
+        diff = (highest[i] - lowest[i]) / 100.0
+        raw_k[i] = (rsi[i] - lowest[i]) / diff if diff != 0.0 else 0.0
+    return raw_k
+
+
+@kernel((P, i8, i8))
+def stoch_smooth(
+    raw_k: NDArray,
+    fastd_period: int,
+    fastd_matype: int
+) -> tuple[NDArray, NDArray]:
+    """
+    %D smoothing of TA-Lib `STOCHF`; both outputs start at 
+      the first bar where %D is available.
+    """
+    n = raw_k.shape[0]
+    fastk = np.full(n, np.nan, raw_k.dtype)
+    fastd = np.full(n, np.nan, raw_k.dtype)
+    start = first_valid(raw_k) + fastd_period - 1
+    if start >= n:
+        return fastk, fastd
+    if fastd_period <= 1:
+        smooth = raw_k
+    elif fastd_matype == 1:
+        smooth = ema(raw_k, fastd_period)
+    else:
+        smooth = sma(raw_k, fastd_period)
+    fastk[start:] = raw_k[start:]
+    fastd[start:] = smooth[start:]
+    return fastk, fastd
+
+
+@kernel((P, i8, i8, i8))
+def macd_talib(
+    x: NDArray,
+    fast: int,
+    slow: int,
+    signal: int
+) -> tuple[NDArray, NDArray, NDArray]:
+    """
+    MACD with TA-Lib `MACD` semantics: both EMAs are seeded
+      at the bar where the slow EMA becomes available.
+    """
+    n = x.shape[0]
+    macd = np.full(n, np.nan, x.dtype)
+    macd_signal = np.full(n, np.nan, x.dtype)
+    histogram = np.full(n, np.nan, x.dtype)
+    if slow < fast:
+        fast, slow = slow, fast
+    begin = first_valid(x)
+    seed = begin + slow - 1
+    start = seed + signal - 1
+    if start >= n:
+        return macd, macd_signal, histogram
+    fast_ema = _ema_from(x, fast, 2.0 / (fast + 1), seed, np.full_like(x, np.nan))
+    slow_ema = _ema_from(x, slow, 2.0 / (slow + 1), seed, np.full_like(x, np.nan))
+    line = fast_ema - slow_ema
+    sig = _ema_from(line, signal, 2.0 / (signal + 1), start, np.full_like(x, np.nan))
+    macd[start:] = line[start:]
+    macd_signal[start:] = sig[start:]
+    histogram[start:] = line[start:] - sig[start:]
+    return macd, macd_signal, histogram
+
+
+@kernel((P, i8, i8, i8))
+def macd_ema(
+    x: NDArray,
+    fast: int,
+    slow: int,
+    signal: int
+) -> tuple[NDArray, NDArray, NDArray]:
+    """pandas-ta `macd` without TA-Lib: independently seeded EMAs."""
+    if slow < fast:
+        fast, slow = slow, fast
+    line = ema(x, fast) - ema(x, slow)
+    sig = ema(line, signal)
+    return line, sig, line - sig
+
+
+# Signal kernels: one int8 code per bar, `FLAT` on the first bar
+# (there is no previous bar to cross from) and wherever an input
+# is NaN, since every comparison with NaN is false
+
+
+@kernel((P, P, P))
+def band_cross_signals(
+    close: NDArray,
+    lower: NDArray,
+    upper: NDArray
+) -> NDArray:
+    """
+    Acceleration Bands signals: `LONG` when close falls back
+      below the upper band, `SHORT` when it rises back above
+      the lower band.
+    """
+    n = close.shape[0]
+    out = np.zeros(n, np.int8)
+    for i in range(1, n):
+        if close[i] < upper[i] and close[i - 1] > upper[i]:
+            out[i] = LONG
+        elif close[i] > lower[i] and close[i - 1] < lower[i]:
+            out[i] = SHORT
+    return out
+
+
+@kernel((P, P))
+def stoch_cross_signals(fastk: NDArray, fastd: NDArray) -> NDArray:
+    """
+    Stochastic RSI signals: `LONG` when %K crosses above %D
+      below 20, `SHORT` when it crosses below %D above 80.
+      Differences within `STOCH_TIE` are ties.
+    """
+    n = fastk.shape[0]
+    out = np.zeros(n, np.int8)
+    for i in range(1, n):
+        spread = fastk[i] - fastd[i]
+        previous = fastk[i - 1] - fastd[i - 1]
+        if spread > STOCH_TIE and previous < -STOCH_TIE and fastk[i] < 20:
+            out[i] = LONG
+        elif (
+            spread < -STOCH_TIE and previous > STOCH_TIE and fastk[i] > 80
+        ):
+            out[i] = SHORT
+    return out
+
+
+@kernel((P,))
+def level_signals(rsi_scaled: NDArray) -> NDArray:
+    """
+    SCRSI signals: `LONG` when the scaled RSI crosses 50 from
+      below or leaves 0 upwards, `SHORT` when it crosses 50
+      from above or leaves 100 downwards.
+    """
+    n = rsi_scaled.shape[0]
+    out = np.zeros(n, np.int8)
+    for i in range(1, n):
+        prev = rsi_scaled[i - 1]
+        curr = rsi_scaled[i]
+        if (prev < 50 and curr >= 50) or (prev <= 0 and curr > 0):
+            out[i] = LONG
+        elif (prev > 50 and curr <= 50) or (prev >= 100 and curr < 100):
+            out[i] = SHORT
+    return out
+
+
+@kernel((P, P))
+def cross_signals(line: NDArray, signal: NDArray) -> NDArray:
+    """
+    `LONG` where `line` crosses above `signal`, `SHORT` where
+      it crosses below.
+    """
+    n = line.shape[0]
+    out = np.zeros(n, np.int8)
+    for i in range(1, n):
+        if line[i - 1] < signal[i - 1] and line[i] > signal[i]:
+            out[i] = LONG
+        elif line[i - 1] > signal[i - 1] and line[i] < signal[i]:
+            out[i] = SHORT
+    return out
+
+
+@kernel((P,))
+def zero_cross_signals(x: NDArray) -> NDArray:
+    """
+    `LONG` where `x` crosses above zero, `SHORT` where it
+      crosses below.
+    """
+    n = x.shape[0]
+    out = np.zeros(n, np.int8)
+    for i in range(1, n):
+        if x[i - 1] < 0 and x[i] > 0:
+            out[i] = LONG
+        elif x[i - 1] > 0 and x[i] < 0:
+            out[i] = SHORT
+    return out
@@ -1,9 +1,37 @@
-import pandas as pd
-from pandas_ta import accbands
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import numpy as np
+from numpy.typing import NDArray
 
 from strategies.src.domain.entities import AcceletrationBandsDM
-from strategies.src.infrastructure._types import PriceDataFrame
+from strategies.src.infrastructure._lazy import lazy_import
+from strategies.src.infrastructure._types import OhlcvBlock, PriceDataFrame
+from strategies.src.infrastructure.indicators import reference
+from strategies.src.infrastructure.indicators._kernels import (
+    LONG,
+    SHORT,
+    band_cross_signals,
+    ma,
+    ma_lookback,
+    mamode_code,
+    shift_rows,
+    signal_name,
+)
+from strategies.src.infrastructure.indicators.graph import IndicatorGraph
+from strategies.src.infrastructure.indicators.jit import (
+    P_2D,
+    P,
+    i8,
+    kernel,
+    prange,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
 
 
 class AccelerationBands:
@@ -29,7 +57,8 @@ class AccelerationBands:
     def calc_accbands(
         self, 
         data: PriceDataFrame, 
-        config: AcceletrationBandsDM
+        config: AcceletrationBandsDM,
+        graph: IndicatorGraph | None = None
     ) -> pd.DataFrame:
         """
         Calculates Acceleration Bands (ACCB) values.
@@ -39,27 +68,100 @@ class AccelerationBands:
             config (AcceletrationBandsDM): Configuration for 
               Acceleration Bands (length, smoothing 
               method, drift, offset).
+            graph (IndicatorGraph | None): Shared evaluation graph 
+              of `data`; when given, primitive series are taken 
+              from (and cached in) it; unused by the pandas-ta 
+              backend.
         Returns:
             pd.DataFrame: A DataFrame containing upper, 
               lower, and center acceleration bands.
+        Raises:
+            ValueError: If there are fewer bars than `length` 
+              or the backend is unknown.
         """
-        # Compute Acceleration Bands using pandas-ta
-        if acc_bands := accbands(
-            high=data.high_prices,
-            low=data.low_prices,
-            close=data.close_prices,
-            length=config.length,
-            drift=config.drift,
-            mamode=config.mamode,
-            offset=config.offset,
-        ):
+        bands = self._accbands(data, config, graph)
+        acc_bands = pd.DataFrame(
+            {name: values[0] for name, values in bands.items()},
             # Align index with input data
-            acc_bands.index = data.index  
-            # Preserve close prices for signal generation
-            acc_bands['close_prices'] = data.close_prices  
-            return acc_bands
-        # Raise an error if calculation fails
-        raise ValueError("No data in DataFrame")
+            index=data.index
+        )
+        # Preserve close prices for signal generation
+        acc_bands['close_prices'] = data.close_prices  
+        return acc_bands
+
+    def calc_accbands_batch(
+        self, 
+        block: OhlcvBlock, 
+        config: AcceletrationBandsDM
+    ) -> dict[str, NDArray]:
+        """
+        Calculates Acceleration Bands for a whole universe of
+          bar-aligned instruments in parallel.
+        Args:
+            block (OhlcvBlock): Price columns (instruments x bars).
+            config (AcceletrationBandsDM): Configuration for 
+              Acceleration Bands.
+        Returns:
+            dict[str, np.ndarray]: Lower, middle and upper bands
+              (instruments x bars).
+        Raises:
+            ValueError: If there are fewer bars than `length`.
+        """
+        length = _resolve_length(config, block.n_bars)
+        lower, mid, upper = _accbands_batch(
+            block.high,
+            block.low,
+            block.close,
+            length,
+            mamode_code(config.mamode, "sma"),
+        )
+        return {
+            "ACCbands_lower": shift_rows(lower, config.offset),
+            "ACCbands_mid": shift_rows(mid, config.offset),
+            "ACCbands_upper": shift_rows(upper, config.offset),
+        }
+
+    def _accbands(
+        self, 
+        data: PriceDataFrame, 
+        config: AcceletrationBandsDM,
+        graph: IndicatorGraph | None
+    ) -> dict[str, NDArray]:
+        """
+        Bands of one instrument (1 x bars) from the configured 
+          backend, the graph or a single-instrument block.
+        """
+        if reference.is_reference(config.backend):
+            return reference.accbands(data, config)
+        if graph is not None:
+            return self._accbands_from_graph(graph, config)
+        # Compute Acceleration Bands on a single-instrument block
+        return self.calc_accbands_batch(OhlcvBlock.from_frames([data]), config)
+
+    def _accbands_from_graph(
+        self, 
+        graph: IndicatorGraph, 
+        config: AcceletrationBandsDM
+    ) -> dict[str, NDArray]:
+        """
+        Acceleration Bands whose middle band is the shared 
+          moving average of close of an evaluation graph.
+        """
+        high = graph.get("high")
+        length = _resolve_length(config, high.shape[0])
+        mamode = mamode_code(config.mamode, "sma")
+        lower_base, upper_base = _accbands_bases(high, graph.get("low"))
+        return {
+            "ACCbands_lower": shift_rows(
+                ma(mamode, lower_base, length)[None], config.offset
+            ),
+            "ACCbands_mid": shift_rows(
+                graph.ma(mamode, "close", length)[None], config.offset
+            ),
+            "ACCbands_upper": shift_rows(
+                ma(mamode, upper_base, length)[None], config.offset
+            ),
+        }
 
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -72,33 +174,52 @@ class AccelerationBands:
             data (pd.DataFrame): DataFrame containing 
             Acceleration Bands and price data.
         Returns:
-            pd.DataFrame: A DataFrame containing buy/sell signals.
-        """
-        # Extract bands
-        upper_band = data['ACCbands_upper'].values
-        lower_band = data['ACCbands_lower'].values
-        # Buy signal: Price crosses above lower band
-        buy_signal = (
-            data["close_prices"] < upper_band
-        ) & (
-            np.roll(data["close_prices"], 1) > upper_band
+            pd.DataFrame: A DataFrame containing buy/sell signals
+              (int8 0/1 columns).
+        """
+        codes = band_cross_signals(
+            np.ascontiguousarray(data["close_prices"].to_numpy()),
+            np.ascontiguousarray(data["ACCbands_lower"].to_numpy()),
+            np.ascontiguousarray(data["ACCbands_upper"].to_numpy()),
         )
-        # Sell signal: Price crosses below upper band
-        sell_signal = (
-            data["close_prices"] > lower_band
-        ) & (
-            np.roll(data["close_prices"], 1) < lower_band
+        return pd.DataFrame(
+            {
+                "buy_signals": (codes == LONG).view(np.int8),
+                "sell_signals": (codes == SHORT).view(np.int8),
+            },
+            index=data.index
+        )
+
+    def signals(
+        self, 
+        data: PriceDataFrame, 
+        config: AcceletrationBandsDM,
+        graph: IndicatorGraph | None = None
+    ) -> NDArray:
+        """
+        Signal code of every bar, without building DataFrames.
+        Args:
+            data (PriceDataFrame): Market data with price information.
+            config (AcceletrationBandsDM): Configuration for Acceleration Bands.
+            graph (IndicatorGraph | None): Shared evaluation graph 
+              of `data`; when given, primitive series are taken 
+              from (and cached in) it.
+        Returns:
+            np.ndarray: int8 `LONG` (buy), `SHORT` (sell) or 
+              `FLAT` per bar, as in `generate_signals`.
+        """
+        bands = self._accbands(data, config, graph)
+        return band_cross_signals(
+            data.close_prices, 
+            bands["ACCbands_lower"][0], 
+            bands["ACCbands_upper"][0]
         )
-        # Create a DataFrame to store signals
-        signals = pd.DataFrame(index=data.index)
-        signals['buy_signals'] = buy_signal.astype(int)
-        signals['sell_signals'] = sell_signal.astype(int)
-        return signals
 
     def check_last_signal(
         self, 
         data: PriceDataFrame, 
-        config: AcceletrationBandsDM
+        config: AcceletrationBandsDM,
+        graph: IndicatorGraph | None = None
     ) -> str | None:
         """
         Determines the last trading signal based on Acceleration Bands.
@@ -108,17 +229,106 @@ class AccelerationBands:
         Args:
             data (PriceDataFrame): Market data with price information.
             config (AcceletrationBandsDM): Configuration for Acceleration Bands.
+            graph (IndicatorGraph | None): Shared evaluation graph 
+              of `data`; when given, primitive series are taken 
+              from (and cached in) it.
         Returns:
             str | None: "long" if buy signal, "short" if sell signal, 
             or None if no signal is present.
         """
-        #  Compute Acceleration Bands values
-        acc_bands_df = self.calc_accbands(data, config)
-        # Generate buy/sell signals
-        signals_df = self.generate_signals(acc_bands_df)
-        # Determine the last signal based on recent price action
-        if signals_df["buy_signals"].iloc[-1] == 1:
-            return "long"
-        elif signals_df["sell_signals"].iloc[-1] == 1:
-            return "short"        
-        return None
+        if graph is None:
+            # The last signal only depends on the lookback bars
+            data = data.tail(self.lookback(config))
+        return signal_name(self.signals(data, config, graph)[-1])
+
+    def lookback(self, config: AcceletrationBandsDM) -> int:
+        """
+        Bars the last signal depends on: the moving average 
+          window (settled, for EMA and RMA) and the offset.
+          `check_last_signal` only evaluates this tail.
+        Args:
+            config (AcceletrationBandsDM): Configuration for Acceleration Bands.
+        Returns:
+            int: Number of trailing bars.
+        """
+        length = _resolve_length(config, np.inf)
+        return (
+            ma_lookback(mamode_code(config.mamode, "sma"), length)
+            + max(config.offset or 0, 0)
+        )
+
+
+def _resolve_length(config: AcceletrationBandsDM, n_bars: float) -> int:
+    """
+    Resolves the default `length` of pandas-ta.
+    Raises:
+        ValueError: If there are fewer bars than `length`.
+    """
+    length = config.length if config.length and config.length > 0 else 20
+    # Raise an error if there is not enough data
+    if n_bars < length:
+        raise ValueError("No data in DataFrame")
+    return length
+
+
+@kernel((P, P, P, i8, i8))
+def _accbands_row(
+    high: NDArray,
+    low: NDArray,
+    close: NDArray,
+    length: int,
+    mamode: int
+) -> tuple[NDArray, NDArray, NDArray]:
+    """
+    Acceleration Bands of one instrument, following
+      `pandas_ta.accbands` with its default width factor of 4.
+    Args:
+        high (np.ndarray): High prices.
+        low (np.ndarray): Low prices.
+        close (np.ndarray): Close prices.
+        length (int): Moving average period.
+        mamode (int): Moving average kernel code.
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Lower, middle 
+          and upper bands.
+    """
+    lower_base, upper_base = _accbands_bases(high, low)
+    lower = ma(mamode, lower_base, length)
+    mid = ma(mamode, close, length)
+    upper = ma(mamode, upper_base, length)
+    return lower, mid, upper
+
+
+@kernel((P, P))
+def _accbands_bases(high: NDArray, low: NDArray) -> tuple[NDArray, NDArray]:
+    """
+    Unsmoothed lower and upper bands.
+    """
+    high_low_range = high - low
+    # pandas-ta `non_zero_range`: shift the whole range off zero
+    if np.any(high_low_range == 0):
+        high_low_range += 2.220446049250313e-16
+    hl_ratio = high_low_range / (high + low)
+    hl_ratio *= 4.0
+    return low * (1 - hl_ratio), high * (1 + hl_ratio)
+
+
+@kernel((P_2D, P_2D, P_2D, i8, i8), parallel=True)
+def _accbands_batch(
+    high: NDArray,
+    low: NDArray,
+    close: NDArray,
+    length: int,
+    mamode: int
+) -> tuple[NDArray, NDArray, NDArray]:
+    """
+    Runs `_accbands_row` for every instrument of a block in parallel.
+    """
+    lower = np.empty_like(close)
+    mid = np.empty_like(close)
+    upper = np.empty_like(close)
+    for r in prange(close.shape[0]):
+        lower[r], mid[r], upper[r] = _accbands_row(
+            high[r], low[r], close[r], length, mamode
+        )
+    return lower, mid, upper
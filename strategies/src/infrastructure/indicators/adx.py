@@ -1,8 +1,43 @@
-import pandas_ta as ta
-import pandas as pd
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
 
 from strategies.src.domain.entities import AdxConfigDM
-from strategies.src.infrastructure._types import PriceDataFrame
+from strategies.src.infrastructure._lazy import lazy_import
+from strategies.src.infrastructure._types import OhlcvBlock, PriceDataFrame
+from strategies.src.infrastructure.indicators import reference
+from strategies.src.infrastructure.indicators._kernels import (
+    atr_state,
+    atr_step,
+    atr_talib,
+    directional_movement,
+    ma,
+    ma_lookback,
+    ma_state,
+    ma_step,
+    mamode_code,
+    settle_bars,
+    shift_rows,
+)
+from strategies.src.infrastructure.indicators.graph import IndicatorGraph
+from strategies.src.infrastructure.indicators.jit import (
+    F8,
+    P_2D,
+    P,
+    f8,
+    i8,
+    kernel,
+    prange,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
 
 
 class ADXTrend:
@@ -33,7 +68,8 @@ class ADXTrend:
     def calculate_adx(
         self, 
         data: PriceDataFrame, 
-        config: AdxConfigDM
+        config: AdxConfigDM,
+        graph: IndicatorGraph | None = None
     ) -> pd.DataFrame:
         """
         Computes the ADX, DMP (+DI), and DMN (-DI) trend indicators.
@@ -42,47 +78,91 @@ class ADXTrend:
               high, low, and close prices.
             config (AdxConfigDM): Configuration for ADX 
               (length, smoothing factors, drift, offset).
+            graph (IndicatorGraph | None): Shared evaluation graph 
+              of `data`; when given, primitive series are taken 
+              from (and cached in) it; unused by the pandas-ta 
+              backend.
         Returns:
             pd.DataFrame: A DataFrame containing ADX, DMP, and DMN trend values.
         Raises:
-            ValueError: If the ADX calculation returns missing 
-              values for any required component.
-        """
-        # Compute ADX and its components using pandas-ta
-        adx_ind = ta.adx(
-            high=data.high_prices,
-            low=data.low_prices,
-            close=data.close_prices,
-            length=config.length,
-            # Signal length for ADX smoothing
-            lensig=config.lensig,
-            # Scaling factor for values
-            scalar=config.scalar,  
-            # Moving average mode (e.g., EMA, SMA)
-            mamode=config.mamode,  
-            drift=config.drift,
-            offset=config.offset
-        )
-        #  Validate if all required components exist
-        if missing_indicators := [
-            indicator
-            for indicator in ["ADX", "DMP", "DMN"]
-            if adx_ind.get(f"{indicator}_{config.length}") is None
-        ]:
-            raise ValueError(
-                f"""Error: Missing required ADX components: 
-                {', '.join(missing_indicators)}."""
+            ValueError: If there are fewer bars than `length` 
+              or the backend is unknown.
+        """
+        if reference.is_reference(config.backend):
+            adx_ind = reference.adx(data, config)
+        elif graph is not None:
+            adx_ind = self._adx_from_graph(graph, config)
+        else:
+            # Compute ADX on a single-instrument block
+            adx_ind = self.calculate_adx_batch(
+                OhlcvBlock.from_frames([data]), config
             )
         # Return structured DataFrame
         return pd.DataFrame(
-            {
-                "adx": adx_ind[f"ADX_{config.lensig}"],
-                "dmp": adx_ind[f"DMP_{config.length}"],
-                "dmn": adx_ind[f"DMN_{config.length}"],
-            },
+            {name: values[0] for name, values in adx_ind.items()},
             index=data.index
         )
 
+    def calculate_adx_batch(
+        self, 
+        block: OhlcvBlock, 
+        config: AdxConfigDM
+    ) -> dict[str, NDArray]:
+        """
+        Computes ADX, DMP (+DI) and DMN (-DI) for a whole 
+          universe of bar-aligned instruments in parallel.
+        Args:
+            block (OhlcvBlock): Price columns (instruments x bars).
+            config (AdxConfigDM): Configuration for ADX 
+              (length, smoothing factors, drift, offset).
+        Returns:
+            dict[str, np.ndarray]: "adx", "dmp" and "dmn" arrays
+              (instruments x bars).
+        Raises:
+            ValueError: If there are fewer bars than `length`
+              or `mamode` has no compiled kernel.
+        """
+        length, lensig, scalar, drift = _resolve(config, block.n_bars)
+        adx, dmp, dmn = _adx_batch(
+            block.high,
+            block.low,
+            block.close,
+            length,
+            lensig,
+            scalar,
+            drift,
+            mamode_code(config.mamode, "rma"),
+        )
+        return {
+            "adx": shift_rows(adx, config.offset),
+            "dmp": shift_rows(dmp, config.offset),
+            "dmn": shift_rows(dmn, config.offset),
+        }
+
+    def _adx_from_graph(
+        self, 
+        graph: IndicatorGraph, 
+        config: AdxConfigDM
+    ) -> dict[str, NDArray]:
+        """
+        ADX from the shared ATR and smoothed directional 
+          movement nodes of an evaluation graph.
+        """
+        close = graph.get("close")
+        length, lensig, scalar, drift = _resolve(config, close.shape[0])
+        mamode = mamode_code(config.mamode, "rma")
+        dmp, dmn, dx = _directional_index(
+            graph.atr(length),
+            graph.ma(mamode, ("dm_pos", None, drift), length),
+            graph.ma(mamode, ("dm_neg", None, drift), length),
+            scalar,
+        )
+        return {
+            "adx": shift_rows(ma(mamode, dx, lensig)[None], config.offset),
+            "dmp": shift_rows(dmp[None], config.offset),
+            "dmn": shift_rows(dmn[None], config.offset),
+        }
+
     def get_signal(self, adx_trigger: int, data: pd.DataFrame) -> bool:
         """
         Determines whether the trend strength exceeds a defined threshold.
@@ -93,3 +173,334 @@ class ADXTrend:
             bool: True if ADX exceeds the threshold, False otherwise.
         """
         return int(data["adx"].iloc[-1]) >= adx_trigger
+
+    def lookback(self, config: AdxConfigDM) -> int:
+        """
+        Bars the ADX of the last bar depends on: the settled 
+          ATR and directional movement averages, the settled 
+          ADX smoothing on top of them and the offset.
+        Args:
+            config (AdxConfigDM): Configuration for ADX.
+        Returns:
+            int: Number of trailing bars.
+        """
+        length, lensig, _, drift = _resolve(config, np.inf)
+        mamode = mamode_code(config.mamode, "rma")
+        directional = max(
+            # TA-Lib ATR: `length` true ranges, then Wilder smoothing
+            length + 1 + settle_bars(1.0 / length),
+            drift + ma_lookback(mamode, length),
+        )
+        return (
+            directional + ma_lookback(mamode, lensig) - 1 
+            + max(config.offset or 0, 0)
+        )
+
+
+class StreamingAdx:
+    """
+    Stateful ADX evaluated one bar at a time.
+
+    Keeps the Wilder-smoothed true range, the smoothed +DM and 
+      -DM, the ADX smoothing state and the last `drift` highs 
+      and lows, so every `update` costs O(1). Replaying a 
+      history gives exactly the values of 
+      `ADXTrend.calculate_adx`, a positive `offset` included; 
+      with a negative offset the newest bar has no value, as 
+      in the batch result.
+    """
+
+    def __init__(self, config: AdxConfigDM) -> None:
+        """
+        Args:
+            config (AdxConfigDM): Configuration for ADX.
+        """
+        length, lensig, scalar, drift = _resolve(config, np.inf)
+        self._params = (
+            length, lensig, scalar, drift, mamode_code(config.mamode, "rma")
+        )
+        self._atr = atr_state()
+        self._pos = ma_state(length)
+        self._neg = ma_state(length)
+        self._adx = ma_state(lensig)
+        # Ring of the last `drift` highs and lows, then bars seen
+        self._hist = np.zeros(2 * drift + 1)
+        self._offset = config.offset or 0
+        self._last = deque(
+            [(np.nan, np.nan, np.nan)] * (max(self._offset, 0) + 1), 
+            maxlen=max(self._offset, 0) + 1
+        )
+
+    @classmethod
+    def from_history(
+        cls, 
+        data: PriceDataFrame, 
+        config: AdxConfigDM
+    ) -> "StreamingAdx":
+        """
+        Warm start: seeds the state with a compiled pass over 
+          the history.
+        Args:
+            data (PriceDataFrame): Price dataset containing 
+              high, low, and close prices.
+            config (AdxConfigDM): Configuration for ADX.
+        Returns:
+            StreamingAdx: State positioned after the last bar.
+        """
+        stream = cls(config)
+        stream.backfill(data.high_prices, data.low_prices, data.close_prices)
+        return stream
+
+    @property
+    def adx(self) -> float:
+        return self._last[-1][0] if self._offset >= 0 else np.nan
+
+    @property
+    def dmp(self) -> float:
+        return self._last[-1][1] if self._offset >= 0 else np.nan
+
+    @property
+    def dmn(self) -> float:
+        return self._last[-1][2] if self._offset >= 0 else np.nan
+
+    @property
+    def bars_seen(self) -> int:
+        return int(self._hist[-1])
+
+    def backfill(
+        self, 
+        high: NDArray, 
+        low: NDArray, 
+        close: NDArray
+    ) -> dict[str, NDArray]:
+        """
+        Advances the state over a block of historical bars.
+        Args:
+            high (np.ndarray): High prices in chronological order.
+            low (np.ndarray): Low prices.
+            close (np.ndarray): Close prices.
+        Returns:
+            dict[str, np.ndarray]: Unshifted "adx", "dmp" and 
+              "dmn" values for every bar of the block.
+        """
+        high, low, close = (
+            np.ascontiguousarray(a, dtype=np.float64) 
+            for a in (high, low, close)
+        )
+        adx, dmp, dmn = _adx_kernel(
+            high, low, close, *self._params, 
+            self._atr, self._pos, self._neg, self._adx, self._hist
+        )
+        for values in zip(
+            adx[-self._last.maxlen:], 
+            dmp[-self._last.maxlen:], 
+            dmn[-self._last.maxlen:]
+        ):
+            self._last.appendleft(values)
+        return {"adx": adx, "dmp": dmp, "dmn": dmn}
+
+    def update(self, high: float, low: float, close: float) -> float:
+        """
+        Advances the state by one closed bar.
+        Args:
+            high (float): High price of the new bar.
+            low (float): Low price of the new bar.
+            close (float): Close price of the new bar.
+        Returns:
+            float: ADX value of the new bar.
+        """
+        self._last.appendleft(
+            _adx_step(
+                float(high), float(low), float(close), *self._params, 
+                self._atr, self._pos, self._neg, self._adx, self._hist
+            )
+        )
+        return self.adx
+
+    def is_trending(self, threshold: float) -> bool:
+        """
+        Checks whether the trend strength reaches `threshold`,
+          like `ADXTrend.get_signal` on the full history.
+        Args:
+            threshold (float): Minimum ADX value of a trend.
+        Returns:
+            bool: False while the ADX is not warmed up.
+        """
+        adx = self.adx
+        return not np.isnan(adx) and adx >= threshold
+
+
+@kernel((f8, f8, f8, i8, i8, f8, i8, i8, F8, F8, F8, F8, F8), error_model="numpy")
+def _adx_step(
+    high: float,
+    low: float,
+    close: float,
+    length: int,
+    lensig: int,
+    scalar: float,
+    drift: int,
+    mamode: int,
+    atr: NDArray,
+    pos_ma: NDArray,
+    neg_ma: NDArray,
+    adx_ma: NDArray,
+    hist: NDArray
+) -> tuple[float, float, float]:
+    """
+    Advances the ADX state by one bar in O(1), with the same 
+      arithmetic as `_adx_row`.
+    Returns:
+        tuple[float, float, float]: ADX, DMP, DMN.
+    """
+    seen = int(hist[-1])
+    slot = seen % drift
+    pos = np.nan
+    neg = np.nan
+    if seen >= drift:
+        up = high - hist[slot]
+        dn = hist[drift + slot] - low
+        if not np.isnan(up):
+            pos = up if up > dn and up > 0 else 0.0
+            # pandas-ta `zero`: drop float noise
+            if abs(pos) < 2.220446049250313e-16:
+                pos = 0.0
+        if not np.isnan(dn):
+            neg = dn if dn > up and dn > 0 else 0.0
+            if abs(neg) < 2.220446049250313e-16:
+                neg = 0.0
+    hist[slot] = high
+    hist[drift + slot] = low
+    hist[-1] = seen + 1
+    k = scalar / atr_step(atr, high, low, close, length)
+    dmp = k * ma_step(mamode, pos_ma, pos, length)
+    dmn = k * ma_step(mamode, neg_ma, neg, length)
+    dx = scalar * np.abs(dmp - dmn) / (dmp + dmn)
+    return ma_step(mamode, adx_ma, dx, lensig), dmp, dmn
+
+
+@kernel((F8, F8, F8, i8, i8, f8, i8, i8, F8, F8, F8, F8, F8))
+def _adx_kernel(
+    high: NDArray,
+    low: NDArray,
+    close: NDArray,
+    length: int,
+    lensig: int,
+    scalar: float,
+    drift: int,
+    mamode: int,
+    atr: NDArray,
+    pos_ma: NDArray,
+    neg_ma: NDArray,
+    adx_ma: NDArray,
+    hist: NDArray
+) -> tuple[NDArray, NDArray, NDArray]:
+    """
+    Runs `_adx_step` over a block of bars.
+    """
+    n = close.shape[0]
+    adx = np.empty(n)
+    dmp = np.empty(n)
+    dmn = np.empty(n)
+    for i in range(n):
+        adx[i], dmp[i], dmn[i] = _adx_step(
+            high[i], low[i], close[i], length, lensig, scalar, drift,
+            mamode, atr, pos_ma, neg_ma, adx_ma, hist
+        )
+    return adx, dmp, dmn
+
+
+def _resolve(
+    config: AdxConfigDM, 
+    n_bars: float
+) -> tuple[int, int, float, int]:
+    """
+    Resolves `length`, `lensig`, `scalar` and `drift` defaults 
+      the same way pandas-ta does.
+    Raises:
+        ValueError: If there are fewer bars than `length`.
+    """
+    length = config.length if config.length and config.length > 0 else 14
+    lensig = config.lensig if config.lensig and config.lensig > 0 else length
+    scalar = float(config.scalar) if config.scalar else 100.0
+    drift = config.drift if config.drift and config.drift > 0 else 1
+    if n_bars < length:
+        raise ValueError(
+            f"Error: ADX needs at least {length} bars, got {n_bars}."
+        )
+    return length, lensig, scalar, drift
+
+
+@kernel((P, P, P, i8, i8, f8, i8, i8), error_model="numpy")
+def _adx_row(
+    high: NDArray,
+    low: NDArray,
+    close: NDArray,
+    length: int,
+    lensig: int,
+    scalar: float,
+    drift: int,
+    mamode: int
+) -> tuple[NDArray, NDArray, NDArray]:
+    """
+    ADX of one instrument, following `pandas_ta.adx`.
+    Args:
+        high (np.ndarray): High prices.
+        low (np.ndarray): Low prices.
+        close (np.ndarray): Close prices.
+        length (int): Directional movement period.
+        lensig (int): ADX smoothing period.
+        scalar (float): Scaling factor for values.
+        drift (int): Difference amount.
+        mamode (int): Moving average kernel code.
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: ADX, DMP, DMN.
+    """
+    atr = atr_talib(high, low, close, length)
+    pos, neg = directional_movement(high, low, drift)
+    dmp, dmn, dx = _directional_index(
+        atr, ma(mamode, pos, length), ma(mamode, neg, length), scalar
+    )
+    return ma(mamode, dx, lensig), dmp, dmn
+
+
+@kernel((P, P, P, f8), error_model="numpy")
+def _directional_index(
+    atr: NDArray,
+    pos_ma: NDArray,
+    neg_ma: NDArray,
+    scalar: float
+) -> tuple[NDArray, NDArray, NDArray]:
+    """
+    DMP, DMN and DX from the ATR and the smoothed 
+      directional movement.
+    """
+    k = scalar / atr
+    dmp = k * pos_ma
+    dmn = k * neg_ma
+    dx = scalar * np.abs(dmp - dmn) / (dmp + dmn)
+    return dmp, dmn, dx
+
+
+@kernel((P_2D, P_2D, P_2D, i8, i8, f8, i8, i8), parallel=True)
+def _adx_batch(
+    high: NDArray,
+    low: NDArray,
+    close: NDArray,
+    length: int,
+    lensig: int,
+    scalar: float,
+    drift: int,
+    mamode: int
+) -> tuple[NDArray, NDArray, NDArray]:
+    """
+    Runs `_adx_row` for every instrument of a block in parallel.
+    """
+    adx = np.empty_like(close)
+    dmp = np.empty_like(close)
+    dmn = np.empty_like(close)
+    for r in prange(close.shape[0]):
+        adx[r], dmp[r], dmn[r] = _adx_row(
+            high[r], low[r], close[r], 
+            length, lensig, scalar, drift, mamode
+        )
+    return adx, dmp, dmn
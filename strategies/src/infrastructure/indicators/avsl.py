@@ -1,11 +1,39 @@
-import pandas as pd
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import numpy as np
-from numba import njit
 from numpy.typing import NDArray
-import pandas_ta as ta
 
 from strategies.src.domain.entities import AvslConfigDM
-from strategies.src.infrastructure._types import PriceDataFrame
+from strategies.src.infrastructure._lazy import lazy_import
+from strategies.src.infrastructure._types import OhlcvBlock, PriceDataFrame
+from strategies.src.infrastructure.indicators import reference
+from strategies.src.infrastructure.indicators._kernels import sma
+from strategies.src.infrastructure.indicators.graph import IndicatorGraph
+from strategies.src.infrastructure.indicators.jit import (
+    F8,
+    F8_2D,
+    I4,
+    I4_2D,
+    I8,
+    P_2D,
+    P,
+    f8,
+    i8,
+    kernel,
+    p,
+    prange,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+# Windows shorter than this are summed term by term exactly as the 
+# original per-window formula did; longer ones come from prefix sums
+EXACT_WINDOW = 8
 
 
 class AVSL:
@@ -44,7 +72,8 @@ class AVSL:
     def calculate_avsl(
         self, 
         data: PriceDataFrame, 
-        config: AvslConfigDM
+        config: AvslConfigDM,
+        graph: IndicatorGraph | None = None
     ) -> pd.DataFrame:
         """
         Computes the AVSL (Adaptive Support Level) values.
@@ -52,108 +81,122 @@ class AVSL:
             data (PriceDataFrame): Market price dataset containing 
               high, low, close prices and volume.
             config (AvslConfigDM): AVSL configuration parameters.
+            graph (IndicatorGraph | None): Shared evaluation graph 
+              of `data`; when given, primitive series are taken 
+              from (and cached in) it; unused by the pandas-ta 
+              backend.
         Returns:
             pd.DataFrame: A DataFrame containing AVSL values 
               indexed by date.
+        Raises:
+            ValueError: If the backend is unknown.
         """
-        # Compute core components (VWMA, VPC, VPR, VM, VPCI)
-        vw_f, vw_s, vpc, vpr, vm, vpci = self._compute_base_series(data, config)
-        # Compute price adjustment and deviation
-        price_v = self._price_fun(data, vpc, vpr, vpci)
-        deviation = config.stand_div * vpci * vm
-        # Compute AVSL using SMA
-        avsl = ta.sma(
-            close=data.low_prices - price_v + deviation,
-            length=config.length_slow, 
-            talib=True
-        )
+        if reference.is_reference(config.backend):
+            avsl = self._avsl_reference(data, config)[None]
+        elif graph is not None:
+            avsl = self._avsl_from_graph(graph, config)[None]
+        else:
+            # Compute AVSL on a single-instrument block
+            avsl = self.calculate_avsl_batch(
+                OhlcvBlock.from_frames([data]), config
+            )
         return pd.DataFrame(
-            {"avsl": avsl}, 
+            {"avsl": avsl[0]}, 
             index=data.index
         )
 
-    def _compute_base_series(
+    def calculate_avsl_batch(
         self, 
-        data: PriceDataFrame, 
+        block: OhlcvBlock, 
         config: AvslConfigDM
-    ) -> tuple[NDArray]:
+    ) -> NDArray:
         """
-        Computes base technical indicators required 
-          for AVSL.
+        Computes AVSL for a whole universe of bar-aligned
+          instruments in parallel.
         Args:
-            data (PriceDataFrame): Market price dataset.
-            config (AvslConfigDM): AVSL configuration 
-              parameters.
+            block (OhlcvBlock): Price columns (instruments x bars).
+            config (AvslConfigDM): AVSL configuration parameters.
         Returns:
-            Tuple[np.ndarray]: VWMA fast, VWMA slow, 
-              VPC, VPR, VM, VPCI.
+            np.ndarray: AVSL values (instruments x bars).
         """
-        vw_ma_fast = ta.vwma(
-            close=data.close_prices, 
-            volume=data.volumes, 
-            length=config.length_fast
+        return _avsl_batch(
+            block.low,
+            block.close,
+            block.volume,
+            config.length_fast,
+            config.length_slow,
+            float(config.stand_div),
         )
-        vw_ma_slow = ta.vwma(
-            close=data.close_prices, 
-            volume=data.volumes, 
-            length=config.length_slow
-        )
-        vpc = vw_ma_slow - ta.sma(
-            close=data.close_prices, 
-            length=config.length_slow, 
-            talib=True
-        )
-        vpr = vw_ma_fast / ta.sma(
-            close=data.close_prices, 
-            length=config.length_fast, 
-            talib=True
-        )
-        vm = ta.sma(
-            close=data.volumes, 
-            length=config.length_fast, 
-            talib=True
-        ) / ta.sma(
-            close=data.volumes, 
-            length=config.length_slow, 
-            talib=True
-        )
-        return (
-            vw_ma_fast, 
-            vw_ma_slow, 
-            vpc, vpr, vm, 
-            vpc * vpr * vm
+
+    def _avsl_from_graph(
+        self, 
+        graph: IndicatorGraph, 
+        config: AvslConfigDM
+    ) -> NDArray:
+        """
+        AVSL from the shared SMAs of close, volume and 
+          close * volume of an evaluation graph.
+        """
+        price_volume = ("mul", "close", "volume")
+        return _avsl_from_smas(
+            graph.get("low"),
+            graph.sma("close", config.length_fast),
+            graph.sma("close", config.length_slow),
+            graph.sma("volume", config.length_fast),
+            graph.sma("volume", config.length_slow),
+            graph.sma(price_volume, config.length_fast),
+            graph.sma(price_volume, config.length_slow),
+            config.length_slow,
+            float(config.stand_div),
         )
 
-    def _price_fun(
+    def _avsl_reference(
         self, 
         data: PriceDataFrame, 
-        vpc: pd.Series, 
-        vpr: pd.Series, 
-        vpci: pd.Series
+        config: AvslConfigDM
     ) -> NDArray:
         """
-        Optimized price adjustment function using vectorized 
-          calculations and a Numba-jitted helper.
+        AVSL on the pandas-ta VWMA and TA-Lib SMA; the price 
+          function has no library counterpart and stays compiled.
+        """
+        vpc, vpr, vm, vpci = reference.avsl_components(data, config)
+        price_v = self.compute_price_v_block(
+            data.low_prices[None], vpc[None], vpr[None], vpci[None]
+        )[0]
+        deviation = config.stand_div * vpci * vm
+        return reference.sma(
+            data.low_prices - price_v + deviation, config.length_slow
+        )
+
+    @classmethod
+    def compute_price_v_block(
+        cls, 
+        low: NDArray, 
+        vpc: NDArray, 
+        vpr: NDArray, 
+        vpci: NDArray
+    ) -> NDArray:
+        """
+        Computes the price adjustment for a whole universe 
+          in one call.
         Args:
-            data (PriceDataFrame): Market price dataset.
-            vpc (pd.Series): Volume Price Confirmation values.
-            vpr (pd.Series): Volume Price Ratio values.
-            vpci (pd.Series): VPCI values.
+            low (np.ndarray): Low prices (instruments x bars).
+            vpc (np.ndarray): Volume Price Confirmation values.
+            vpr (np.ndarray): Volume Price Ratio values.
+            vpci (np.ndarray): VPCI values.
         Returns:
-            np.ndarray: Adjusted price levels based on 
-              volume-price interaction.
+            np.ndarray: Adjusted price levels (instruments x bars).
         """
-        # Convert pandas Series to NumPy arrays
-        # for faster processing
-        low_np, vpc_np, vpr_np, vpci_np = (
-            s.to_numpy() for s in (data.low_prices, vpc, vpr, vpci)
+        low, vpc, vpr, vpci = (
+            np.ascontiguousarray(a, dtype=np.float64) 
+            for a in (low, vpc, vpr, vpci)
+        )
+        return _compute_price_v_2d(
+            low, 
+            vpr, 
+            cls.compute_len_v(vpc, vpci), 
+            cls.compute_vpcc(vpc)
         )
-        # Compute `lenV` (Volume Confirmation Length)
-        lenV = self.compute_len_v(vpc_np, vpci_np)
-        # Compute `VPCc` (Adjusted Volume Confirmation Coefficient)
-        VPCc = self.compute_vpcc(vpc_np)
-        # Call the optimized JIT helper function
-        return _compute_price_v(low_np, vpr_np, lenV, VPCc)
 
     @staticmethod
     def compute_len_v(
@@ -206,26 +249,76 @@ class AVSL:
     def get_last_avsl_signal(
         self, 
         data: PriceDataFrame, 
-        config: AvslConfigDM
+        config: AvslConfigDM,
+        graph: IndicatorGraph | None = None
     ) -> float | None:
         """
         Retrieves the AVSL value on the last bar.
         Args:
             data (PriceDataFrame): Market data with price information.
             config (AvslConfigDM): Configuration settings for AVSL.
+            graph (IndicatorGraph | None): Shared evaluation graph 
+              of `data`; when given, primitive series are taken 
+              from (and cached in) it.
         Returns:
             float | None: AVSL value of the last bar 
               if available, otherwise None.
         """
+        if graph is None:
+            # The last value only depends on a tail of the bars
+            data = self._tail(data, config)
         # Compute AVSL values
-        avsl_df = self.calculate_avsl(data, config)
+        avsl_df = self.calculate_avsl(data, config, graph)
         # Ensure AVSL is not empty before retrieving the last value
         if avsl_df.empty or "avsl" not in avsl_df.columns or pd.isna(avsl_df["avsl"].iloc[-1]):
             return None
         return avsl_df["avsl"].iloc[-1]
 
+    def lookback(self, config: AvslConfigDM) -> int:
+        """
+        Fewest bars the AVSL of the last bar depends on: the 
+          final SMA over `length_slow` bars of values that each 
+          need `length_slow` bars of VWMA and SMA. The price 
+          windows (`lenV`) of those bars depend on the data and 
+          can reach further back; `get_last_avsl_signal` extends 
+          the tail for them as far as the given bars allow.
+        Args:
+            config (AvslConfigDM): Configuration settings for AVSL.
+        Returns:
+            int: Number of trailing bars.
+        """
+        longest = max(config.length_fast, config.length_slow)
+        return max(
+            2 * longest - 1, 
+            config.length_slow + config.length_fast - 1
+        )
 
-@njit
+    def _tail(
+        self, 
+        data: PriceDataFrame, 
+        config: AvslConfigDM
+    ) -> PriceDataFrame:
+        """
+        Shortest tail of `data` with the AVSL of the last bar: 
+          starts at `lookback` bars and grows while the `lenV` 
+          windows of the last bars reach past its start.
+        """
+        n = min(self.lookback(config), len(data))
+        while n < len(data):
+            tail = OhlcvBlock.from_frames([data.tail(n)])
+            reach = _avsl_reach(
+                tail.close[0], 
+                tail.volume[0], 
+                config.length_fast, 
+                config.length_slow
+            )
+            if reach <= n:
+                break
+            n = min(max(reach, 2 * n), len(data))
+        return data.tail(n)
+
+
+@kernel((P, P, I8, F8), (P, P, I4, F8))
 def _compute_price_v(
     low: NDArray, 
     vpr: NDArray, 
@@ -233,7 +326,13 @@ def _compute_price_v(
     VPCc: NDArray
 ) -> NDArray:
     """
-    Optimized price computation using Numba JIT for speed.
+    Price computation in O(n) using compensated prefix sums.
+    Every bar averages `low / (VPCc * vpr)` over its own 
+      `lenV` window, so the window sums are taken as 
+      differences of running sums of `low / vpr` instead of 
+      re-slicing the window for each bar. Windows shorter 
+      than `EXACT_WINDOW` are summed directly and match the 
+      per-window formula bit for bit.
     Args:
         low (np.ndarray): Array of low prices.
         vpr (np.ndarray): Volume Price Ratio.
@@ -243,26 +342,220 @@ def _compute_price_v(
         np.ndarray: Optimized price values.
     """
     n = low.shape[0]
-    out = np.empty(n, dtype=np.float64)
+    out = np.empty(n, dtype=low.dtype)
+    # Running sums are kept as (hi, lo) pairs so that the 
+    # difference of two prefixes stays exact to the last bits
+    prefix_hi = np.zeros(n + 1, dtype=np.float64)
+    prefix_lo = np.zeros(n + 1, dtype=np.float64)
+    # Number of NaN terms up to each bar
+    prefix_nan = np.zeros(n + 1, dtype=np.int64)
+    hi = 0.0
+    lo = 0.0
+    nans = 0
+    for j in range(n):
+        # Prevent division by zero
+        term = low[j] / vpr[j] if vpr[j] != 0 else 0.0
+        if np.isnan(term):
+            nans += 1
+        else:
+            # TwoSum: keep the rounding error of every addition
+            total = hi + term
+            virtual = total - hi
+            lo += (hi - (total - virtual)) + (term - virtual)
+            hi = total
+        prefix_hi[j + 1] = hi
+        prefix_lo[j + 1] = lo
+        prefix_nan[j + 1] = nans
     for i in range(n):
         L = lenV[i]
         if L > 0:
-            s = np.sum(
-                np.divide(
-                    low[max(0, i - L + 1): i + 1],
-                    VPCc[i] * vpr[max(0, i - L + 1): i + 1],
-                    out=np.zeros_like(
-                        low[max(0, i - L + 1): i + 1]
-                    ),
+            start = max(0, i - L + 1)
+            if VPCc[i] == 0:
+                s = 0.0
+            elif L < EXACT_WINDOW:
+                s = 0.0
+                for j in range(start, i + 1):
                     # Prevent division by zero
-                    where=(
-                        VPCc[i] != 0
-                    ) & (
-                        vpr[max(0, i - L + 1): i + 1] != 0
-                    )  
-                )
-            )
+                    if vpr[j] != 0:
+                        s += low[j] / (VPCc[i] * vpr[j])
+            elif prefix_nan[i + 1] != prefix_nan[start]:
+                s = np.nan
+            else:
+                s = (
+                    (prefix_hi[i + 1] - prefix_hi[start]) 
+                    + (prefix_lo[i + 1] - prefix_lo[start])
+                ) / VPCc[i]
             out[i] = s / L / 100.0
         else:
             out[i] = low[i]
     return out
+
+
+@kernel((P, P, P, i8, i8, f8))
+def _avsl_row(
+    low: NDArray,
+    close: NDArray,
+    volume: NDArray,
+    length_fast: int,
+    length_slow: int,
+    stand_div: float
+) -> NDArray:
+    """
+    AVSL of one instrument.
+    Args:
+        low (np.ndarray): Low prices.
+        close (np.ndarray): Close prices.
+        volume (np.ndarray): Volumes.
+        length_fast (int): Fast VWMA/SMA period.
+        length_slow (int): Slow VWMA/SMA period.
+        stand_div (float): Deviation multiplier.
+    Returns:
+        np.ndarray: AVSL values.
+    """
+    price_volume = close * volume
+    return _avsl_from_smas(
+        low,
+        sma(close, length_fast),
+        sma(close, length_slow),
+        sma(volume, length_fast),
+        sma(volume, length_slow),
+        sma(price_volume, length_fast),
+        sma(price_volume, length_slow),
+        length_slow,
+        stand_div,
+    )
+
+
+@kernel((P, P, P, P, P, P, P, i8, f8), error_model="numpy")
+def _avsl_from_smas(
+    low: NDArray,
+    close_fast: NDArray,
+    close_slow: NDArray,
+    volume_fast: NDArray,
+    volume_slow: NDArray,
+    price_volume_fast: NDArray,
+    price_volume_slow: NDArray,
+    length_slow: int,
+    stand_div: float
+) -> NDArray:
+    """
+    AVSL from the fast/slow SMAs of close, volume and 
+      close * volume, which are shared between configurations 
+      with the same lengths.
+    """
+    n = low.shape[0]
+    # Compute core components (VWMA, VPC, VPR, VM, VPCI)
+    vw_ma_fast = price_volume_fast / volume_fast
+    vw_ma_slow = price_volume_slow / volume_slow
+    vpc = vw_ma_slow - close_slow
+    vpr = vw_ma_fast / close_fast
+    vm = volume_fast / volume_slow
+    vpci = vpc * vpr * vm
+    # Mirror AVSL.compute_len_v and AVSL.compute_vpcc
+    lenV = np.empty(n, dtype=np.int64)
+    VPCc = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        lenV[i] = _len_v(vpc[i], vpci[i])
+        if -1 < vpc[i] < 0:
+            VPCc[i] = -1.0
+        elif 0 <= vpc[i] < 1:
+            VPCc[i] = 1.0
+        else:
+            VPCc[i] = vpc[i]
+    # Compute price adjustment and deviation
+    price_v = _compute_price_v(low, vpr, lenV, VPCc)
+    deviation = stand_div * vpci * vm
+    return sma(low - price_v + deviation, length_slow)
+
+
+@kernel((p, p))
+def _len_v(vpc: float, vpci: float) -> int:
+    """
+    Price window of one bar, as in `AVSL.compute_len_v`.
+    """
+    if np.isnan(vpci):
+        return 1
+    if vpc < 0:
+        return np.int32(np.rint(np.abs(vpci - 3)))
+    return np.int32(np.rint(vpci + 3))
+
+
+@kernel((P, P, i8, i8), error_model="numpy")
+def _avsl_reach(
+    close: NDArray,
+    volume: NDArray,
+    length_fast: int,
+    length_slow: int
+) -> int:
+    """
+    Trailing bars the AVSL of the last bar depends on, judged 
+      from the given bars: the last `length_slow` bars each 
+      average `low / vpr` over their `lenV` window, which has 
+      to start after the first `length_fast - 1` bars, where 
+      VPR is still NaN. Bars whose VPCI is not available yet 
+      count with the shortest window.
+    """
+    n = close.shape[0]
+    price_volume = close * volume
+    close_fast = sma(close, length_fast)
+    close_slow = sma(close, length_slow)
+    volume_fast = sma(volume, length_fast)
+    volume_slow = sma(volume, length_slow)
+    price_volume_fast = sma(price_volume, length_fast)
+    price_volume_slow = sma(price_volume, length_slow)
+    longest = max(length_fast, length_slow)
+    reach = max(2 * longest - 1, length_slow + length_fast - 1)
+    for i in range(max(n - length_slow, 0), n):
+        # Same VPC, VPR and VM as `_avsl_from_smas`
+        vpc = price_volume_slow[i] / volume_slow[i] - close_slow[i]
+        vpr = (price_volume_fast[i] / volume_fast[i]) / close_fast[i]
+        vm = volume_fast[i] / volume_slow[i]
+        window = max(_len_v(vpc, vpc * vpr * vm), 1)
+        reach = max(reach, n - i + window - 1 + length_fast - 1)
+    return reach
+
+
+@kernel((P_2D, P_2D, P_2D, i8, i8, f8), parallel=True)
+def _avsl_batch(
+    low: NDArray,
+    close: NDArray,
+    volume: NDArray,
+    length_fast: int,
+    length_slow: int,
+    stand_div: float
+) -> NDArray:
+    """
+    Runs `_avsl_row` for every instrument of a block in parallel.
+    """
+    out = np.empty_like(close)
+    for r in prange(close.shape[0]):
+        out[r] = _avsl_row(
+            low[r], close[r], volume[r], 
+            length_fast, length_slow, stand_div
+        )
+    return out
+
+
+@kernel((F8_2D, F8_2D, I4_2D, F8_2D), parallel=True)
+def _compute_price_v_2d(
+    low: NDArray, 
+    vpr: NDArray, 
+    lenV: NDArray, 
+    VPCc: NDArray
+) -> NDArray:
+    """
+    Multi-instrument variant of `_compute_price_v`.
+    Rows are instruments and columns are bars; every row is 
+      processed independently on its own core.
+    Args:
+        low (np.ndarray): 2D array of low prices.
+        vpr (np.ndarray): 2D Volume Price Ratio.
+        lenV (np.ndarray): 2D length values for price calculation.
+        VPCc (np.ndarray): 2D adjusted VPC coefficients.
+    Returns:
+        np.ndarray: 2D array of price values.
+    """
+    out = np.empty_like(low)
+    for r in prange(low.shape[0]):
+        out[r] = _compute_price_v(low[r], vpr[r], lenV[r], VPCc[r])
+    return out
@@ -0,0 +1,205 @@
+from dataclasses import dataclass
+from typing import Callable, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from strategies.src.infrastructure._types import OhlcvBlock, PriceDataFrame
+from strategies.src.infrastructure.indicators._kernels import (
+    MA_EMA,
+    MA_RMA,
+    MA_SMA,
+    atr_talib,
+    directional_movement,
+    ema,
+    rma,
+    rolling_max,
+    rolling_min,
+    rsi_rma,
+    rsi_talib,
+    sma,
+)
+
+# A node input is either a price column name or the key of another node
+NodeKey = Union[str, tuple]
+
+_SOURCES = ("open", "high", "low", "close", "volume")
+_MA_OPS = {MA_RMA: "rma", MA_EMA: "ema", MA_SMA: "sma"}
+
+
+@dataclass(slots=True, frozen=True)
+class GraphStats:
+    """
+    Node counters of one evaluation.
+    `computed` nodes were evaluated, `reused` lookups were
+    served from an already evaluated node.
+    """
+    computed: int
+    reused: int
+
+
+class IndicatorGraph:
+    """
+    Evaluation graph of primitive series for one instrument.
+
+    Strategies evaluate several indicators on the same bars and
+    those indicators keep asking for the same primitives: SMAs
+    of close and volume, an RSI of close, rolling extremes of
+    that RSI, an ATR... The graph turns every primitive into a
+    node keyed by `(op, input, *params)`, where `input` is a
+    price column or the key of another node. A node is computed
+    the first time it is requested and then shared by every
+    indicator (and every other node) of the evaluation.
+
+    Create one graph per evaluation, pass it as `graph=` to the
+    indicator methods and read `stats` to see how much was shared.
+
+    Example:
+        graph = IndicatorGraph(data)
+        rsi = graph.rsi("close", 14)
+        top = graph.rolling_max(("rsi", "close", 14), 14)
+    """
+
+    def __init__(self, data: PriceDataFrame) -> None:
+        block = OhlcvBlock.from_frames([data])
+        self._sources = {name: getattr(block, name)[0] for name in _SOURCES}
+        self._nodes: dict[tuple, NDArray] = {}
+        self._computed = 0
+        self._reused = 0
+
+    @property
+    def stats(self) -> GraphStats:
+        return GraphStats(computed=self._computed, reused=self._reused)
+
+    def get(self, key: NodeKey) -> NDArray:
+        """
+        Returns the values of a price column or a node,
+          computing the node (and its inputs) on first use.
+        Args:
+            key (str | tuple): Column name or node key.
+        Returns:
+            np.ndarray: Series values. Do not modify them,
+              they are shared.
+        Raises:
+            KeyError: If the column or the operation is unknown.
+        """
+        if isinstance(key, str):
+            return self._sources[key]
+        values = self._nodes.get(key)
+        if values is not None:
+            self._reused += 1
+            return values
+        op, src, *params = key
+        values = _OPS[op](self, src, *params)
+        self._nodes[key] = values
+        self._computed += 1
+        return values
+
+    def sma(self, src: NodeKey, length: int) -> NDArray:
+        return self.get(("sma", src, length))
+
+    def ema(self, src: NodeKey, length: int) -> NDArray:
+        return self.get(("ema", src, length))
+
+    def rma(self, src: NodeKey, length: int) -> NDArray:
+        return self.get(("rma", src, length))
+
+    def ma(self, mamode: int, src: NodeKey, length: int) -> NDArray:
+        """
+        Moving average selected by a kernel code of `mamode_code`.
+        """
+        return self.get((_MA_OPS[mamode], src, length))
+
+    def rsi(self, src: NodeKey, length: int) -> NDArray:
+        """
+        RSI with TA-Lib semantics.
+        """
+        return self.get(("rsi", src, length))
+
+    def vwma(self, src: NodeKey, length: int) -> NDArray:
+        """
+        Volume weighted moving average of `src`.
+        """
+        return self.get(("vwma", src, length))
+
+    def diff(self, src: NodeKey, periods: int = 1) -> NDArray:
+        return self.get(("diff", src, periods))
+
+    def rolling_max(self, src: NodeKey, length: int) -> NDArray:
+        return self.get(("rolling_max", src, length))
+
+    def rolling_min(self, src: NodeKey, length: int) -> NDArray:
+        return self.get(("rolling_min", src, length))
+
+    def atr(self, length: int) -> NDArray:
+        """
+        Average True Range with TA-Lib semantics.
+        """
+        return self.get(("atr", None, length))
+
+    def average_price(self) -> NDArray:
+        """
+        Mean of open, high, low and close.
+        """
+        return self.get(("ohlc4", None))
+
+
+def _diff(graph: IndicatorGraph, src: NodeKey, periods: int) -> NDArray:
+    x = graph.get(src)
+    out = np.full_like(x, np.nan)
+    if periods >= 0:
+        out[periods:] = x[periods:] - x[:x.shape[0] - periods]
+    else:
+        out[:periods] = x[:periods] - x[-periods:]
+    return out
+
+
+def _vwma(graph: IndicatorGraph, src: NodeKey, length: int) -> NDArray:
+    # Shares the SMA of volume and of src * volume with other nodes
+    return (
+        graph.sma(("mul", src, "volume"), length)
+        / graph.sma("volume", length)
+    )
+
+
+def _average_price(graph: IndicatorGraph, src: None) -> NDArray:
+    return (
+        graph.get("low") + graph.get("high")
+        + graph.get("open") + graph.get("close")
+    ) / 4
+
+
+def _directional(index: int) -> Callable[..., NDArray]:
+    def compute(graph: IndicatorGraph, src: None, drift: int) -> NDArray:
+        pos, neg = directional_movement(
+            graph.get("high"), graph.get("low"), drift
+        )
+        # Both sides come out of one pass, keep the other one too
+        other = ("dm_neg" if index == 0 else "dm_pos", None, drift)
+        if other not in graph._nodes:
+            graph._nodes[other] = neg if index == 0 else pos
+            graph._computed += 1
+        return pos if index == 0 else neg
+    return compute
+
+
+_OPS: dict[str, Callable[..., NDArray]] = {
+    "sma": lambda g, src, length: sma(g.get(src), length),
+    "ema": lambda g, src, length: ema(g.get(src), length),
+    "rma": lambda g, src, length: rma(g.get(src), length),
+    "rsi": lambda g, src, length: rsi_talib(g.get(src), length),
+    "rsi_rma": lambda g, src, length, scalar, drift: rsi_rma(
+        g.get(src), length, scalar, drift
+    ),
+    "rolling_max": lambda g, src, length: rolling_max(g.get(src), length),
+    "rolling_min": lambda g, src, length: rolling_min(g.get(src), length),
+    "mul": lambda g, src, other: g.get(src) * g.get(other),
+    "atr": lambda g, src, length: atr_talib(
+        g.get("high"), g.get("low"), g.get("close"), length
+    ),
+    "diff": _diff,
+    "vwma": _vwma,
+    "ohlc4": _average_price,
+    "dm_pos": _directional(0),
+    "dm_neg": _directional(1),
+}
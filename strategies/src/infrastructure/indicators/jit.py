@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from importlib import import_module
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from numba.core.dispatcher import Dispatcher
+
+# Argument types of the kernel signatures: scalars in lower case,
+# C-contiguous arrays in upper case. Kept as numba type strings so
+# that declaring a kernel does not import numba
+f8 = "float64"
+i8 = "int64"
+b1 = "boolean"
+F8 = "float64[::1]"
+I8 = "int64[::1]"
+I4 = "int32[::1]"
+B1 = "boolean[::1]"
+F8_2D = "float64[:, ::1]"
+I8_2D = "int64[:, ::1]"
+I4_2D = "int32[:, ::1]"
+F8_3D = "float64[:, :, ::1]"
+# Price-typed arguments: candles and the series derived from them.
+# They take the precision of the candles, float64 or float32 in
+# the compact mode, and are compiled for each of `PRECISIONS`
+p = "price"
+P = "price[::1]"
+P_2D = "price[:, ::1]"
+P_3D = "price[:, :, ::1]"
+PRECISIONS = ("float64", "float32")
+
+# Modules defining kernels, imported by `warm_up`
+_KERNEL_MODULES = tuple(
+    f"strategies.src.infrastructure.indicators.{name}"
+    for name in (
+        "_kernels",
+        "acceleration_bands",
+        "adx",
+        "avsl",
+        "order_block",
+        "rsi_clouds",
+        "scrsi",
+        "stoch_rsi",
+        "sweep",
+        "zones",
+    )
+)
+
+
+class LazyKernel:
+    """
+    Kernel declared while numba is not loaded yet.
+
+    Stands in for the numba dispatcher until the first call (or
+    `warm_up`) loads numba. All kernels are then created at once
+    and every placeholder in the namespaces of the modules that
+    define kernels is replaced by its dispatcher: compiled code
+    looks the kernels it calls (and `prange`) up by name in the
+    globals of its own module when it is compiled. Other modules
+    may keep the placeholder, which forwards calls.
+    """
+    __slots__ = ("name", "func", "signatures", "options", "_dispatcher")
+
+    def __init__(
+        self, 
+        name: str, 
+        func: Callable, 
+        signatures: tuple[tuple[str, ...], ...], 
+        options: dict[str, Any]
+    ) -> None:
+        self.name = name
+        self.func = func
+        self.signatures = signatures
+        self.options = options
+        self._dispatcher: Dispatcher | None = None
+
+    @property
+    def dispatcher(self) -> Dispatcher:
+        if self._dispatcher is None:
+            load()
+        return self._dispatcher
+
+    def __call__(self, *args: Any) -> Any:
+        return self.dispatcher(*args)
+
+    def __getattr__(self, name: str) -> Any:
+        # py_func, signatures, stats... of the dispatcher
+        return getattr(self.dispatcher, name)
+
+
+@dataclass(slots=True, frozen=True)
+class CompileStats:
+    """
+    Warm-up of one kernel.
+    `seconds` were spent compiling its signatures or loading
+    them from the on-disk cache; `cached` of the `signatures`
+    came from the cache.
+    """
+    name: str
+    signatures: int
+    cached: int
+    seconds: float
+
+
+# Every kernel of the strategies package, by qualified name
+KERNELS: dict[str, LazyKernel] = {}
+
+_numba: ModuleType | None = None
+_load_lock = threading.Lock()
+
+
+def prange(*args: int) -> range:
+    """
+    `numba.prange` once numba is loaded, `range` before.
+    """
+    return range(*args)
+
+
+# Kept under a second name, `prange` itself is replaced on load
+_PRANGE = prange
+
+
+def kernel(
+    *signatures: tuple[str, ...], 
+    **options: Any
+) -> Callable[[Callable], LazyKernel | Dispatcher]:
+    """
+    `numba.njit` with the on-disk cache, registered for `warm_up`.
+
+    The signatures are the argument types the kernel is called
+    with from Python and from other kernels. They are compiled
+    by `warm_up`, not on import, and calls with other types
+    still compile lazily. The cache lives next to the sources
+    (or in `NUMBA_CACHE_DIR`); numba revalidates an entry
+    against the file of the kernel only, so build the cache
+    once per release rather than reusing it across versions.
+    Args:
+        *signatures (tuple): Argument types, e.g. `(F8, i8)`.
+        **options: Options of `numba.njit`.
+    Returns:
+        Callable: Decorator returning a `LazyKernel`, or the
+          dispatcher itself once numba is loaded.
+    """
+    def register(func: Callable) -> LazyKernel | Dispatcher:
+        name = f"{func.__module__}.{func.__qualname__}"
+        spec = LazyKernel(name, func, signatures, options)
+        KERNELS[name] = spec
+        if _numba is None:
+            return spec
+        spec._dispatcher = _numba.njit(cache=True, **options)(func)
+        return spec._dispatcher
+    return register
+
+
+def load() -> None:
+    """
+    Imports numba and creates the dispatcher of every declared
+      kernel, replacing the placeholders in the namespaces of
+      the modules that own a kernel.
+    """
+    global _numba
+    with _load_lock:
+        if _numba is not None:
+            return
+        numba = import_module("numba")
+        owners: dict[int, dict[str, Any]] = {}
+        for spec in KERNELS.values():
+            spec._dispatcher = numba.njit(cache=True, **spec.options)(spec.func)
+            owners.setdefault(id(spec.func.__globals__), spec.func.__globals__)
+        # Compiled code only lives in those modules
+        for namespace in owners.values():
+            _bind(namespace, numba)
+        # Late imports of `prange` from this module get numba's
+        globals()["prange"] = numba.prange
+        _numba = numba
+
+
+def _bind(namespace: dict[str, Any], numba: ModuleType) -> None:
+    for name, value in list(namespace.items()):
+        if isinstance(value, LazyKernel):
+            namespace[name] = value._dispatcher
+        elif value is _PRANGE:
+            namespace[name] = numba.prange
+
+
+def warm_up(
+    log: Callable[[str], None] | None = None,
+    precisions: tuple[str, ...] = ("float64",)
+) -> list[CompileStats]:
+    """
+    Compiles (or loads from the cache) every registered
+    signature, so no strategy call stalls on compilation.
+    Run it before the service reports ready.
+    Args:
+        log (Callable[[str], None] | None): Receives a line
+          per kernel.
+        precisions (tuple[str, ...]): Precisions of the
+          price-typed arguments to compile, see `PRECISIONS`.
+    Returns:
+        list[CompileStats]: Per-kernel compile times, in
+          registration order.
+    """
+    for module in _KERNEL_MODULES:
+        import_module(module)
+    load()
+    stats = []
+    for spec in list(KERNELS.values()):
+        signatures = _expand(spec.signatures, precisions)
+        hits = sum(spec.dispatcher.stats.cache_hits.values())
+        start = time.perf_counter()
+        for signature in signatures:
+            spec.dispatcher.compile(signature)
+        stat = CompileStats(
+            name=spec.name,
+            signatures=len(signatures),
+            cached=sum(spec.dispatcher.stats.cache_hits.values()) - hits,
+            seconds=time.perf_counter() - start,
+        )
+        stats.append(stat)
+        if log is not None:
+            log(
+                f"{stat.name}: {stat.seconds:.3f} s, "
+                f"{stat.cached}/{stat.signatures} cached"
+            )
+    return stats
+
+
+def _expand(
+    signatures: tuple[tuple[str, ...], ...],
+    precisions: tuple[str, ...]
+) -> list[str]:
+    # Signature strings of every precision, without duplicates
+    # for kernels that take no price-typed argument
+    expanded = {}
+    for signature in signatures:
+        text = "(" + "".join(f"{arg}, " for arg in signature) + ")"
+        for precision in precisions:
+            expanded[text.replace(p, precision)] = None
+    return list(expanded)
+
+
+if __name__ == "__main__":
+    # Builds the cache, e.g. while building the service image.
+    # The kernels register in the imported module, not in __main__
+    from strategies.src.infrastructure.indicators import jit
+
+    started = time.perf_counter()
+    compiled = jit.warm_up(print, jit.PRECISIONS)
+    print(
+        f"{len(compiled)} kernels ready in "
+        f"{time.perf_counter() - started:.1f} s"
+    )
@@ -1,9 +1,27 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Any
+
 import numpy as np
-import pandas as pd
-from scipy.signal import find_peaks  # type: ignore
+from numpy.typing import NDArray
 
-from strategies.src.domain.entities import OrderBlockDetectorDM
-from strategies.src.infrastructure._types import PriceDataFrame
+from strategies.src.domain.entities import OrderBlockDetectorDM, OrderBlockDM
+from strategies.src.infrastructure._lazy import lazy_import
+from strategies.src.infrastructure._types import OhlcvBlock, PriceDataFrame
+from strategies.src.infrastructure.indicators.jit import (
+    P_2D,
+    P,
+    f8,
+    i8,
+    kernel,
+    prange,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
 
 
 class OrderBlockDetector:
@@ -15,10 +33,9 @@ class OrderBlockDetector:
       data using the ZigZag pattern algorithm.
 
     Formula:
-    1. Find **peaks** using `find_peaks()` applied 
-      to **high prices**.
-    2. Find **valleys** using `find_peaks()` applied 
-      to **low prices**.
+    1. Find **peaks** using a compiled port of 
+      `scipy.signal.find_peaks()` applied to **high prices**.
+    2. Find **valleys** the same way on **low prices**.
     3. Define peak prominence, threshold, and 
       distance to filter out weak signals.
     4. Store peak and valley locations in separate arrays.
@@ -50,36 +67,657 @@ class OrderBlockDetector:
         Returns:
             pd.DataFrame: A DataFrame with marked peaks and valleys.
         """
-        # Detect peaks (local maxima) in high prices
-        peaks, _ = find_peaks(
-            x=data.high_prices, 
-            height=config.height,
-            threshold=config.threshold,
-            distance=config.distance,
-            prominence=config.peak_prominance,
-            width=config.width,
-            wlen=config.wlen,
-            rel_height=config.rel_height,
-            plateau_size=config.plateu_size
-        )
-        # Detect valleys (local minima) in low prices
-        valleys, _ = find_peaks(
-            x=data.low_prices, 
-            height=config.height,
-            threshold=config.threshold,
-            distance=config.distance,
-            prominence=config.valley_prominance,
-            width=config.width,
-            wlen=config.wlen,
-            rel_height=config.rel_height,
-            plateau_size=config.plateu_size
+        # Detect peaks and valleys on a single-instrument block
+        zigzag = self.zigzag_indicator_batch(
+            OhlcvBlock.from_frames([data]), config
         )
-        # Initialize arrays to store detected peaks and valleys
-        peaks_array = np.full_like(data.high_prices, np.nan)
-        valleys_array = np.full_like(data.low_prices, np.nan)
-        peaks_array[peaks] = data.high_prices.iloc[peaks]
-        valleys_array[valleys] = data.low_prices.iloc[valleys]
         return pd.DataFrame(
-            {"peaks": peaks_array, "valleys": valleys_array},
+            {name: values[0] for name, values in zigzag.items()},
             index=data.index
         )
+
+    def zigzag_indicator_batch(
+        self, 
+        block: OhlcvBlock, 
+        config: OrderBlockDetectorDM
+    ) -> dict[str, NDArray]:
+        """
+        Detects peaks and valleys for a whole universe of 
+          bar-aligned instruments in parallel.
+        Args:
+            block (OhlcvBlock): Price columns (instruments x bars).
+            config (OrderBlockDetectorDM): Configuration 
+              settings for peak detection.
+        Returns:
+            dict[str, np.ndarray]: "peaks" and "valleys" arrays 
+              (instruments x bars), NaN outside detected points.
+        """
+        return {
+            # Detect peaks (local maxima) in high prices
+            "peaks": _zigzag_batch(
+                block.high, *_peak_conditions(config, config.peak_prominance)
+            ),
+            # Detect valleys in low prices
+            "valleys": _zigzag_batch(
+                block.low, *_peak_conditions(config, config.valley_prominance)
+            ),
+        }
+
+
+class StreamingOrderBlocks:
+    """
+    Incremental ZigZag order block detector.
+
+    Consumes one bar at a time and emits each peak (on high 
+      prices) and valley (on low prices) once it is confirmed, 
+      instead of re-running `find_peaks` over the whole history.
+
+    Each side keeps the last bars in a ring buffer, candidate 
+      extremes waiting for the `distance` rule and kept extremes 
+      waiting for their prominence and width. A candidate is 
+      decided once no later bar can fall within `distance` of 
+      it. A kept extreme is confirmed as soon as its prominence 
+      and width meet their lower bounds: both can only grow as 
+      the right-hand scan goes on, so an early confirmation is 
+      final. Otherwise it waits until a higher bar or the end of 
+      the prominence window closes the scan.
+
+    Replaying a history bar by bar and calling `flush` yields 
+      exactly the points of `OrderBlockDetector.zigzag_indicator`
+      when `config.wlen` is set; without `wlen` the prominence 
+      window is bounded to `lookback` bars on each side, i.e. 
+      the batch result with `wlen=2 * lookback + 1`.
+    """
+
+    def __init__(
+        self, 
+        config: OrderBlockDetectorDM, 
+        lookback: int = 500
+    ) -> None:
+        """
+        Args:
+            config (OrderBlockDetectorDM): Configuration 
+              settings for peak detection.
+            lookback (int): Bars kept on each side of a pending 
+              extreme; bounds memory and per-bar work.
+        Raises:
+            ValueError: If `config.wlen` does not fit in `lookback`.
+        """
+        self._peaks = _PeakStream(
+            _peak_conditions(config, config.peak_prominance), lookback
+        )
+        self._valleys = _PeakStream(
+            _peak_conditions(config, config.valley_prominance), lookback
+        )
+        self._bars = 0
+
+    @property
+    def bars_seen(self) -> int:
+        return self._bars
+
+    def backfill(self, data: PriceDataFrame) -> list[OrderBlockDM]:
+        """
+        Feeds a price history bar by bar.
+        Args:
+            data (PriceDataFrame): Market price dataset 
+              containing high and low prices.
+        Returns:
+            list[OrderBlockDM]: Order blocks confirmed on the way.
+        """
+        events = []
+        for high, low in zip(data.high_prices, data.low_prices):
+            events.extend(self.update(float(high), float(low)))
+        return events
+
+    def update(self, high: float, low: float) -> list[OrderBlockDM]:
+        """
+        Adds one bar.
+        Args:
+            high (float): High price of the bar.
+            low (float): Low price of the bar.
+        Returns:
+            list[OrderBlockDM]: Order blocks confirmed by this bar.
+        """
+        bar = self._bars
+        self._bars += 1
+        return self._events(
+            self._peaks.push(high), self._valleys.push(low), bar
+        )
+
+    def flush(self) -> list[OrderBlockDM]:
+        """
+        Decides every pending extreme as if the history ended 
+          at the last bar. Call it once, at the end of a replay.
+        Returns:
+            list[OrderBlockDM]: Order blocks confirmed at the end.
+        """
+        return self._events(
+            self._peaks.flush(), self._valleys.flush(), self._bars - 1
+        )
+
+    @staticmethod
+    def _events(
+        peaks: list[tuple[int, float]], 
+        valleys: list[tuple[int, float]], 
+        bar: int
+    ) -> list[OrderBlockDM]:
+        return [
+            OrderBlockDM(kind, position, price, bar)
+            for kind, points in (("peak", peaks), ("valley", valleys))
+            for position, price in points
+        ]
+
+
+class _PeakStream:
+    """
+    `_find_peaks` over an unbounded series, one value at a time.
+    """
+
+    def __init__(self, conditions: tuple, lookback: int) -> None:
+        (
+            self._hmin, self._hmax, self._tmin, self._tmax, 
+            self._distance, self._pmin, self._pmax, self._wmin, 
+            self._wmax, wlen, self._rel_height, self._smin, self._smax
+        ) = conditions
+        if lookback < 2:
+            raise ValueError("`lookback` must be at least 2 bars")
+        self._half = wlen // 2 if wlen >= 2 else lookback
+        if self._half > lookback:
+            raise ValueError(
+                f"`wlen` {wlen} does not fit in a lookback of {lookback} bars"
+            )
+        self._lookback = lookback
+        self._use_prominence = not (
+            np.isnan(self._pmin) and np.isnan(self._pmax)
+        )
+        self._use_width = not (np.isnan(self._wmin) and np.isnan(self._wmax))
+        # Prominence and width only grow while the right scan goes on
+        self._monotone = np.isnan(self._pmax) and (
+            not self._use_width 
+            or (np.isnan(self._wmax) and self._rel_height <= 1)
+        )
+        self._capacity = 2 * lookback + 2 * max(self._distance, 1) + 4
+        self._x = np.empty(self._capacity)
+        self._n = 0
+        # Left edge of the plateau being climbed, -1 when none
+        self._rise = -1
+        # [position, status]: candidates under the distance rule
+        self._pending: list[list] = []
+        # [position, left_min, left_base, right_min, right_base, closed]
+        self._open: list[list] = []
+
+    def _at(self, q: int) -> float:
+        return self._x[q % self._capacity]
+
+    def push(self, value: float) -> list[tuple[int, float]]:
+        i = self._n
+        self._x[i % self._capacity] = value
+        self._n += 1
+        # Local maxima, plateaus resolved to their middle
+        if self._rise >= 0:
+            top = self._at(self._rise)
+            if value < top:
+                self._candidate(self._rise, i - 1)
+                self._rise = -1
+            elif value > top:
+                self._rise = i
+            elif value != top:
+                self._rise = -1
+        elif i > 0 and self._at(i - 1) < value:
+            self._rise = i
+        # Extend the right scans of the kept extremes by this bar
+        changed = []
+        for peak in self._open:
+            if self._extend(peak, i):
+                changed.append(peak)
+        horizon = self._rise if self._rise >= 0 else i + 1
+        for p in self._resolve(horizon, force=False):
+            changed.append(self._keep(p))
+        return self._confirm(changed, final=False)
+
+    def flush(self) -> list[tuple[int, float]]:
+        for p in self._resolve(self._n, force=True):
+            self._keep(p)
+        for peak in self._open:
+            peak[5] = True
+        return self._confirm(list(self._open), final=True)
+
+    def _candidate(self, left_edge: int, right_edge: int) -> None:
+        """
+        Applies the plateau size, height and threshold 
+          conditions to a local maximum.
+        """
+        if not _within(
+            right_edge - left_edge + 1.0, self._smin, self._smax
+        ):
+            return
+        p = (left_edge + right_edge) // 2
+        top = self._at(p)
+        if not _within(top, self._hmin, self._hmax):
+            return
+        if not (np.isnan(self._tmin) and np.isnan(self._tmax)):
+            left_step = top - self._at(p - 1)
+            right_step = top - self._at(p + 1)
+            if not np.isnan(self._tmin) and not (
+                self._tmin <= min(left_step, right_step)
+            ):
+                return
+            if not np.isnan(self._tmax) and not (
+                max(left_step, right_step) <= self._tmax
+            ):
+                return
+        self._pending.append([p, None])
+
+    def _resolve(self, horizon: int, force: bool) -> list[int]:
+        """
+        Decides the candidates the `distance` rule can settle: 
+          a candidate is dropped by a kept, higher (or equally 
+          high and later) candidate closer than `distance`.
+        Args:
+            horizon (int): Lowest position a future candidate 
+              can take.
+            force (bool): Ignore future candidates.
+        Returns:
+            list[int]: Positions of the newly kept candidates.
+        """
+        distance = self._distance
+        pending = self._pending
+        kept = []
+        progress = True
+        while progress:
+            progress = False
+            for j, (p, status) in enumerate(pending):
+                if status is not None:
+                    continue
+                if (
+                    not force 
+                    and horizon - p < distance 
+                    and self._n - 1 - p < self._lookback
+                ):
+                    continue
+                priority = (self._at(p), p)
+                verdict = True
+                for k in range(j - 1, -1, -1):
+                    if p - pending[k][0] >= distance:
+                        break
+                    verdict = self._against(pending[k], priority, verdict)
+                for k in range(j + 1, len(pending)):
+                    if pending[k][0] - p >= distance:
+                        break
+                    verdict = self._against(pending[k], priority, verdict)
+                if verdict is None:
+                    continue
+                pending[j][1] = verdict
+                progress = True
+                if verdict:
+                    kept.append(p)
+        # Decided candidates no open one can reach any more
+        undecided = [p for p, status in pending if status is None]
+        edge = (undecided[0] if undecided else horizon) - distance
+        while pending and pending[0][1] is not None and pending[0][0] <= edge:
+            pending.pop(0)
+        return sorted(kept)
+
+    def _against(
+        self, 
+        other: list, 
+        priority: tuple[float, int], 
+        verdict: bool | None
+    ) -> bool | None:
+        """
+        Folds one neighbour into a candidate's verdict.
+        """
+        if verdict is False or (self._at(other[0]), other[0]) < priority:
+            return verdict
+        if other[1] is None:
+            return None
+        return False if other[1] else verdict
+
+    def _keep(self, p: int) -> list:
+        """
+        Starts the prominence scans of a kept extreme.
+        """
+        top = self._at(p)
+        left_base = p
+        left_min = top
+        q = p
+        lo = max(p - self._half, 0)
+        while lo <= q and self._at(q) <= top:
+            if self._at(q) < left_min:
+                left_min = self._at(q)
+                left_base = q
+            q -= 1
+        peak = [p, left_min, left_base, top, p, False]
+        for q in range(p, self._n):
+            self._extend(peak, q)
+            if peak[5]:
+                break
+        self._open.append(peak)
+        return peak
+
+    def _extend(self, peak: list, q: int) -> bool:
+        """
+        Extends the right prominence scan of `peak` to bar `q`.
+        Returns:
+            bool: Whether the scan changed.
+        """
+        p = peak[0]
+        if peak[5] or q < p:
+            return False
+        value = self._at(q)
+        if value > self._at(p):
+            peak[5] = True
+            return True
+        if value < peak[3]:
+            peak[3] = value
+            peak[4] = q
+        if q >= p + self._half:
+            peak[5] = True
+        return True
+
+    def _confirm(
+        self, 
+        peaks: list[list], 
+        final: bool
+    ) -> list[tuple[int, float]]:
+        """
+        Applies the prominence and width conditions to the 
+          kept extremes whose scans changed.
+        Returns:
+            list[tuple[int, float]]: Confirmed positions and values.
+        """
+        confirmed = []
+        for peak in peaks:
+            if peak not in self._open:
+                continue
+            verdict = self._verdict(peak, final or peak[5])
+            if verdict is None:
+                continue
+            self._open.remove(peak)
+            if verdict:
+                confirmed.append((peak[0], float(self._at(peak[0]))))
+        return sorted(confirmed)
+
+    def _verdict(self, peak: list, closed: bool) -> bool | None:
+        p, left_min, left_base, right_min, right_base, _ = peak
+        top = self._at(p)
+        prominence = top - max(left_min, right_min)
+        if self._use_prominence and not _within(
+            prominence, self._pmin, self._pmax
+        ):
+            return False if closed else None
+        if self._use_width:
+            # Width at `rel_height` of the prominence
+            height = top - prominence * self._rel_height
+            q = p
+            while left_base < q and height < self._at(q):
+                q -= 1
+            left_ip = float(q)
+            if self._at(q) < height:
+                left_ip += (height - self._at(q)) / (
+                    self._at(q + 1) - self._at(q)
+                )
+            q = p
+            while q < right_base and height < self._at(q):
+                q += 1
+            right_ip = float(q)
+            if self._at(q) < height:
+                right_ip -= (height - self._at(q)) / (
+                    self._at(q - 1) - self._at(q)
+                )
+            if not _within(right_ip - left_ip, self._wmin, self._wmax):
+                return False if closed else None
+        if closed or self._monotone:
+            return True
+        return None
+
+
+def _peak_conditions(
+    config: OrderBlockDetectorDM, 
+    prominence: Any
+) -> tuple:
+    """
+    `_find_peaks` arguments (after `x`) for a config and 
+      the prominence of one side.
+    """
+    return (
+        *_condition_bounds(config.height),
+        *_condition_bounds(config.threshold),
+        _distance(config.distance),
+        *_condition_bounds(prominence),
+        *_condition_bounds(config.width),
+        _wlen(config.wlen),
+        float(config.rel_height),
+        *_condition_bounds(config.plateu_size),
+    )
+
+
+def _condition_bounds(value: Any) -> tuple[float, float]:
+    """
+    Converts a `find_peaks` condition (None, a number or a 
+      `(min, max)` pair) into bounds, NaN meaning "no bound".
+    """
+    if value is None:
+        return np.nan, np.nan
+    if isinstance(value, tuple):
+        low, high = value
+        return (
+            np.nan if low is None else float(low),
+            np.nan if high is None else float(high),
+        )
+    if np.ndim(value) != 0:
+        raise ValueError("Per-sample find_peaks conditions are not supported")
+    return float(value), np.nan
+
+
+def _distance(value: float | None) -> int:
+    if value is None:
+        return 0
+    if value < 1:
+        raise ValueError("`distance` must be greater or equal to 1")
+    return math.ceil(value)
+
+
+def _wlen(value: float | None) -> int:
+    if value is None:
+        return -1
+    if value <= 1:
+        raise ValueError(f"`wlen` must be larger than 1, was {value}")
+    return math.ceil(value)
+
+
+@kernel((f8, f8, f8))
+def _within(value: float, low: float, high: float) -> bool:
+    """Checks `value` against bounds, NaN bounds being open."""
+    return (np.isnan(low) or low <= value) and (
+        np.isnan(high) or value <= high
+    )
+
+
+@kernel((P, f8, f8, f8, f8, i8, f8, f8, f8, f8, i8, f8, f8, f8))
+def _find_peaks(
+    x: NDArray,
+    hmin: float,
+    hmax: float,
+    tmin: float,
+    tmax: float,
+    distance: int,
+    pmin: float,
+    pmax: float,
+    wmin: float,
+    wmax: float,
+    wlen: int,
+    rel_height: float,
+    smin: float,
+    smax: float
+) -> NDArray:
+    """
+    Port of `scipy.signal.find_peaks` for scalar conditions.
+    The conditions are applied in the same order as SciPy: 
+      plateau size, height, threshold, distance, prominence, 
+      width. Of two equally high peaks closer than `distance` 
+      the later one is kept, where SciPy's unstable sort may 
+      keep either.
+    Returns:
+        np.ndarray: Indices of the detected peaks.
+    """
+    n = x.shape[0]
+    peaks = np.empty(n // 2 + 1, dtype=np.int64)
+    left_edges = np.empty(n // 2 + 1, dtype=np.int64)
+    right_edges = np.empty(n // 2 + 1, dtype=np.int64)
+    # Local maxima, plateaus resolved to their middle
+    m = 0
+    i = 1
+    i_max = n - 1
+    while i < i_max:
+        if x[i - 1] < x[i]:
+            i_ahead = i + 1
+            while i_ahead < i_max and x[i_ahead] == x[i]:
+                i_ahead += 1
+            if x[i_ahead] < x[i]:
+                left_edges[m] = i
+                right_edges[m] = i_ahead - 1
+                peaks[m] = (i + i_ahead - 1) // 2
+                m += 1
+                i = i_ahead
+        i += 1
+    # Plateau size, height and threshold conditions
+    k = 0
+    for j in range(m):
+        p = peaks[j]
+        if not _within(right_edges[j] - left_edges[j] + 1.0, smin, smax):
+            continue
+        if not _within(x[p], hmin, hmax):
+            continue
+        if not (np.isnan(tmin) and np.isnan(tmax)):
+            left_step = x[p] - x[p - 1]
+            right_step = x[p] - x[p + 1]
+            if not np.isnan(tmin) and not tmin <= min(left_step, right_step):
+                continue
+            if not np.isnan(tmax) and not max(left_step, right_step) <= tmax:
+                continue
+        peaks[k] = p
+        k += 1
+    m = k
+    # Distance: drop lower peaks next to higher ones
+    if distance > 0 and m > 1:
+        keep = np.ones(m, dtype=np.bool_)
+        priority = np.empty(m)
+        for j in range(m):
+            priority[j] = x[peaks[j]]
+        order = np.argsort(priority, kind="mergesort")
+        for r in range(m - 1, -1, -1):
+            j = order[r]
+            if not keep[j]:
+                continue
+            q = j - 1
+            while 0 <= q and peaks[j] - peaks[q] < distance:
+                keep[q] = False
+                q -= 1
+            q = j + 1
+            while q < m and peaks[q] - peaks[j] < distance:
+                keep[q] = False
+                q += 1
+        k = 0
+        for j in range(m):
+            if keep[j]:
+                peaks[k] = peaks[j]
+                k += 1
+        m = k
+    use_prominence = not (np.isnan(pmin) and np.isnan(pmax))
+    use_width = not (np.isnan(wmin) and np.isnan(wmax))
+    if not (use_prominence or use_width):
+        return peaks[:m].copy()
+    # Prominences and bases of the remaining peaks
+    prominences = np.empty(m)
+    left_bases = np.empty(m, dtype=np.int64)
+    right_bases = np.empty(m, dtype=np.int64)
+    k = 0
+    for j in range(m):
+        p = peaks[j]
+        lo = 0
+        hi = n - 1
+        if wlen >= 2:
+            lo = max(p - wlen // 2, lo)
+            hi = min(p + wlen // 2, hi)
+        left_base = p
+        left_min = x[p]
+        q = p
+        while lo <= q and x[q] <= x[p]:
+            if x[q] < left_min:
+                left_min = x[q]
+                left_base = q
+            q -= 1
+        right_base = p
+        right_min = x[p]
+        q = p
+        while q <= hi and x[q] <= x[p]:
+            if x[q] < right_min:
+                right_min = x[q]
+                right_base = q
+            q += 1
+        prominence = x[p] - max(left_min, right_min)
+        if use_prominence and not _within(prominence, pmin, pmax):
+            continue
+        peaks[k] = p
+        prominences[k] = prominence
+        left_bases[k] = left_base
+        right_bases[k] = right_base
+        k += 1
+    m = k
+    if not use_width:
+        return peaks[:m].copy()
+    # Widths at `rel_height` of the prominence
+    k = 0
+    for j in range(m):
+        p = peaks[j]
+        height = x[p] - prominences[j] * rel_height
+        q = p
+        while left_bases[j] < q and height < x[q]:
+            q -= 1
+        left_ip = float(q)
+        if x[q] < height:
+            left_ip += (height - x[q]) / (x[q + 1] - x[q])
+        q = p
+        while q < right_bases[j] and height < x[q]:
+            q += 1
+        right_ip = float(q)
+        if x[q] < height:
+            right_ip -= (height - x[q]) / (x[q - 1] - x[q])
+        if not _within(right_ip - left_ip, wmin, wmax):
+            continue
+        peaks[k] = p
+        k += 1
+    return peaks[:k].copy()
+
+
+@kernel((P_2D, f8, f8, f8, f8, i8, f8, f8, f8, f8, i8, f8, f8, f8), parallel=True)
+def _zigzag_batch(
+    x: NDArray,
+    hmin: float,
+    hmax: float,
+    tmin: float,
+    tmax: float,
+    distance: int,
+    pmin: float,
+    pmax: float,
+    wmin: float,
+    wmax: float,
+    wlen: int,
+    rel_height: float,
+    smin: float,
+    smax: float
+) -> NDArray:
+    """
+    Runs `_find_peaks` for every instrument of a block in parallel
+      and marks the detected points, NaN elsewhere.
+    """
+    out = np.full_like(x, np.nan)
+    for r in prange(x.shape[0]):
+        peaks = _find_peaks(
+            x[r], hmin, hmax, tmin, tmax, distance, pmin, pmax,
+            wmin, wmax, wlen, rel_height, smin, smax
+        )
+        for p in peaks:
+            out[r, p] = x[r, p]
+    return out
@@ -0,0 +1,205 @@
+"""
+Indicator evaluation in worker processes over shared candles.
+
+Sending candles to another process means pickling them, which
+costs more than evaluating the indicators on them. `IndicatorPool`
+keeps the candles of every instrument in a `SharedCandles` ring
+buffer instead: workers attach to the buffers once and evaluate
+the indicators on views of the shared columns. Only the buffer
+name, the configs and the int8 signal codes cross the process
+boundary.
+
+Workers are spawned, not forked: a fork of a process whose numba
+thread pool is running can deadlock. Each worker runs its kernels
+on one thread, so throughput scales with the number of workers up
+to the number of cores.
+"""
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Mapping, Sequence
+
+import numpy as np
+from numpy.typing import DTypeLike, NDArray
+
+from strategies.src.infrastructure._types import PriceDataFrame
+from strategies.src.infrastructure.indicators.signals import (
+    IndicatorSignals,
+    SignalConfig,
+)
+from strategies.src.infrastructure.shared import SharedCandles
+
+# Buffers attached by this worker process, by name
+_ATTACHED: dict[str, SharedCandles] = {}
+
+
+class IndicatorPool:
+    """
+    Last signals of many instruments from a pool of processes.
+
+    The owner writes candles with `append` / `update` and asks for
+    signals with `submit` or `last_signals`. A worker reads the
+    newest `IndicatorSignals.lookback(configs)` bars of the
+    instrument, so the owner may append up to `capacity - lookback`
+    bars while an evaluation runs (see `SharedCandles`).
+
+    Example:
+        with IndicatorPool(workers=8) as pool:
+            pool.append("BTC-USDT", candles)
+            codes = pool.last_signals({"BTC-USDT": configs})
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        capacity: int = 5_000,
+        dtype: DTypeLike = np.float64
+    ) -> None:
+        """
+        Args:
+            workers (int | None): Worker processes, one per core
+              when omitted.
+            capacity (int): Candles kept per instrument.
+            dtype (DTypeLike): Price dtype, float64 or float32.
+        """
+        self._capacity = capacity
+        self._dtype = dtype
+        self._buffers: dict[str, SharedCandles] = {}
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    def __enter__(self) -> "IndicatorPool":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def instruments(self) -> tuple[str, ...]:
+        return tuple(self._buffers)
+
+    def append(self, inst_id: str, data: PriceDataFrame) -> None:
+        """
+        Writes a block of candles of an instrument, creating
+          its buffer on first use.
+        Args:
+            inst_id (str): Instrument id.
+            data (PriceDataFrame): Candles in chronological order.
+        """
+        self._buffer(inst_id).append(data)
+
+    def update(
+        self,
+        inst_id: str,
+        date: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: int,
+        turnover: float
+    ) -> None:
+        """
+        Writes one closed candle of an instrument.
+        Args:
+            inst_id (str): Instrument id.
+            date (int): Open time, epoch microseconds.
+        """
+        self._buffer(inst_id).update(
+            date, open_, high, low, close, volume, turnover
+        )
+
+    def submit(
+        self,
+        inst_id: str,
+        configs: Sequence[SignalConfig]
+    ) -> Future:
+        """
+        Schedules the last signals of one instrument.
+        Args:
+            inst_id (str): Instrument with candles in the pool.
+            configs (Sequence[SignalConfig]): Indicator
+              configurations.
+        Returns:
+            Future: Resolves to the int8 codes of
+              `IndicatorSignals.last`, one per config.
+        Raises:
+            KeyError: If the instrument has no candles.
+            ValueError: If the configs need more bars than a
+              buffer keeps.
+            TypeError: If a configuration belongs to an
+              indicator without signals.
+        """
+        buffer = self._buffers[inst_id]
+        lookback = IndicatorSignals().lookback(configs)
+        if lookback > self._capacity:
+            raise ValueError(
+                f"Configs need {lookback} bars, buffers keep "
+                f"{self._capacity}"
+            )
+        return self._executor.submit(
+            _last_signals, buffer.name, lookback, tuple(configs)
+        )
+
+    def last_signals(
+        self,
+        requests: Mapping[str, Sequence[SignalConfig]]
+    ) -> dict[str, NDArray]:
+        """
+        Last signals of several instruments, evaluated in
+          parallel.
+        Args:
+            requests (Mapping[str, Sequence[SignalConfig]]):
+              Configs by instrument id.
+        Returns:
+            dict[str, np.ndarray]: int8 codes by instrument id.
+        Raises:
+            KeyError: If an instrument has no candles.
+        """
+        futures = {
+            inst_id: self.submit(inst_id, configs)
+            for inst_id, configs in requests.items()
+        }
+        return {
+            inst_id: future.result()
+            for inst_id, future in futures.items()
+        }
+
+    def close(self) -> None:
+        """
+        Stops the workers and frees the shared buffers.
+        """
+        self._executor.shutdown()
+        for buffer in self._buffers.values():
+            buffer.close()
+            buffer.unlink()
+        self._buffers.clear()
+
+    def _buffer(self, inst_id: str) -> SharedCandles:
+        buffer = self._buffers.get(inst_id)
+        if buffer is None:
+            buffer = SharedCandles.create(self._capacity, self._dtype)
+            self._buffers[inst_id] = buffer
+        return buffer
+
+
+def _init_worker() -> None:
+    # Parallelism comes from the processes, one kernel thread each
+    os.environ["NUMBA_NUM_THREADS"] = "1"
+
+
+def _last_signals(
+    name: str,
+    lookback: int,
+    configs: tuple[SignalConfig, ...]
+) -> NDArray:
+    """
+    Worker side of `IndicatorPool.submit`.
+    """
+    buffer = _ATTACHED.get(name)
+    if buffer is None:
+        buffer = _ATTACHED[name] = SharedCandles.attach(name)
+    return IndicatorSignals().last(buffer.frame(lookback), configs)
@@ -0,0 +1,155 @@
+"""
+pandas-ta / TA-Lib backend of the compiled indicators.
+
+The indicator classes compute on numba kernels. Configurations
+with `backend="pandas_ta"` route the single-frame methods
+through the library calls those kernels replaced instead, so
+both paths can be benchmarked against each other and checked by
+`strategies.benchmarks.parity`. Results keep the names and
+shape of the compiled batch methods.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+from strategies.src.domain.entities import (
+    AcceletrationBandsDM,
+    AdxConfigDM,
+    AvslConfigDM,
+)
+from strategies.src.infrastructure._lazy import lazy_import
+from strategies.src.infrastructure._types import PriceDataFrame
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pandas_ta as ta
+else:
+    pd = lazy_import("pandas")
+    ta = lazy_import("pandas_ta")
+
+# Compiled kernels first: the default of every configuration
+BACKENDS = ("numba", "pandas_ta")
+
+
+def is_reference(backend: str) -> bool:
+    """
+    Whether a configuration asks for the pandas-ta backend.
+    Raises:
+        ValueError: If `backend` is not one of `BACKENDS`.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown indicator backend '{backend}', "
+            f"expected one of {BACKENDS}"
+        )
+    return backend == "pandas_ta"
+
+
+def accbands(
+    data: PriceDataFrame,
+    config: AcceletrationBandsDM
+) -> dict[str, NDArray]:
+    """
+    Acceleration Bands by `pandas_ta.accbands`.
+    Returns:
+        dict[str, np.ndarray]: Lower, middle and upper bands
+          (1 x bars).
+    Raises:
+        ValueError: If there are fewer bars than `length`.
+    """
+    bands = ta.accbands(
+        high=_series(data.high_prices),
+        low=_series(data.low_prices),
+        close=_series(data.close_prices),
+        length=config.length,
+        drift=config.drift,
+        mamode=config.mamode,
+        offset=config.offset,
+    )
+    if bands is None:
+        raise ValueError("No data in DataFrame")
+    return {
+        "ACCbands_lower": _column(bands, "ACCBL_"),
+        "ACCbands_mid": _column(bands, "ACCBM_"),
+        "ACCbands_upper": _column(bands, "ACCBU_"),
+    }
+
+
+def adx(data: PriceDataFrame, config: AdxConfigDM) -> dict[str, NDArray]:
+    """
+    ADX, DMP and DMN by `pandas_ta.adx`.
+    Returns:
+        dict[str, np.ndarray]: "adx", "dmp" and "dmn" (1 x bars).
+    Raises:
+        ValueError: If there are fewer bars than `length`.
+    """
+    adx_ind = ta.adx(
+        high=_series(data.high_prices),
+        low=_series(data.low_prices),
+        close=_series(data.close_prices),
+        length=config.length,
+        lensig=config.lensig,
+        scalar=config.scalar,
+        mamode=config.mamode,
+        drift=config.drift,
+        offset=config.offset,
+    )
+    if adx_ind is None:
+        raise ValueError(
+            f"Error: ADX needs at least {config.length or 14} bars, "
+            f"got {len(data)}."
+        )
+    return {
+        "adx": _column(adx_ind, "ADX_"),
+        "dmp": _column(adx_ind, "DMP_"),
+        "dmn": _column(adx_ind, "DMN_"),
+    }
+
+
+def avsl_components(
+    data: PriceDataFrame,
+    config: AvslConfigDM
+) -> tuple[NDArray, NDArray, NDArray, NDArray]:
+    """
+    VPC, VPR, VM and VPCI of AVSL from `pandas_ta.vwma` and
+      the TA-Lib SMA.
+    Returns:
+        tuple[np.ndarray, ...]: VPC, VPR, VM, VPCI.
+    """
+    close = _series(data.close_prices)
+    volume = _series(data.volumes)
+    vw_ma_fast = ta.vwma(close=close, volume=volume, length=config.length_fast)
+    vw_ma_slow = ta.vwma(close=close, volume=volume, length=config.length_slow)
+    vpc = vw_ma_slow - ta.sma(close, length=config.length_slow, talib=True)
+    vpr = vw_ma_fast / ta.sma(close, length=config.length_fast, talib=True)
+    vm = ta.sma(
+        volume, length=config.length_fast, talib=True
+    ) / ta.sma(volume, length=config.length_slow, talib=True)
+    vpci = vpc * vpr * vm
+    return tuple(s.to_numpy(dtype=np.float64) for s in (vpc, vpr, vm, vpci))
+
+
+def sma(values: NDArray, length: int) -> NDArray:
+    """
+    TA-Lib SMA through `pandas_ta.sma`.
+    """
+    return ta.sma(
+        _series(values), length=length, talib=True
+    ).to_numpy(dtype=np.float64)
+
+
+def _series(values: NDArray) -> pd.Series:
+    # TA-Lib only accepts float64 input
+    return pd.Series(np.asarray(values, dtype=np.float64))
+
+
+def _column(frame: pd.DataFrame, prefix: str) -> NDArray:
+    """
+    The column of a pandas-ta result whose name starts with
+      `prefix` (names carry the resolved periods), as 1 x bars.
+    """
+    name = next(c for c in frame.columns if c.startswith(prefix))
+    return frame[name].to_numpy(dtype=np.float64)[None]
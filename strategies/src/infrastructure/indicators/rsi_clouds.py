@@ -1,9 +1,46 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING
+
 import numpy as np
-import pandas as pd
-import pandas_ta as ta
+from numpy.typing import NDArray
 
 from strategies.src.domain.entities import RsiCloudsConfigDM
-from strategies.src.infrastructure._types import PriceDataFrame
+from strategies.src.infrastructure._lazy import lazy_import
+from strategies.src.infrastructure._types import OhlcvBlock, PriceDataFrame
+from strategies.src.infrastructure.indicators._kernels import (
+    MA_EMA,
+    MA_RMA,
+    _rsi_value,
+    cross_signals,
+    ma_lookback,
+    ma_state,
+    ma_step,
+    macd_ema,
+    macd_talib,
+    rsi_rma,
+    rsi_talib,
+    settle_bars,
+    shift_rows,
+    zero_cross_signals,
+)
+from strategies.src.infrastructure.indicators.graph import IndicatorGraph
+from strategies.src.infrastructure.indicators.jit import (
+    F8,
+    P_2D,
+    P,
+    b1,
+    f8,
+    i8,
+    kernel,
+    prange,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
 
 
 class RsiClouds:
@@ -36,17 +73,21 @@ class RsiClouds:
               average price.
         """
         # Computes the mean price from open, high, low, and close.
-        return (
-            data.low_prices + 
-            data.high_prices + 
-            data.open_price + 
-            data.close_prices
-        ) / 4  
+        return pd.Series(
+            (
+                data.low_prices + 
+                data.high_prices + 
+                data.open_price + 
+                data.close_prices
+            ) / 4,
+            index=data.index
+        )
 
     def calculate_rsi_clouds(
         self, 
         data: PriceDataFrame, 
-        config: RsiCloudsConfigDM
+        config: RsiCloudsConfigDM,
+        graph: IndicatorGraph | None = None
     ) -> pd.DataFrame:
         """
         Computes RSI and MACD based on the average price.
@@ -54,43 +95,100 @@ class RsiClouds:
             data (PriceDataFrame): Market price dataset.
             config (RsiCloudsConfigDM): RSI Clouds 
               configuration settings.
+            graph (IndicatorGraph | None): Shared evaluation graph 
+              of `data`; when given, primitive series are taken 
+              from (and cached in) it.
         Returns:
             pd.DataFrame: A DataFrame containing 
               RSI values and MACD indicators.
         """
-        # Prepare average price data
-        ohlc = pd.DataFrame(
-            data={"avg": self.prepare_data(data)}, 
+        clouds = self._rsi_clouds(data, config, graph)
+        return pd.DataFrame(
+            {name: values[0] for name, values in clouds.items()}, 
             index=data.date
         )
-        # Compute RSI based on average price
-        ohlc['rsi'] = ta.rsi(
-            close=ohlc["avg"], 
-            length=config.rsi_length, 
-            scalar=config.scalar,
-            drift=config.drift,
-            offset=config.offset, 
-            talib=config.talib
-        )
-        # Compute MACD based on RSI values
-        macd_ind = ta.macd(
-            close=ohlc['rsi'],
-            fast=config.macd_fast, 
-            slow=config.macd_slow, 
-            signal=config.macd_signal,
-            talib=config.talib, 
-            offset=config.offset
-        )
-        # Rename MACD components for clarity
-        suffixes = {"": "macd_line", "s": "macd_signal", "h": "histogram"}
-        ohlc = ohlc.join(macd_ind.rename(columns={
-            f"MACD{suffix}_{config.macd_fast}_"
-            f"{config.macd_slow}_{config.macd_signal}": name
-            for suffix, name in suffixes.items()
-        }))
-        # Free up memory
-        del macd_ind  
-        return ohlc
+
+    def calculate_rsi_clouds_batch(
+        self, 
+        block: OhlcvBlock, 
+        config: RsiCloudsConfigDM
+    ) -> dict[str, NDArray]:
+        """
+        Computes RSI and MACD of the average price for a whole 
+          universe of bar-aligned instruments in parallel.
+        Args:
+            block (OhlcvBlock): Price columns (instruments x bars).
+            config (RsiCloudsConfigDM): RSI Clouds 
+              configuration settings.
+        Returns:
+            dict[str, np.ndarray]: "avg", "rsi", "macd_line", 
+              "macd_signal" and "histogram" arrays 
+              (instruments x bars).
+        """
+        avg, rsi, macd_line, macd_signal, histogram = _rsi_clouds_batch(
+            block.open,
+            block.high,
+            block.low,
+            block.close,
+            *_resolve(config),
+            config.talib,
+            # pandas-ta shifts the RSI before feeding it to the MACD
+            config.offset or 0,
+        )
+        return {
+            "avg": avg,
+            "rsi": rsi,
+            "macd_line": shift_rows(macd_line, config.offset),
+            "macd_signal": shift_rows(macd_signal, config.offset),
+            "histogram": shift_rows(histogram, config.offset),
+        }
+
+    def _rsi_clouds(
+        self, 
+        data: PriceDataFrame, 
+        config: RsiCloudsConfigDM,
+        graph: IndicatorGraph | None
+    ) -> dict[str, NDArray]:
+        """
+        RSI Clouds of one instrument (1 x bars) from the graph 
+          or a single-instrument block.
+        """
+        if graph is not None:
+            return self._rsi_clouds_from_graph(graph, config)
+        # Compute RSI and MACD on a single-instrument block
+        return self.calculate_rsi_clouds_batch(
+            OhlcvBlock.from_frames([data]), config
+        )
+
+    def _rsi_clouds_from_graph(
+        self, 
+        graph: IndicatorGraph, 
+        config: RsiCloudsConfigDM
+    ) -> dict[str, NDArray]:
+        """
+        RSI Clouds from the shared average price and RSI 
+          nodes of an evaluation graph.
+        """
+        rsi_length, macd_fast, macd_slow, macd_signal, scalar, drift = (
+            _resolve(config)
+        )
+        avg = ("ohlc4", None)
+        if config.talib:
+            raw_rsi = graph.rsi(avg, rsi_length)
+        else:
+            raw_rsi = graph.get(("rsi_rma", avg, rsi_length, scalar, drift))
+        # pandas-ta shifts the RSI before feeding it to the MACD
+        rsi = shift_rows(raw_rsi[None], config.offset)
+        macd_line, signal_line, histogram = _clouds_macd(
+            rsi[0], macd_fast, macd_slow, macd_signal, config.talib
+        )
+        return {
+            "avg": graph.get(avg)[None],
+            "rsi": rsi,
+            "macd_line": shift_rows(macd_line[None], config.offset),
+            "macd_signal": shift_rows(signal_line[None], config.offset),
+            "histogram": shift_rows(histogram[None], config.offset),
+        }
 
     def create_signals(self, ohlc: pd.DataFrame) -> pd.DataFrame:
         """
@@ -106,39 +204,42 @@ class RsiClouds:
             pd.DataFrame: A DataFrame 
               with trading signals.
         """
-        # Extract previous MACD values for crossover detection
-        prev_macd_line = ohlc['macd_line'].shift(1)
-        prev_macd_signal = ohlc['macd_signal'].shift(1)
-        # Identify MACD signal line crossovers
-        ohlc['macd_cross_signal'] = np.select(
-            [
-                (
-                    prev_macd_line < prev_macd_signal
-                ) & (
-                    ohlc['macd_line'] > ohlc['macd_signal']
-                ),
-                (
-                    prev_macd_line > prev_macd_signal
-                ) & (
-                    ohlc['macd_line'] < ohlc['macd_signal']
-                ),
-            ],
-            # 1 → Buy, -1 → Sell
-            [1, -1],  
-            default=0
-        )
-        # Identify histogram crossing zero
-        ohlc['histogram_cross_zero'] = np.select(
-            [
-                (ohlc['histogram'].shift(1) < 0) & (ohlc['histogram'] > 0),
-                (ohlc['histogram'].shift(1) > 0) & (ohlc['histogram'] < 0),
-            ],
-            # 1 → Uptrend confirmation, -1 → Downtrend confirmation
-            [1, -1],  
-            default=0
+        # Identify MACD signal line crossovers: 1 → Buy, -1 → Sell
+        ohlc['macd_cross_signal'] = cross_signals(
+            np.ascontiguousarray(ohlc['macd_line'].to_numpy()),
+            np.ascontiguousarray(ohlc['macd_signal'].to_numpy()),
+        )
+        # Identify histogram crossing zero:
+        # 1 → Uptrend confirmation, -1 → Downtrend confirmation
+        ohlc['histogram_cross_zero'] = zero_cross_signals(
+            np.ascontiguousarray(ohlc['histogram'].to_numpy())
         )
         return ohlc
 
+    def signals(
+        self, 
+        data: PriceDataFrame, 
+        config: RsiCloudsConfigDM,
+        graph: IndicatorGraph | None = None
+    ) -> NDArray:
+        """
+        MACD crossover code of every bar, without building 
+          DataFrames.
+        Args:
+            data (PriceDataFrame): Market price dataset.
+            config (RsiCloudsConfigDM): RSI Clouds 
+              configuration settings.
+            graph (IndicatorGraph | None): Shared evaluation graph 
+              of `data`; when given, primitive series are taken 
+              from (and cached in) it.
+        Returns:
+            np.ndarray: int8 `LONG` (buy), `SHORT` (sell) or 
+              `FLAT` per bar, the `macd_cross_signal` column of 
+              `create_signals`.
+        """
+        clouds = self._rsi_clouds(data, config, graph)
+        return cross_signals(clouds["macd_line"][0], clouds["macd_signal"][0])
+
     def get_last_signal(self, ohlc: pd.DataFrame) -> str | None:
         """
         Retrieves the last MACD crossover signal.
@@ -159,3 +260,478 @@ class RsiClouds:
             return "sell"
         else:
             return None
+
+    def lookback(self, config: RsiCloudsConfigDM) -> int:
+        """
+        Bars the MACD crossover of the last bar depends on: the 
+          settled RSI, the settled slow and signal EMAs of the 
+          MACD, the previous bar of the crossover and the offset, 
+          which pandas-ta applies to the RSI and to the MACD.
+        Args:
+            config (RsiCloudsConfigDM): RSI Clouds 
+              configuration settings.
+        Returns:
+            int: Number of trailing bars.
+        """
+        rsi_length, macd_fast, macd_slow, macd_signal, _, drift = (
+            _resolve(config)
+        )
+        # TA-Lib RSI seeds on `rsi_length` changes, the RMA of
+        # pandas-ta waits for `rsi_length` changes after `drift`
+        rsi = rsi_length + (1 if config.talib else drift)
+        return (
+            rsi + settle_bars(1.0 / rsi_length)
+            + ma_lookback(MA_EMA, max(macd_fast, macd_slow))
+            + ma_lookback(MA_EMA, macd_signal) - 1
+            + 2 * max(config.offset or 0, 0)
+        )
+
+
+class StreamingRsiClouds:
+    """
+    Stateful RSI Clouds evaluated one bar at a time.
+
+    Keeps the RSI averages (TA-Lib Wilder sums or the pandas-ta 
+      RMAs) and the fast, slow and signal MACD EMAs, so every 
+      `update` costs O(1) and yields the MACD crossover and 
+      histogram zero-cross signals of the newest bar without 
+      rebuilding any series. After warm-up the values and 
+      signals equal those of `calculate_rsi_clouds` followed 
+      by `create_signals`, a positive `offset` included.
+    """
+
+    def __init__(self, config: RsiCloudsConfigDM) -> None:
+        """
+        Args:
+            config (RsiCloudsConfigDM): RSI Clouds 
+              configuration settings.
+        """
+        rsi_length, macd_fast, macd_slow, macd_signal, scalar, drift = (
+            _resolve(config)
+        )
+        if macd_slow < macd_fast:
+            macd_fast, macd_slow = macd_slow, macd_fast
+        self._params = (
+            rsi_length, macd_fast, macd_slow, macd_signal, 
+            scalar, drift, config.talib
+        )
+        self._state = (
+            # RSI: bars seen, previous average, gain and loss sums
+            np.zeros(4),
+            np.zeros(drift),
+            ma_state(rsi_length),
+            ma_state(rsi_length),
+            # MACD: values seen, previous fast EMA
+            np.zeros(2),
+            np.zeros(macd_slow),
+            ma_state(macd_fast),
+            ma_state(macd_slow),
+            ma_state(macd_signal),
+        )
+        self._offset = config.offset or 0
+        # pandas-ta shifts the RSI, and the MACD once more
+        depth = 2 * max(self._offset, 0) + 2
+        self._last = deque([(np.nan,) * 4] * depth, maxlen=depth)
+
+    @property
+    def rsi(self) -> float:
+        return self._shifted(1)[0]
+
+    @property
+    def macd_line(self) -> float:
+        return self._shifted(2)[1]
+
+    @property
+    def macd_signal(self) -> float:
+        return self._shifted(2)[2]
+
+    @property
+    def histogram(self) -> float:
+        return self._shifted(2)[3]
+
+    def backfill(self, data: PriceDataFrame) -> dict[str, NDArray]:
+        """
+        Advances the state over a block of historical bars 
+          (warm start).
+        Args:
+            data (PriceDataFrame): Market price dataset.
+        Returns:
+            dict[str, np.ndarray]: Unshifted "rsi", "macd_line",
+              "macd_signal" and "histogram" values for every bar.
+        """
+        rsi, line, signal, histogram = _clouds_kernel(
+            *(
+                np.ascontiguousarray(a, dtype=np.float64) 
+                for a in (
+                    data.open_price, data.high_prices, 
+                    data.low_prices, data.close_prices
+                )
+            ),
+            *self._params, 
+            *self._state
+        )
+        depth = self._last.maxlen
+        for values in zip(
+            rsi[-depth:], line[-depth:], signal[-depth:], histogram[-depth:]
+        ):
+            self._last.appendleft(values)
+        return {
+            "rsi": rsi, 
+            "macd_line": line, 
+            "macd_signal": signal, 
+            "histogram": histogram,
+        }
+
+    def update(
+        self, 
+        open_: float, 
+        high: float, 
+        low: float, 
+        close: float
+    ) -> tuple[int, int]:
+        """
+        Advances the state by one closed bar.
+        Args:
+            open_ (float): Open price of the new bar.
+            high (float): High price of the new bar.
+            low (float): Low price of the new bar.
+            close (float): Close price of the new bar.
+        Returns:
+            tuple[int, int]: MACD signal line crossover and 
+              histogram zero cross of the new bar 
+              (1 → up, -1 → down, 0 → none).
+        """
+        self._last.appendleft(
+            _clouds_step(
+                float(open_), float(high), float(low), float(close),
+                *self._params, 
+                *self._state
+            )
+        )
+        return self.signals()
+
+    def signals(self) -> tuple[int, int]:
+        """
+        MACD crossover and histogram zero cross of the newest bar,
+          as in the columns of `RsiClouds.create_signals`.
+        """
+        _, line, signal, histogram = self._shifted(2)
+        _, prev_line, prev_signal, prev_histogram = self._shifted(2, 1)
+        cross = 0
+        if prev_line < prev_signal and line > signal:
+            cross = 1
+        elif prev_line > prev_signal and line < signal:
+            cross = -1
+        zero_cross = 0
+        if prev_histogram < 0 and histogram > 0:
+            zero_cross = 1
+        elif prev_histogram > 0 and histogram < 0:
+            zero_cross = -1
+        return cross, zero_cross
+
+    def last_signal(self) -> str | None:
+        """
+        Retrieves the MACD crossover signal of the newest bar.
+        Returns:
+            str | None: "buy" if MACD crossed above, "sell" if 
+              MACD crossed below, or None if no signal.
+        """
+        cross, _ = self.signals()
+        if cross == 1:
+            return "buy"
+        if cross == -1:
+            return "sell"
+        return None
+
+    def _shifted(self, times: int, back: int = 0) -> tuple[float, ...]:
+        """
+        Values of the bar `times` offsets (plus `back` bars) ago.
+        """
+        if self._offset < 0:
+            return (np.nan,) * 4
+        return self._last[times * self._offset + back]
+
+
+@kernel(
+    (f8, f8, f8, f8, i8, i8, i8, i8, f8, i8, b1, F8, F8, F8, F8, F8, F8, F8, F8, F8),
+    error_model="numpy",
+)
+def _clouds_step(
+    open_: float,
+    high: float,
+    low: float,
+    close: float,
+    rsi_length: int,
+    macd_fast: int,
+    macd_slow: int,
+    macd_signal: int,
+    scalar: float,
+    drift: int,
+    talib: bool,
+    rsi_acc: NDArray,
+    rsi_ring: NDArray,
+    pos_ma: NDArray,
+    neg_ma: NDArray,
+    macd_acc: NDArray,
+    macd_ring: NDArray,
+    fast_ma: NDArray,
+    slow_ma: NDArray,
+    signal_ma: NDArray
+) -> tuple[float, float, float, float]:
+    """
+    Advances the RSI Clouds state by one bar in O(1), with the 
+      same arithmetic as `_rsi_clouds_row`.
+    Returns:
+        tuple: Unshifted RSI, MACD line, signal line and histogram.
+    """
+    # Computes the mean price from open, high, low, and close.
+    avg = (low + high + open_ + close) / 4
+    if talib:
+        rsi = _rsi_talib_step(avg, rsi_length, rsi_acc)
+    else:
+        seen = int(rsi_acc[0])
+        slot = seen % drift
+        positive = np.nan
+        negative = np.nan
+        if seen >= drift:
+            diff = avg - rsi_ring[slot]
+            positive = diff if diff > 0 else 0.0
+            negative = diff if diff < 0 else 0.0
+            if np.isnan(diff):
+                positive = negative = diff
+        rsi_ring[slot] = avg
+        rsi_acc[0] = seen + 1
+        positive_avg = ma_step(MA_RMA, pos_ma, positive, rsi_length)
+        negative_avg = ma_step(MA_RMA, neg_ma, negative, rsi_length)
+        rsi = scalar * positive_avg / (positive_avg + np.abs(negative_avg))
+    if not talib:
+        line = (
+            ma_step(MA_EMA, fast_ma, rsi, macd_fast) 
+            - ma_step(MA_EMA, slow_ma, rsi, macd_slow)
+        )
+        signal = ma_step(MA_EMA, signal_ma, line, macd_signal)
+        return rsi, line, signal, line - signal
+    # TA-Lib seeds both EMAs where the slow one becomes available
+    if macd_acc[0] == 0 and np.isnan(rsi):
+        return rsi, np.nan, np.nan, np.nan
+    macd_acc[0] += 1
+    count = int(macd_acc[0])
+    macd_ring[(count - 1) % macd_slow] = rsi
+    slow = ma_step(MA_EMA, slow_ma, rsi, macd_slow)
+    if count < macd_slow:
+        return rsi, np.nan, np.nan, np.nan
+    if count == macd_slow:
+        total = 0.0
+        for j in range(count - macd_fast, count):
+            total += macd_ring[j % macd_slow]
+        macd_acc[1] = total / macd_fast
+    else:
+        prev = macd_acc[1]
+        macd_acc[1] = ((rsi - prev) * (2.0 / (macd_fast + 1))) + prev
+    line = macd_acc[1] - slow
+    signal = ma_step(MA_EMA, signal_ma, line, macd_signal)
+    if np.isnan(signal):
+        return rsi, np.nan, np.nan, np.nan
+    return rsi, line, signal, line - signal
+
+
+@kernel((f8, i8, F8))
+def _rsi_talib_step(x: float, length: int, acc: NDArray) -> float:
+    """
+    Advances `rsi_talib` by one value; `acc` holds the values 
+      seen, the previous value and the gain and loss sums.
+    """
+    if acc[0] == 0:
+        # TA-Lib skips leading NaNs
+        if not np.isnan(x):
+            acc[0] = 1
+            acc[1] = x
+        return np.nan
+    diff = x - acc[1]
+    acc[1] = x
+    acc[0] += 1
+    diffs = acc[0] - 1
+    if diffs > length:
+        acc[3] *= length - 1
+        acc[2] *= length - 1
+    if diff < 0:
+        acc[3] -= diff
+    else:
+        acc[2] += diff
+    if diffs < length:
+        return np.nan
+    acc[3] /= length
+    acc[2] /= length
+    return _rsi_value(acc[2], acc[3])
+
+
+@kernel(
+    (F8, F8, F8, F8, i8, i8, i8, i8, f8, i8, b1, F8, F8, F8, F8, F8, F8, F8, F8, F8),
+)
+def _clouds_kernel(
+    open_: NDArray,
+    high: NDArray,
+    low: NDArray,
+    close: NDArray,
+    rsi_length: int,
+    macd_fast: int,
+    macd_slow: int,
+    macd_signal: int,
+    scalar: float,
+    drift: int,
+    talib: bool,
+    rsi_acc: NDArray,
+    rsi_ring: NDArray,
+    pos_ma: NDArray,
+    neg_ma: NDArray,
+    macd_acc: NDArray,
+    macd_ring: NDArray,
+    fast_ma: NDArray,
+    slow_ma: NDArray,
+    signal_ma: NDArray
+) -> tuple[NDArray, NDArray, NDArray, NDArray]:
+    """
+    Runs `_clouds_step` over a block of bars.
+    """
+    n = close.shape[0]
+    rsi = np.empty(n)
+    line = np.empty(n)
+    signal = np.empty(n)
+    histogram = np.empty(n)
+    for i in range(n):
+        rsi[i], line[i], signal[i], histogram[i] = _clouds_step(
+            open_[i], high[i], low[i], close[i],
+            rsi_length, macd_fast, macd_slow, macd_signal,
+            scalar, drift, talib,
+            rsi_acc, rsi_ring, pos_ma, neg_ma,
+            macd_acc, macd_ring, fast_ma, slow_ma, signal_ma
+        )
+    return rsi, line, signal, histogram
+
+
+def _resolve(
+    config: RsiCloudsConfigDM
+) -> tuple[int, int, int, int, float, int]:
+    """
+    Resolves RSI and MACD defaults the same way pandas-ta does.
+    Returns:
+        tuple: RSI length, MACD fast, slow and signal periods,
+          scalar and drift.
+    """
+    def positive(value: int | None, default: int) -> int:
+        return value if value and value > 0 else default
+
+    return (
+        positive(config.rsi_length, 14),
+        positive(config.macd_fast, 12),
+        positive(config.macd_slow, 26),
+        positive(config.macd_signal, 9),
+        float(config.scalar) if config.scalar else 100.0,
+        positive(config.drift, 1),
+    )
+
+
+@kernel((P, P, P, P, i8, i8, i8, i8, f8, i8, b1, i8))
+def _rsi_clouds_row(
+    open_: NDArray,
+    high: NDArray,
+    low: NDArray,
+    close: NDArray,
+    rsi_length: int,
+    macd_fast: int,
+    macd_slow: int,
+    macd_signal: int,
+    scalar: float,
+    drift: int,
+    talib: bool,
+    offset: int
+) -> tuple[NDArray, NDArray, NDArray, NDArray, NDArray]:
+    """
+    RSI Clouds of one instrument, following `pandas_ta.rsi` 
+      and `pandas_ta.macd`.
+    Returns:
+        tuple: Average price, RSI, MACD line, signal line 
+          and histogram.
+    """
+    # Computes the mean price from open, high, low, and close.
+    avg = (low + high + open_ + close) / 4
+    rsi = _clouds_rsi(avg, rsi_length, scalar, drift, talib, offset)
+    macd_line, signal_line, histogram = _clouds_macd(
+        rsi, macd_fast, macd_slow, macd_signal, talib
+    )
+    return avg, rsi, macd_line, signal_line, histogram
+
+
+@kernel((P, i8, f8, i8, b1, i8))
+def _clouds_rsi(
+    avg: NDArray,
+    rsi_length: int,
+    scalar: float,
+    drift: int,
+    talib: bool,
+    offset: int
+) -> NDArray:
+    """
+    RSI of the average price, shifted by `offset` bars.
+    """
+    n = avg.shape[0]
+    if talib:
+        raw_rsi = rsi_talib(avg, rsi_length)
+    else:
+        raw_rsi = rsi_rma(avg, rsi_length, scalar, drift)
+    rsi = np.full(n, np.nan, avg.dtype)
+    if offset >= 0:
+        rsi[offset:] = raw_rsi[:n - offset]
+    else:
+        rsi[:n + offset] = raw_rsi[-offset:]
+    return rsi
+
+
+@kernel((P, i8, i8, i8, b1))
+def _clouds_macd(
+    rsi: NDArray,
+    macd_fast: int,
+    macd_slow: int,
+    macd_signal: int,
+    talib: bool
+) -> tuple[NDArray, NDArray, NDArray]:
+    """
+    MACD line, signal line and histogram of the RSI.
+    """
+    if talib:
+        return macd_talib(rsi, macd_fast, macd_slow, macd_signal)
+    return macd_ema(rsi, macd_fast, macd_slow, macd_signal)
+
+
+@kernel((P_2D, P_2D, P_2D, P_2D, i8, i8, i8, i8, f8, i8, b1, i8), parallel=True)
+def _rsi_clouds_batch(
+    open_: NDArray,
+    high: NDArray,
+    low: NDArray,
+    close: NDArray,
+    rsi_length: int,
+    macd_fast: int,
+    macd_slow: int,
+    macd_signal: int,
+    scalar: float,
+    drift: int,
+    talib: bool,
+    offset: int
+) -> tuple[NDArray, NDArray, NDArray, NDArray, NDArray]:
+    """
+    Runs `_rsi_clouds_row` for every instrument of a block in parallel.
+    """
+    avg = np.empty_like(close)
+    rsi = np.empty_like(close)
+    macd_line = np.empty_like(close)
+    signal_line = np.empty_like(close)
+    histogram = np.empty_like(close)
+    for r in prange(close.shape[0]):
+        (
+            avg[r], rsi[r], macd_line[r], signal_line[r], histogram[r]
+        ) = _rsi_clouds_row(
+            open_[r], high[r], low[r], close[r],
+            rsi_length, macd_fast, macd_slow, macd_signal,
+            scalar, drift, talib, offset
+        )
+    return avg, rsi, macd_line, signal_line, histogram
@@ -1,8 +1,37 @@
-import pandas as pd
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import numpy as np
+from numpy.typing import NDArray
 
 from strategies.src.domain.entities import ScrsiConfigDM
-from strategies.src.infrastructure._types import PriceDataFrame
+from strategies.src.infrastructure._lazy import lazy_import
+from strategies.src.infrastructure._types import OhlcvBlock, PriceDataFrame
+from strategies.src.infrastructure.indicators._kernels import (
+    LONG,
+    SHORT,
+    level_signals,
+    quantile_push,
+    quantile_state,
+    quantile_value,
+    signal_name,
+)
+from strategies.src.infrastructure.indicators.jit import (
+    F8,
+    P_2D,
+    P,
+    f8,
+    i8,
+    kernel,
+    p,
+    prange,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
 
 
 class SmoothCicleRsi:
@@ -23,8 +52,10 @@ class SmoothCicleRsi:
     3. Standard RSI formula: RSI = 100 - (100 / (1 + up/down)).
     4. Convert RSI from range [0,100] to [-100,100] to highlight trends.
     5. Apply cyclic smoothing to refine RSI momentum shifts.
-    6. Define boundaries (`Lower Bound` and `Upper Bound`)
-       based on percentile thresholds.
+    6. Define boundaries (`Lower Bound` and `Upper Bound`) per
+       bar as the `leveling` and `100 - leveling` percentiles
+       of the last `2 * domcycle` CRSI values (a sorted rolling
+       window, O(log w) search per bar).
 
     Usage:
     - Provides momentum-based trading signals.
@@ -45,74 +76,49 @@ class SmoothCicleRsi:
             vibration, smoothing).
         Returns:
             pd.DataFrame: A DataFrame containing the SCRSI 
-            scaled values and boundary levels.
-        """
-        # Compute cycle length and cyclic memory for smoothing
-        cyclelen = config.domcycle // 2
-        cyclicmemory = config.domcycle * 2
-        # Calculate RSI components: Up (gains) and Down (losses)
-        up = pd.Series(
-            np.maximum(
-                data.close_prices.diff(), 0
-            )
-        ).rolling(window=cyclelen).mean()
-        down = pd.Series(
-            np.minimum(
-                data.close_prices.diff(), 0
-            )
-        ).rolling(window=cyclelen).mean()
-        # Standard RSI calculation with safe division 
-        # (to avoid division by zero issues)
-        rsi = 100 - 100 / (1 + np.divide(
-            up, down, 
-            out=np.zeros_like(up), 
-            where=down != 0)
+            scaled values, the smoothed CRSI and boundary levels.
+        """
+        # Compute SCRSI on a single-instrument block
+        scrsi = self.calculate_scrsi_batch(
+            OhlcvBlock.from_frames([data]), config
         )
-        # Ensure RSI stays within [0, 100]
-        rsi = np.clip(rsi, 0, 100)
-        # Convert RSI scale from [0,100] to [-100,100]
-        # for better trend visibility
-        rsi_scaled = (rsi - 50) * 2
-        # Apply cyclic smoothing to RSI
-        torque = 2.0 / (config.vibration + 1)
-        phasingLag = (config.vibration - 1) // 2
-        crsi = np.zeros_like(rsi_scaled)
-        # Apply smoothing logic using vectorization
-        mask = np.arange(len(rsi_scaled)) >= phasingLag
-        crsi[mask] = torque * (
-            2 * rsi_scaled[mask] - np.roll(
-                rsi_scaled, phasingLag
-            )[mask]
-        ) + (1 - torque) * np.roll(crsi, 1)[mask]
-        # Remove NaN values before calculating boundary levels
-        crsi_clean = crsi[~np.isnan(crsi)]
-        # Define lower and upper bounds using percentile thresholds
-        db = float(
-            np.percentile(
-                crsi_clean[:cyclicmemory], config.leveling
-            ) if len(
-                crsi_clean[:cyclicmemory]
-            ) > 0 else -100
+        return pd.DataFrame(
+            {name: values[0] for name, values in scrsi.items()}, 
+            index=data.index
         )
-        ub = float(
-            np.percentile(
-                crsi_clean[:cyclicmemory], 
-                100 - config.leveling
-            ) if len(
-                crsi_clean[:cyclicmemory]
-            ) > 0 else 100
+
+    def calculate_scrsi_batch(
+        self, 
+        block: OhlcvBlock, 
+        config: ScrsiConfigDM
+    ) -> dict[str, NDArray]:
+        """
+        Computes SCRSI for a whole universe of bar-aligned 
+        instruments in parallel.
+        Args:
+            block (OhlcvBlock): Price columns (instruments x bars).
+            config (ScrsiConfigDM): Indicator configuration.
+        Returns:
+            dict[str, np.ndarray]: "CRSI Scaled", "CRSI", 
+            "Lower Bound" and "Upper Bound" arrays 
+            (instruments x bars). The bounds are rolling 
+            percentiles of the CRSI, see the class docstring.
+        """
+        cyclelen, torque, lag, *_ = _new_scrsi_state(config)
+        rsi_scaled, crsi, lower, upper = _scrsi_batch(
+            block.close,
+            cyclelen,
+            torque,
+            lag,
+            _cyclicmemory(config),
+            float(config.leveling),
         )
-        # Ensure arrays are 1D before storing results 
-        # without misaligning indices
-        if getattr(crsi, "ndim", 1) > 1:
-            crsi = crsi.flatten()
-        if getattr(rsi_scaled, "ndim", 1) > 1:
-            rsi_scaled = rsi_scaled.flatten()
-        return pd.DataFrame({
-            'CRSI Scaled': rsi_scaled,
-            'Lower Bound': db,
-            'Upper Bound': ub
-        }, index=data.index)
+        return {
+            "CRSI Scaled": rsi_scaled,
+            "CRSI": crsi,
+            "Lower Bound": lower,
+            "Upper Bound": upper,
+        }
 
     def generate_scrsi_signals(
         self, 
@@ -126,52 +132,39 @@ class SmoothCicleRsi:
         Args:
             data (pd.DataFrame): DataFrame containing SCRSI values.
         Returns:
-            pd.DataFrame: A DataFrame with separate buy and sell signal series.
-        """
-        # Create a series for BUY signals (0 = no signal, 1 = buy)
-        buy_signals = pd.Series(0, index=data.index)
-        # Buy signal: Crossing 50 from below
-        buy_signals[
-            (
-                data["CRSI Scaled"].shift(1) < 50
-            ) & (
-                data["CRSI Scaled"] >= 50
-            )
-        ] = 1  
-        # Buy signal: Reversal from oversold region (0)
-        buy_signals[
-            (
-                data["CRSI Scaled"].shift(1) <= 0
-            ) & (
-                data["CRSI Scaled"] > 0
-            )
-        ] = 1
-        # Create a series for SELL signals (0 = no signal, 1 = sell)
-        sell_signals = pd.Series(0, index=data.index)
-        # Sell signal: Crossing 50 from above
-        sell_signals[
-            (
-                data["CRSI Scaled"].shift(1) > 50
-            ) & (
-                data["CRSI Scaled"] <= 50
-            )
-        ] = 1
-        # Sell signal: Reversal from overbought region (100)
-        sell_signals[
-            (
-                data["CRSI Scaled"].shift(1) >= 100
-            ) & (
-                data["CRSI Scaled"] < 100
-            )
-        ] = 1  
+            pd.DataFrame: A DataFrame with separate buy and sell signal 
+            series (int8, 0 = no signal, 1 = signal).
+        """
+        codes = level_signals(
+            np.ascontiguousarray(data["CRSI Scaled"].to_numpy())
+        )
         return pd.DataFrame(
             {
-                "buy_signals": buy_signals, 
-                "sell_signals": sell_signals
+                "buy_signals": (codes == LONG).view(np.int8), 
+                "sell_signals": (codes == SHORT).view(np.int8)
             }, 
             index=data.index
         )
 
+    def signals(
+        self, 
+        data: PriceDataFrame, 
+        config: ScrsiConfigDM
+    ) -> NDArray:
+        """
+        Signal code of every bar, without building DataFrames.
+        Args:
+            data (PriceDataFrame): Market data.
+            config (ScrsiConfigDM): SCRSI indicator configuration.
+        Returns:
+            np.ndarray: int8 `LONG` (buy), `SHORT` (sell) or 
+            `FLAT` per bar, as in `generate_scrsi_signals`.
+        """
+        scrsi = self.calculate_scrsi_batch(
+            OhlcvBlock.from_frames([data]), config
+        )
+        return level_signals(scrsi["CRSI Scaled"][0])
+
     def get_last_signal(
         self, 
         data: PriceDataFrame, 
@@ -189,13 +182,367 @@ class SmoothCicleRsi:
             str | None: "long" if buy signal, "short" if sell signal, 
             or None if no signal is present.
         """
-        # Compute SCRSI values
-        scrsi_df = self.calculate_scrsi(data, config)
-        # Generate trading signals
-        signals_df = self.generate_scrsi_signals(scrsi_df)
-        # Check the last signal and return appropriate action
-        if signals_df["buy_signals"].iloc[-1] == 1:
+        # The last signal only depends on the lookback bars
+        return signal_name(
+            self.signals(data.tail(self.lookback(config)), config)[-1]
+        )
+
+    def lookback(self, config: ScrsiConfigDM) -> int:
+        """
+        Bars the last signal depends on: the scaled RSI of the 
+        last two bars, each over `domcycle // 2` price changes. 
+        `get_last_signal` only evaluates this tail.
+        Args:
+            config (ScrsiConfigDM): SCRSI indicator configuration.
+        Returns:
+            int: Number of trailing bars.
+        """
+        cyclelen, *_ = _new_scrsi_state(config)
+        return cyclelen + 2
+
+
+class StreamingScrsi:
+    """
+    Stateful SmoothCicle RSI evaluated one bar at a time.
+
+    Keeps the rolling gain/loss windows, the lagged scaled RSI
+    values and the previous CRSI value, so every `update` costs
+    O(1) regardless of the history length. The state is advanced
+    by the same compiled step as `SmoothCicleRsi.calculate_scrsi`,
+    so a backfill followed by live updates produces exactly the
+    numbers of a single batch run over the whole series. The
+    boundary levels follow the CRSI in a sorted rolling window,
+    O(log w) search per update.
+    """
+
+    def __init__(self, config: ScrsiConfigDM) -> None:
+        self._config = config
+        (
+            self._cyclelen,
+            self._torque,
+            self._lag,
+            self._gains,
+            self._losses,
+            self._rsi_hist,
+            self._acc,
+        ) = _new_scrsi_state(config)
+        self._cyclicmemory = _cyclicmemory(config)
+        self._leveling = float(config.leveling)
+        self._bounds = quantile_state(self._cyclicmemory)
+        self._rsi_scaled = np.nan
+        self._prev_rsi_scaled = np.nan
+        self._crsi = np.nan
+        self._lower = -100.0
+        self._upper = 100.0
+
+    @property
+    def rsi_scaled(self) -> float:
+        return self._rsi_scaled
+
+    @property
+    def crsi(self) -> float:
+        return self._crsi
+
+    @property
+    def lower_bound(self) -> float:
+        return self._lower
+
+    @property
+    def upper_bound(self) -> float:
+        return self._upper
+
+    @property
+    def bars_seen(self) -> int:
+        return int(self._acc[_SEEN])
+
+    def backfill(self, close_prices: NDArray) -> tuple[NDArray, NDArray]:
+        """
+        Advances the state over a block of historical closes.
+        Args:
+            close_prices (np.ndarray): Close prices in 
+              chronological order.
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Scaled RSI and CRSI 
+              values for every bar of the block.
+        """
+        close = np.ascontiguousarray(close_prices, dtype=np.float64)
+        rsi_scaled, crsi = _scrsi_kernel(
+            close,
+            self._cyclelen,
+            self._torque,
+            self._lag,
+            self._gains,
+            self._losses,
+            self._rsi_hist,
+            self._acc,
+        )
+        if close.shape[0] > 0:
+            self._prev_rsi_scaled = (
+                rsi_scaled[-2] if close.shape[0] > 1 
+                else self._rsi_scaled
+            )
+            self._rsi_scaled = rsi_scaled[-1]
+            self._crsi = crsi[-1]
+            lower, upper = _scrsi_bounds(
+                crsi, self._cyclicmemory, self._leveling, self._bounds
+            )
+            self._lower, self._upper = lower[-1], upper[-1]
+        return rsi_scaled, crsi
+
+    def update(self, close: float) -> float:
+        """
+        Advances the state by one closed bar.
+        Args:
+            close (float): Close price of the new bar.
+        Returns:
+            float: CRSI value of the new bar.
+        """
+        self._prev_rsi_scaled = self._rsi_scaled
+        self._rsi_scaled, self._crsi = _scrsi_step(
+            float(close),
+            self._cyclelen,
+            self._torque,
+            self._lag,
+            self._gains,
+            self._losses,
+            self._rsi_hist,
+            self._acc,
+        )
+        self._lower, self._upper = _scrsi_bounds_step(
+            self._crsi, self._cyclicmemory, self._leveling, self._bounds
+        )
+        return self._crsi
+
+    def last_signal(self) -> str | None:
+        """
+        Evaluates the SCRSI signal rules on the newest bar.
+        Returns:
+            str | None: "long" if buy signal, "short" if sell signal,
+            or None if no signal is present.
+        """
+        prev, curr = self._prev_rsi_scaled, self._rsi_scaled
+        # Crossing 50 from below or reversal from oversold region
+        if (prev < 50 <= curr) or (prev <= 0 < curr):
             return "long"
-        elif signals_df["sell_signals"].iloc[-1] == 1:
+        # Crossing 50 from above or reversal from overbought region
+        if (prev > 50 >= curr) or (prev >= 100 > curr):
             return "short"
         return None
+
+
+# Layout of the scalar part of the SCRSI state
+_PREV_CLOSE, _GAIN_SUM, _LOSS_SUM, _PREV_CRSI, _SEEN = range(5)
+
+
+def _cyclicmemory(config: ScrsiConfigDM) -> int:
+    # CRSI values the boundary levels are taken from
+    return max(config.domcycle * 2, 1)
+
+
+def _new_scrsi_state(
+    config: ScrsiConfigDM
+) -> tuple[int, float, int, NDArray, NDArray, NDArray, NDArray]:
+    """
+    Builds an empty SCRSI state for `_scrsi_step`.
+    Args:
+        config (ScrsiConfigDM): Indicator configuration.
+    Returns:
+        tuple: Cycle length, torque, phasing lag, gain and loss 
+          windows, lagged RSI buffer and the scalar accumulators.
+    """
+    cyclelen = max(config.domcycle // 2, 1)
+    torque = 2.0 / (config.vibration + 1)
+    lag = max((config.vibration - 1) // 2, 0)
+    acc = np.zeros(5, dtype=np.float64)
+    return (
+        cyclelen,
+        torque,
+        lag,
+        np.zeros(cyclelen, dtype=np.float64),
+        np.zeros(cyclelen, dtype=np.float64),
+        np.full(lag + 1, np.nan, dtype=np.float64),
+        acc,
+    )
+
+
+@kernel((p, i8, f8, i8, F8, F8, F8, F8))
+def _scrsi_step(
+    price: float,
+    cyclelen: int,
+    torque: float,
+    lag: int,
+    gains: NDArray,
+    losses: NDArray,
+    rsi_hist: NDArray,
+    acc: NDArray
+) -> tuple[float, float]:
+    """
+    Advances the SCRSI state by one bar in O(1).
+    Args:
+        price (float): Close price of the new bar.
+        cyclelen (int): Rolling window of the RSI averages.
+        torque (float): Smoothing factor of the cyclic recursion.
+        lag (int): Phasing lag of the cyclic recursion.
+        gains (np.ndarray): Ring buffer of the last gains.
+        losses (np.ndarray): Ring buffer of the last losses.
+        rsi_hist (np.ndarray): Ring buffer of the last scaled RSI values.
+        acc (np.ndarray): Scalar accumulators, updated in place.
+    Returns:
+        tuple[float, float]: Scaled RSI and CRSI of the new bar.
+    """
+    i = int(acc[_SEEN])
+    if i > 0:
+        diff = price - acc[_PREV_CLOSE]
+        gain = diff if diff > 0.0 else 0.0
+        loss = diff if diff < 0.0 else 0.0
+        slot = (i - 1) % cyclelen
+        # Evict the diff that leaves the window
+        if i > cyclelen:
+            acc[_GAIN_SUM] -= gains[slot]
+            acc[_LOSS_SUM] -= losses[slot]
+        gains[slot] = gain
+        losses[slot] = loss
+        acc[_GAIN_SUM] += gain
+        acc[_LOSS_SUM] += loss
+        # Re-sync the running sums once per window to bound drift
+        if slot == cyclelen - 1:
+            acc[_GAIN_SUM] = gains.sum()
+            acc[_LOSS_SUM] = losses.sum()
+    acc[_PREV_CLOSE] = price
+    acc[_SEEN] = i + 1
+    rsi_scaled = np.nan
+    if i >= cyclelen:
+        up = acc[_GAIN_SUM] / cyclelen
+        down = acc[_LOSS_SUM] / cyclelen
+        # Standard RSI calculation with safe division
+        ratio = up / down if down != 0.0 else 0.0
+        denom = 1.0 + ratio
+        rsi = 100.0 - 100.0 / denom if denom != 0.0 else 0.0
+        # Ensure RSI stays within [0, 100]
+        rsi = min(max(rsi, 0.0), 100.0)
+        rsi_scaled = (rsi - 50.0) * 2.0
+    # Cyclic smoothing with the true recursion on the previous CRSI
+    rsi_hist[i % (lag + 1)] = rsi_scaled
+    if i < lag:
+        return rsi_scaled, 0.0
+    crsi = torque * (
+        2.0 * rsi_scaled - rsi_hist[(i - lag) % (lag + 1)]
+    ) + (1.0 - torque) * acc[_PREV_CRSI]
+    if not np.isnan(crsi):
+        acc[_PREV_CRSI] = crsi
+    return rsi_scaled, crsi
+
+
+@kernel((P, i8, f8, i8, F8, F8, F8, F8))
+def _scrsi_kernel(
+    close: NDArray,
+    cyclelen: int,
+    torque: float,
+    lag: int,
+    gains: NDArray,
+    losses: NDArray,
+    rsi_hist: NDArray,
+    acc: NDArray
+) -> tuple[NDArray, NDArray]:
+    """
+    Runs `_scrsi_step` over a block of close prices.
+    Args:
+        close (np.ndarray): Close prices in chronological order.
+        cyclelen (int): Rolling window of the RSI averages.
+        torque (float): Smoothing factor of the cyclic recursion.
+        lag (int): Phasing lag of the cyclic recursion.
+        gains (np.ndarray): Ring buffer of the last gains.
+        losses (np.ndarray): Ring buffer of the last losses.
+        rsi_hist (np.ndarray): Ring buffer of the last scaled RSI values.
+        acc (np.ndarray): Scalar accumulators, updated in place.
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Scaled RSI and CRSI values.
+    """
+    n = close.shape[0]
+    rsi_scaled = np.empty(n, dtype=np.float64)
+    crsi = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        rsi_scaled[i], crsi[i] = _scrsi_step(
+            close[i], cyclelen, torque, lag, 
+            gains, losses, rsi_hist, acc
+        )
+    return rsi_scaled, crsi
+
+
+@kernel((f8, i8, f8, F8))
+def _scrsi_bounds_step(
+    crsi: float,
+    cyclicmemory: int,
+    leveling: float,
+    state: NDArray
+) -> tuple[float, float]:
+    """
+    Pushes a CRSI value into the boundary window.
+    Returns:
+        tuple[float, float]: Lower and upper bound, -100 and
+          100 until the first CRSI value.
+    """
+    if quantile_push(state, crsi, cyclicmemory) == 0:
+        return -100.0, 100.0
+    return (
+        quantile_value(state, cyclicmemory, leveling),
+        quantile_value(state, cyclicmemory, 100.0 - leveling),
+    )
+
+
+@kernel((P, i8, f8, F8))
+def _scrsi_bounds(
+    crsi: NDArray,
+    cyclicmemory: int,
+    leveling: float,
+    state: NDArray
+) -> tuple[NDArray, NDArray]:
+    """
+    Runs `_scrsi_bounds_step` over a block of CRSI values.
+    """
+    n = crsi.shape[0]
+    lower = np.empty_like(crsi)
+    upper = np.empty_like(crsi)
+    for i in range(n):
+        lower[i], upper[i] = _scrsi_bounds_step(
+            crsi[i], cyclicmemory, leveling, state
+        )
+    return lower, upper
+
+
+@kernel((P_2D, i8, f8, i8, i8, f8), parallel=True)
+def _scrsi_batch(
+    close: NDArray,
+    cyclelen: int,
+    torque: float,
+    lag: int,
+    cyclicmemory: int,
+    leveling: float
+) -> tuple[NDArray, NDArray, NDArray, NDArray]:
+    """
+    Runs `_scrsi_kernel` and `_scrsi_bounds` for every 
+    instrument of a block in parallel.
+    Returns:
+        tuple: Scaled RSI, CRSI, lower and upper bounds 
+          (instruments x bars).
+    """
+    rows = close.shape[0]
+    rsi_scaled = np.empty_like(close)
+    crsi = np.empty_like(close)
+    lower = np.empty_like(close)
+    upper = np.empty_like(close)
+    for r in prange(rows):
+        rsi_scaled[r], crsi[r] = _scrsi_kernel(
+            close[r],
+            cyclelen,
+            torque,
+            lag,
+            np.zeros(cyclelen),
+            np.zeros(cyclelen),
+            np.full(lag + 1, np.nan),
+            np.zeros(5),
+        )
+        lower[r], upper[r] = _scrsi_bounds(
+            crsi[r], cyclicmemory, leveling, quantile_state(cyclicmemory)
+        )
+    return rsi_scaled, crsi, lower, upper
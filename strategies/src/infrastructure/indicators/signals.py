@@ -0,0 +1,173 @@
+from typing import Callable, Sequence, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from strategies.src.domain.entities import (
+    AcceletrationBandsDM,
+    AdxConfigDM,
+    AvslConfigDM,
+    GetLastRecordsDM,
+    RsiCloudsConfigDM,
+    ScrsiConfigDM,
+    StochRsiConfigDM,
+)
+from strategies.src.infrastructure._types import PriceDataFrame
+from strategies.src.infrastructure.indicators.acceleration_bands import (
+    AccelerationBands,
+)
+from strategies.src.infrastructure.indicators.adx import ADXTrend
+from strategies.src.infrastructure.indicators.avsl import AVSL
+from strategies.src.infrastructure.indicators.graph import IndicatorGraph
+from strategies.src.infrastructure.indicators.rsi_clouds import RsiClouds
+from strategies.src.infrastructure.indicators.scrsi import SmoothCicleRsi
+from strategies.src.infrastructure.indicators.stoch_rsi import StochRSI
+
+# Configurations of the indicators that emit signals
+SignalConfig = Union[
+    AcceletrationBandsDM,
+    RsiCloudsConfigDM,
+    ScrsiConfigDM,
+    StochRsiConfigDM,
+]
+IndicatorConfig = Union[SignalConfig, AdxConfigDM, AvslConfigDM]
+
+_SIGNALS: dict[
+    type, Callable[[PriceDataFrame, SignalConfig, IndicatorGraph], NDArray]
+] = {
+    AcceletrationBandsDM: lambda data, config, graph: (
+        AccelerationBands().signals(data, config, graph)
+    ),
+    RsiCloudsConfigDM: lambda data, config, graph: (
+        RsiClouds().signals(data, config, graph)
+    ),
+    # SCRSI has no primitives to share with the graph
+    ScrsiConfigDM: lambda data, config, graph: (
+        SmoothCicleRsi().signals(data, config)
+    ),
+    StochRsiConfigDM: lambda data, config, graph: (
+        StochRSI().signals(data, config, graph)
+    ),
+}
+_LOOKBACKS: dict[type, Callable[[IndicatorConfig], int]] = {
+    AcceletrationBandsDM: AccelerationBands().lookback,
+    AdxConfigDM: ADXTrend().lookback,
+    AvslConfigDM: AVSL().lookback,
+    RsiCloudsConfigDM: RsiClouds().lookback,
+    ScrsiConfigDM: SmoothCicleRsi().lookback,
+    StochRsiConfigDM: StochRSI().lookback,
+}
+
+
+class IndicatorSignals:
+    """
+    Signals of several indicators of one instrument in one pass.
+
+    A strategy reads the signals of every indicator it is
+    configured with on the same bars. `evaluate` computes them
+    all into a single int8 matrix (indicators x bars) of
+    `LONG` (1), `FLAT` (0) and `SHORT` (-1) codes: the
+    indicators share one `IndicatorGraph`, every row comes
+    straight from a compiled signal kernel and no DataFrame is
+    built. A row equals the `signals` method of its indicator;
+    RSI Clouds rows hold the MACD crossover.
+
+    The signals of the newest bar only depend on the last
+    `lookback` bars: `last` evaluates that tail alone, and
+    `last_records` asks QuestDB for just as many candles.
+    """
+
+    def evaluate(
+        self,
+        data: PriceDataFrame,
+        configs: Sequence[SignalConfig]
+    ) -> NDArray:
+        """
+        Signal codes of every configured indicator.
+        Args:
+            data (PriceDataFrame): Market data.
+            configs (Sequence[SignalConfig]): Indicator
+              configurations, one row each.
+        Returns:
+            np.ndarray: int8 codes (configs x bars), in the
+              order of `configs`.
+        Raises:
+            TypeError: If a configuration belongs to an
+              indicator without signals.
+        """
+        _check(configs, _SIGNALS)
+        graph = IndicatorGraph(data)
+        matrix = np.empty((len(configs), len(data)), dtype=np.int8)
+        for row, config in enumerate(configs):
+            matrix[row] = _SIGNALS[type(config)](data, config, graph)
+        return matrix
+
+    def last(
+        self,
+        data: PriceDataFrame,
+        configs: Sequence[SignalConfig]
+    ) -> NDArray:
+        """
+        Signal codes of the newest bar, evaluated on the last
+          `lookback(configs)` bars only.
+        Args:
+            data (PriceDataFrame): Market data.
+            configs (Sequence[SignalConfig]): Indicator
+              configurations.
+        Returns:
+            np.ndarray: int8 code of every config.
+        Raises:
+            TypeError: If a configuration belongs to an
+              indicator without signals.
+        """
+        _check(configs, _SIGNALS)
+        tail = data.tail(self.lookback(configs))
+        return self.evaluate(tail, configs)[:, -1].copy()
+
+    def lookback(self, configs: Sequence[IndicatorConfig]) -> int:
+        """
+        Bars the newest values of all `configs` depend on, the
+          longest `lookback` of their indicators.
+        Raises:
+            TypeError: If a configuration is not an indicator's.
+        """
+        _check(configs, _LOOKBACKS)
+        return max(
+            (_LOOKBACKS[type(config)](config) for config in configs),
+            default=0,
+        )
+
+    def last_records(
+        self,
+        inst_id: str,
+        bar: str,
+        configs: Sequence[IndicatorConfig]
+    ) -> GetLastRecordsDM:
+        """
+        Request of the candles the newest values of `configs`
+          need, and no more.
+        Args:
+            inst_id (str): Instrument id.
+            bar (str): Timeframe.
+            configs (Sequence[IndicatorConfig]): Indicator
+              configurations.
+        Returns:
+            GetLastRecordsDM: Parameters for `get_last_records`.
+        Raises:
+            TypeError: If a configuration is not an indicator's.
+        """
+        return GetLastRecordsDM(
+            instId=inst_id, bar=bar, n=self.lookback(configs)
+        )
+
+
+def _check(configs: Sequence, supported: dict[type, Callable]) -> None:
+    """
+    Raises:
+        TypeError: If a configuration has no entry in `supported`.
+    """
+    for config in configs:
+        if type(config) not in supported:
+            raise TypeError(
+                f"{type(config).__name__} is not supported here"
+            )
@@ -1,10 +1,48 @@
-import talib as ta
-from pandas import DataFrame
-import pandas as pd
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Sequence
+
 import numpy as np
+from numpy.typing import NDArray
 
 from strategies.src.domain.entities import StochRsiConfigDM
-from strategies.src.infrastructure._types import PriceDataFrame
+from strategies.src.infrastructure._lazy import lazy_import
+from strategies.src.infrastructure._types import OhlcvBlock, PriceDataFrame
+from strategies.src.infrastructure.indicators._kernels import (
+    LONG,
+    MA_EMA,
+    SHORT,
+    ma_lookback,
+    settle_bars,
+    signal_name,
+    stoch_cross_signals,
+    stoch_k_from_range,
+    stoch_smooth,
+    stochrsi_talib,
+)
+from strategies.src.infrastructure.indicators.graph import IndicatorGraph
+from strategies.src.infrastructure.indicators.jit import (
+    P_2D,
+    i8,
+    kernel,
+    prange,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import talib
+    from pandas import DataFrame
+else:
+    pd = lazy_import("pandas")
+    talib = lazy_import("talib")
+
+# %D moving averages of the kernels: SMA (0) and EMA (1). The other
+# TA-Lib MA types (2 WMA, 3 DEMA, 4 TEMA, 5 TRIMA, 6 KAMA, 7 MAMA,
+# 8 T3) go through TA-Lib `STOCHRSI`
+_KERNEL_MATYPES = (0, 1)
+_TALIB_MATYPES = range(9)
+# EMAs chained by TA-Lib's DEMA, TEMA and T3
+_CHAINED_EMAS = {3: 2, 4: 3, 8: 6}
 
 
 class StochRSI:
@@ -34,7 +72,8 @@ class StochRSI:
     def calculate_stochrsi(
             self, 
             data: PriceDataFrame, 
-            config: StochRsiConfigDM
+            config: StochRsiConfigDM,
+            graph: IndicatorGraph | None = None
         ) -> DataFrame:
         """
         Computes the Stochastic RSI (%K and %D) values.
@@ -42,22 +81,90 @@ class StochRSI:
             data (PriceDataFrame): The price dataset containing closing prices.
             config (StochRsiConfigDM): Configuration for Stochastic RSI 
                 (time period, smoothing factors).
+            graph (IndicatorGraph | None): Shared evaluation graph 
+              of `data`; when given, primitive series are taken 
+              from (and cached in) it.
         Returns:
             DataFrame: A DataFrame containing the %K and %D values.
         """
-        # Compute the Stochastic RSI components using TA-Lib
-        fastk, fastd = ta.STOCHRSI(
-            close=data.close_prices,
+        stoch_rsi = self._stochrsi(data, config, graph)
+        return pd.DataFrame(
+            {name: values[0] for name, values in stoch_rsi.items()}, 
+            index=data.index
+        )
+
+    def calculate_stochrsi_batch(
+            self, 
+            block: OhlcvBlock, 
+            config: StochRsiConfigDM
+        ) -> dict[str, NDArray]:
+        """
+        Computes %K and %D for a whole universe of bar-aligned 
+            instruments in parallel, with TA-Lib `STOCHRSI` semantics.
+            %D MA types other than SMA (0) and EMA (1) are 
+            computed by TA-Lib, one instrument at a time.
+        Args:
+            block (OhlcvBlock): Price columns (instruments x bars).
+            config (StochRsiConfigDM): Configuration for Stochastic RSI.
+        Returns:
+            dict[str, np.ndarray]: "fastk" and "fastd" arrays 
+                (instruments x bars).
+        Raises:
+            ValueError: If `fastd_matype` is not a TA-Lib MA type 
+                (0-8).
+        """
+        _check_matype(config.fastd_matype)
+        if config.fastd_matype not in _KERNEL_MATYPES:
+            return _stochrsi_talib(block.close, config)
+        fastk, fastd = _stochrsi_batch(
+            block.close,
             # RSI calculation period
-            timeperiod=config.timeperiod,
+            config.timeperiod,
             # %K period (high-low RSI range)
-            fastk_period=config.fastk_period,
+            config.fastk_period,
             # %D smoothing period  
-            fastd_period=config.fastd_period, 
+            config.fastd_period,
             # Moving Average type for %D 
-            fastd_matype=config.fastd_matype  
+            config.fastd_matype,
+        )
+        return {"fastk": fastk, "fastd": fastd}
+
+    def _stochrsi(
+            self, 
+            data: PriceDataFrame, 
+            config: StochRsiConfigDM,
+            graph: IndicatorGraph | None
+        ) -> dict[str, NDArray]:
+        """
+        %K and %D of one instrument (1 x bars) from the graph 
+            or a single-instrument block.
+        """
+        if graph is not None and config.fastd_matype in _KERNEL_MATYPES:
+            return self._stochrsi_from_graph(graph, config)
+        # Compute the Stochastic RSI on a single-instrument block
+        return self.calculate_stochrsi_batch(
+            OhlcvBlock.from_frames([data]), config
         )
-        return DataFrame({"fastk": fastk, "fastd": fastd}, index=data.index)
+
+    def _stochrsi_from_graph(
+            self, 
+            graph: IndicatorGraph, 
+            config: StochRsiConfigDM
+        ) -> dict[str, NDArray]:
+        """
+        %K and %D from the shared RSI and rolling RSI 
+            extremes of an evaluation graph.
+        """
+        rsi_key = ("rsi", "close", config.timeperiod)
+        raw_k = stoch_k_from_range(
+            graph.get(rsi_key),
+            graph.rolling_max(rsi_key, config.fastk_period),
+            graph.rolling_min(rsi_key, config.fastk_period),
+        )
+        fastk, fastd = stoch_smooth(
+            raw_k, config.fastd_period, config.fastd_matype
+        )
+        return {"fastk": fastk[None], "fastd": fastd[None]}
 
     def create_signals(self, data: DataFrame) -> DataFrame:
         """
@@ -70,38 +177,47 @@ class StochRSI:
         Args:
             data (DataFrame): DataFrame containing %K and %D values.
         Returns:
-            DataFrame: A DataFrame with separate buy and sell signal series.
-        """
-        # Buy signal: %K crosses above %D **and** is 
-        # in oversold territory (<20)
-        buy_signals = (
-            data['fastk'] > data['fastd']
-        ) & (
-            data['fastk'].shift(1) < data['fastd'].shift(1)
-        ) & (
-            data['fastk'] < 20
-        )
-        # Sell signal: %K crosses below %D **and** is 
-        # in overbought territory (>80)
-        sell_signals = (
-            data['fastk'] < data['fastd']
-        ) & (
-            data['fastk'].shift(1) > data['fastd'].shift(1)
-        ) & (
-            data['fastk'] > 80
+            DataFrame: A DataFrame with separate buy and sell signal 
+                series (int8 0/1).
+        """
+        codes = stoch_cross_signals(
+            np.ascontiguousarray(data['fastk'].to_numpy()),
+            np.ascontiguousarray(data['fastd'].to_numpy()),
         )
-        return DataFrame(
+        return pd.DataFrame(
             {
-                "buy_signals": buy_signals.astype(int), 
-                "sell_signals": sell_signals.astype(int)
+                "buy_signals": (codes == LONG).view(np.int8), 
+                "sell_signals": (codes == SHORT).view(np.int8)
             }, 
             index=data.index
         )
 
+    def signals(
+        self, 
+        data: PriceDataFrame, 
+        config: StochRsiConfigDM,
+        graph: IndicatorGraph | None = None
+    ) -> NDArray:
+        """
+        Signal code of every bar, without building DataFrames.
+        Args:
+            data (PriceDataFrame): Market data with closing prices.
+            config (StochRsiConfigDM): Stochastic RSI configuration.
+            graph (IndicatorGraph | None): Shared evaluation graph 
+              of `data`; when given, primitive series are taken 
+              from (and cached in) it.
+        Returns:
+            np.ndarray: int8 `LONG` (buy), `SHORT` (sell) or 
+              `FLAT` per bar, as in `create_signals`.
+        """
+        stoch_rsi = self._stochrsi(data, config, graph)
+        return stoch_cross_signals(stoch_rsi["fastk"][0], stoch_rsi["fastd"][0])
+
     def get_last_signal(
         self, 
         data: PriceDataFrame, 
-        config: StochRsiConfigDM
+        config: StochRsiConfigDM,
+        graph: IndicatorGraph | None = None
     ) -> str | None:
         """
         Determines the last trading signal based on Stochastic RSI.
@@ -111,17 +227,140 @@ class StochRSI:
         Args:
             data (PriceDataFrame): Market data with closing prices.
             config (StochRsiConfigDM): Stochastic RSI configuration.
+            graph (IndicatorGraph | None): Shared evaluation graph 
+              of `data`; when given, primitive series are taken 
+              from (and cached in) it.
         Returns:
             str | None: "long" if buy signal, "short" if sell signal,
               or None if no signal is present.
         """
-        # Compute Stochastic RSI values
-        stoch_rsi_df = self.calculate_stochrsi(data, config)
-        # Generate trading signals
-        signals_df = self.create_signals(stoch_rsi_df)
-        # Check the last signal and return appropriate action
-        if signals_df["buy_signals"].iloc[-1] == 1:
-            return "long"
-        elif signals_df["sell_signals"].iloc[-1] == 1:
-            return "short"
-        return None
+        if graph is None:
+            # The last signal only depends on the lookback bars
+            data = data.tail(self.lookback(config))
+        return signal_name(self.signals(data, config, graph)[-1])
+
+    def lookback(self, config: StochRsiConfigDM) -> int:
+        """
+        Bars the last signal depends on: `timeperiod` price 
+            changes for the RSI (settled Wilder smoothing), the 
+            `fastk_period` RSI window, the `fastd_period` %D 
+            window (settled, for EMA) and the previous bar of the 
+            crossover. `get_last_signal` only evaluates this tail.
+            For the recursive TA-Lib MA types (DEMA, TEMA, T3, 
+            KAMA, MAMA) the %D window is the one their slowest 
+            recursion needs to settle.
+        Args:
+            config (StochRsiConfigDM): Stochastic RSI configuration.
+        Returns:
+            int: Number of trailing bars.
+        """
+        return (
+            config.timeperiod 
+            + settle_bars(1.0 / config.timeperiod)
+            + config.fastk_period 
+            + _fastd_lookback(config.fastd_matype, config.fastd_period)
+        )
+
+
+def _fastd_lookback(fastd_matype: int, fastd_period: int) -> int:
+    """
+    Bars the %D moving average needs for its last value.
+    """
+    if fastd_matype == 1:
+        return ma_lookback(MA_EMA, fastd_period)
+    if fastd_matype in _CHAINED_EMAS:
+        return _CHAINED_EMAS[fastd_matype] * ma_lookback(MA_EMA, fastd_period)
+    if fastd_matype == 6:
+        # KAMA at its slowest smoothing constant, (2 / 31) ** 2
+        return fastd_period + settle_bars((2.0 / 31.0) ** 2)
+    if fastd_matype == 7:
+        # MAMA at its slow limit, after the 32 warm-up bars
+        return 32 + settle_bars(0.05)
+    # SMA, WMA, TRIMA: their window
+    return fastd_period
+
+
+def _check_matype(fastd_matype: int) -> None:
+    """
+    Raises:
+        ValueError: If `fastd_matype` is not a TA-Lib MA type (0-8).
+    """
+    if fastd_matype not in _TALIB_MATYPES:
+        raise ValueError(
+            f"fastd_matype {fastd_matype} is not a TA-Lib MA type (0-8)"
+        )
+
+
+def _stochrsi_talib(
+    close: NDArray,
+    config: StochRsiConfigDM
+) -> dict[str, NDArray]:
+    """
+    %K and %D of every instrument by TA-Lib, for the %D MA
+      types without a kernel.
+    """
+    fastk = np.empty_like(close)
+    fastd = np.empty_like(close)
+    for r in range(close.shape[0]):
+        (fastk[r],), (fastd[r],) = _stochrsi_talib_grid(close[r], [config])
+    return {"fastk": fastk, "fastd": fastd}
+
+
+def _stochrsi_talib_grid(
+    close: NDArray,
+    configs: Sequence[StochRsiConfigDM]
+) -> tuple[NDArray, NDArray]:
+    """
+    %K and %D (configs x bars) of one instrument, bit for bit
+      TA-Lib `STOCHRSI`: `RSI`, `STOCHF` with an unsmoothed %D
+      and `MA` of its %K, chained as `STOCHRSI` does. One RSI
+      per `timeperiod` and one raw %K per (`timeperiod`,
+      `fastk_period`) are shared by the configs.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    rsi: dict[int, NDArray] = {}
+    raw_k: dict[tuple[int, int], NDArray] = {}
+    fastk = np.empty((len(configs), close.shape[0]), dtype=np.float64)
+    fastd = np.empty_like(fastk)
+    for c, config in enumerate(configs):
+        key = (config.timeperiod, config.fastk_period)
+        if key not in raw_k:
+            if config.timeperiod not in rsi:
+                rsi[config.timeperiod] = talib.RSI(
+                    close, timeperiod=config.timeperiod
+                )
+            series = rsi[config.timeperiod]
+            raw_k[key], _ = talib.STOCHF(
+                series, series, series,
+                fastk_period=config.fastk_period,
+                fastd_period=1,
+                fastd_matype=0,
+            )
+        fastd[c] = talib.MA(
+            raw_k[key],
+            timeperiod=config.fastd_period,
+            matype=config.fastd_matype,
+        )
+        # Both outputs start at the first %D, as in `STOCHF`
+        fastk[c] = np.where(np.isnan(fastd[c]), np.nan, raw_k[key])
+    return fastk, fastd
+
+
+@kernel((P_2D, i8, i8, i8, i8), parallel=True)
+def _stochrsi_batch(
+    close: NDArray,
+    timeperiod: int,
+    fastk_period: int,
+    fastd_period: int,
+    fastd_matype: int
+) -> tuple[NDArray, NDArray]:
+    """
+    Runs `stochrsi_talib` for every instrument of a block in parallel.
+    """
+    fastk = np.empty_like(close)
+    fastd = np.empty_like(close)
+    for r in prange(close.shape[0]):
+        fastk[r], fastd[r] = stochrsi_talib(
+            close[r], timeperiod, fastk_period, fastd_period, fastd_matype
+        )
+    return fastk, fastd
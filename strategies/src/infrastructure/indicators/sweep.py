@@ -0,0 +1,482 @@
+from typing import Hashable, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+from strategies.src.domain.entities import (
+    AdxConfigDM,
+    AvslConfigDM,
+    RsiCloudsConfigDM,
+    StochRsiConfigDM,
+)
+from strategies.src.infrastructure._types import OhlcvBlock, PriceDataFrame
+from strategies.src.infrastructure.indicators._kernels import (
+    atr_talib,
+    directional_movement,
+    ma,
+    mamode_code,
+    rsi_talib,
+    sma,
+    stoch_raw_k,
+    stoch_smooth,
+)
+from strategies.src.infrastructure.indicators.adx import _directional_index
+from strategies.src.infrastructure.indicators.avsl import _avsl_from_smas
+from strategies.src.infrastructure.indicators.jit import (
+    B1,
+    F8,
+    I8,
+    I8_2D,
+    P_2D,
+    P_3D,
+    P,
+    kernel,
+    prange,
+)
+from strategies.src.infrastructure.indicators.rsi_clouds import (
+    _clouds_macd,
+    _clouds_rsi,
+)
+from strategies.src.infrastructure.indicators.stoch_rsi import (
+    _KERNEL_MATYPES,
+    _check_matype,
+    _stochrsi_talib_grid,
+)
+
+
+class IndicatorSweep:
+    """
+    Parameter sweeps over indicator configurations.
+
+    Tuning an indicator means evaluating it for every config of
+    a grid on the same instrument. A sweep plans the grid first:
+    every distinct intermediate series (an RSI per `timeperiod`,
+    an SMA per length, an ATR per `length`, ...) is computed once,
+    in parallel, and then shared by all configs that use it. The
+    remaining per-config work also runs in parallel.
+
+    Every sweep returns arrays shaped (configs x bars), in the
+    order of the given configs.
+    """
+
+    def sweep_stochrsi(
+        self,
+        data: PriceDataFrame,
+        configs: Sequence[StochRsiConfigDM]
+    ) -> dict[str, NDArray]:
+        """
+        Stochastic RSI for a grid of configs.
+        One RSI per `timeperiod` and one raw %K per
+          (`timeperiod`, `fastk_period`) feed every %D smoothing.
+          %D MA types other than SMA (0) and EMA (1) go
+          through TA-Lib as in `StochRSI`, with their own RSI
+          and raw %K nodes shared the same way.
+        Args:
+            data (PriceDataFrame): Market data with closing prices.
+            configs (Sequence[StochRsiConfigDM]): Configs to evaluate.
+        Returns:
+            dict[str, np.ndarray]: "fastk" and "fastd"
+              (configs x bars).
+        Raises:
+            ValueError: If a `fastd_matype` is not a TA-Lib MA
+              type (0-8).
+        """
+        for config in configs:
+            _check_matype(config.fastd_matype)
+        close = _row(data).close[0]
+        rsi_keys, rsi_index = _plan(
+            [config.timeperiod for config in configs]
+        )
+        k_keys, k_index = _plan(
+            [(config.timeperiod, config.fastk_period) for config in configs]
+        )
+        rsi = _rsi_stage(close, np.array(rsi_keys, dtype=np.int64))
+        raw_k = _raw_k_stage(
+            rsi,
+            np.array([rsi_keys.index(tp) for tp, _ in k_keys], dtype=np.int64),
+            np.array([fk for _, fk in k_keys], dtype=np.int64),
+        )
+        fastd_periods = np.array(
+            [c.fastd_period for c in configs], dtype=np.int64
+        )
+        fastd_matypes = np.array(
+            [c.fastd_matype for c in configs], dtype=np.int64
+        )
+        kernel_rows = np.isin(fastd_matypes, _KERNEL_MATYPES)
+        fastk = np.empty((len(configs), raw_k.shape[1]), raw_k.dtype)
+        fastd = np.empty_like(fastk)
+        fastk[kernel_rows], fastd[kernel_rows] = _stoch_smooth_stage(
+            raw_k,
+            k_index[kernel_rows],
+            fastd_periods[kernel_rows],
+            fastd_matypes[kernel_rows],
+        )
+        talib_rows = np.flatnonzero(~kernel_rows)
+        if talib_rows.size:
+            fastk[talib_rows], fastd[talib_rows] = _stochrsi_talib_grid(
+                close, [configs[c] for c in talib_rows]
+            )
+        return {"fastk": fastk, "fastd": fastd}
+
+    def sweep_adx(
+        self,
+        data: PriceDataFrame,
+        configs: Sequence[AdxConfigDM]
+    ) -> dict[str, NDArray]:
+        """
+        ADX for a grid of configs.
+        One ATR per `length`, one smoothed +DM/-DM pair per
+          (`mamode`, `length`, `drift`) and one DX per
+          (`mamode`, `length`, `drift`, `scalar`) are shared by
+          every `lensig`.
+        Args:
+            data (PriceDataFrame): Price dataset containing
+              high, low, and close prices.
+            configs (Sequence[AdxConfigDM]): Configs to evaluate.
+        Returns:
+            dict[str, np.ndarray]: "adx", "dmp" and "dmn"
+              (configs x bars).
+        """
+        block = _row(data)
+        resolved = [
+            (
+                mamode_code(c.mamode, "rma"),
+                c.length if c.length and c.length > 0 else 14,
+                c.drift if c.drift and c.drift > 0 else 1,
+                float(c.scalar) if c.scalar else 100.0,
+            )
+            for c in configs
+        ]
+        lensigs = np.array(
+            [
+                c.lensig if c.lensig and c.lensig > 0 else r[1]
+                for c, r in zip(configs, resolved)
+            ],
+            dtype=np.int64,
+        )
+        atr_keys, _ = _plan([r[1] for r in resolved])
+        dm_keys, _ = _plan([r[:3] for r in resolved])
+        dx_keys, dx_index = _plan(resolved)
+        atr = _atr_stage(
+            block.high[0], block.low[0], block.close[0],
+            np.array(atr_keys, dtype=np.int64),
+        )
+        pos_ma, neg_ma = _dm_stage(
+            block.high[0], block.low[0],
+            np.array(dm_keys, dtype=np.int64),
+        )
+        dmp, dmn, dx = _dx_stage(
+            atr,
+            pos_ma,
+            neg_ma,
+            np.array([atr_keys.index(k[1]) for k in dx_keys], dtype=np.int64),
+            np.array([dm_keys.index(k[:3]) for k in dx_keys], dtype=np.int64),
+            np.array([k[3] for k in dx_keys], dtype=np.float64),
+        )
+        adx = _adx_stage(
+            dx,
+            dx_index,
+            np.array([r[0] for r in resolved], dtype=np.int64),
+            lensigs,
+        )
+        return {
+            "adx": _shift_each(adx, [c.offset for c in configs]),
+            "dmp": _shift_each(dmp[dx_index], [c.offset for c in configs]),
+            "dmn": _shift_each(dmn[dx_index], [c.offset for c in configs]),
+        }
+
+    def sweep_avsl(
+        self,
+        data: PriceDataFrame,
+        configs: Sequence[AvslConfigDM]
+    ) -> NDArray:
+        """
+        AVSL for a grid of configs.
+        The SMAs of close, volume and close * volume are computed
+          once per distinct length across all fast and slow periods.
+        Args:
+            data (PriceDataFrame): Market price dataset.
+            configs (Sequence[AvslConfigDM]): Configs to evaluate.
+        Returns:
+            np.ndarray: AVSL values (configs x bars).
+        """
+        block = _row(data)
+        lengths, _ = _plan(
+            [c.length_fast for c in configs] + [c.length_slow for c in configs]
+        )
+        smas = _sma_stage(
+            block.close[0], block.volume[0], np.array(lengths, dtype=np.int64)
+        )
+        return _avsl_stage(
+            block.low[0],
+            smas,
+            np.array([lengths.index(c.length_fast) for c in configs]),
+            np.array([lengths.index(c.length_slow) for c in configs]),
+            np.array([c.length_slow for c in configs], dtype=np.int64),
+            np.array([c.stand_div for c in configs], dtype=np.float64),
+        )
+
+    def sweep_rsi_clouds(
+        self,
+        data: PriceDataFrame,
+        configs: Sequence[RsiCloudsConfigDM]
+    ) -> dict[str, NDArray]:
+        """
+        RSI Clouds for a grid of configs.
+        The average price is computed once and one RSI per
+          distinct RSI setting feeds every MACD combination.
+        Args:
+            data (PriceDataFrame): Market price dataset.
+            configs (Sequence[RsiCloudsConfigDM]): Configs to evaluate.
+        Returns:
+            dict[str, np.ndarray]: "rsi", "macd_line",
+              "macd_signal" and "histogram" (configs x bars).
+        """
+        block = _row(data)
+        # Computes the mean price from open, high, low, and close.
+        avg = (block.low[0] + block.high[0] + block.open[0] + block.close[0]) / 4
+
+        def positive(value: int | None, default: int) -> int:
+            return value if value and value > 0 else default
+
+        # TA-Lib RSI ignores `scalar` and `drift`
+        rsi_settings = [
+            (
+                c.talib,
+                positive(c.rsi_length, 14),
+                100.0 if c.talib or not c.scalar else float(c.scalar),
+                1 if c.talib else positive(c.drift, 1),
+                c.offset or 0,
+            )
+            for c in configs
+        ]
+        rsi_keys, rsi_index = _plan(rsi_settings)
+        rsi = _clouds_rsi_stage(
+            avg,
+            np.array([k[0] for k in rsi_keys], dtype=np.bool_),
+            np.array([k[1] for k in rsi_keys], dtype=np.int64),
+            np.array([k[2] for k in rsi_keys], dtype=np.float64),
+            np.array([k[3] for k in rsi_keys], dtype=np.int64),
+            np.array([k[4] for k in rsi_keys], dtype=np.int64),
+        )
+        macd_line, macd_signal, histogram = _clouds_macd_stage(
+            rsi,
+            rsi_index,
+            np.array([positive(c.macd_fast, 12) for c in configs]),
+            np.array([positive(c.macd_slow, 26) for c in configs]),
+            np.array([positive(c.macd_signal, 9) for c in configs]),
+            np.array([c.talib for c in configs], dtype=np.bool_),
+        )
+        offsets = [c.offset for c in configs]
+        return {
+            "rsi": rsi[rsi_index],
+            "macd_line": _shift_each(macd_line, offsets),
+            "macd_signal": _shift_each(macd_signal, offsets),
+            "histogram": _shift_each(histogram, offsets),
+        }
+
+
+def _row(data: PriceDataFrame) -> OhlcvBlock:
+    return OhlcvBlock.from_frames([data])
+
+
+def _plan(keys: Sequence[Hashable]) -> tuple[list, NDArray]:
+    """
+    Deduplicates intermediate keys.
+    Returns:
+        tuple[list, np.ndarray]: Distinct keys in first-seen
+          order and, for every input key, its distinct index.
+    """
+    distinct: dict[Hashable, int] = {}
+    index = np.array(
+        [distinct.setdefault(key, len(distinct)) for key in keys],
+        dtype=np.int64,
+    )
+    return list(distinct), index
+
+
+def _shift_each(values: NDArray, offsets: Sequence[int | None]) -> NDArray:
+    """Applies a per-config pandas-style `shift` to every row."""
+    for row, offset in enumerate(offsets):
+        if offset:
+            shifted = np.full(values.shape[1], np.nan, values.dtype)
+            if offset > 0:
+                shifted[offset:] = values[row, :-offset]
+            else:
+                shifted[:offset] = values[row, -offset:]
+            values[row] = shifted
+    return values
+
+
+@kernel((P, I8), parallel=True)
+def _rsi_stage(close: NDArray, timeperiods: NDArray) -> NDArray:
+    out = np.empty((timeperiods.shape[0], close.shape[0]), close.dtype)
+    for k in prange(timeperiods.shape[0]):
+        out[k] = rsi_talib(close, timeperiods[k])
+    return out
+
+
+@kernel((P_2D, I8, I8), parallel=True)
+def _raw_k_stage(
+    rsi: NDArray,
+    rsi_index: NDArray,
+    fastk_periods: NDArray
+) -> NDArray:
+    out = np.empty((fastk_periods.shape[0], rsi.shape[1]), rsi.dtype)
+    for k in prange(fastk_periods.shape[0]):
+        out[k] = stoch_raw_k(rsi[rsi_index[k]], fastk_periods[k])
+    return out
+
+
+@kernel((P_2D, I8, I8, I8), parallel=True)
+def _stoch_smooth_stage(
+    raw_k: NDArray,
+    k_index: NDArray,
+    fastd_periods: NDArray,
+    fastd_matypes: NDArray
+) -> tuple[NDArray, NDArray]:
+    fastk = np.empty((k_index.shape[0], raw_k.shape[1]), raw_k.dtype)
+    fastd = np.empty((k_index.shape[0], raw_k.shape[1]), raw_k.dtype)
+    for c in prange(k_index.shape[0]):
+        fastk[c], fastd[c] = stoch_smooth(
+            raw_k[k_index[c]], fastd_periods[c], fastd_matypes[c]
+        )
+    return fastk, fastd
+
+
+@kernel((P, P, P, I8), parallel=True)
+def _atr_stage(
+    high: NDArray,
+    low: NDArray,
+    close: NDArray,
+    lengths: NDArray
+) -> NDArray:
+    out = np.empty((lengths.shape[0], close.shape[0]), close.dtype)
+    for k in prange(lengths.shape[0]):
+        out[k] = atr_talib(high, low, close, lengths[k])
+    return out
+
+
+@kernel((P, P, I8_2D), parallel=True)
+def _dm_stage(
+    high: NDArray,
+    low: NDArray,
+    keys: NDArray
+) -> tuple[NDArray, NDArray]:
+    # keys: (mamode, length, drift) per row
+    pos_ma = np.empty((keys.shape[0], high.shape[0]), high.dtype)
+    neg_ma = np.empty((keys.shape[0], high.shape[0]), high.dtype)
+    for k in prange(keys.shape[0]):
+        pos, neg = directional_movement(high, low, keys[k, 2])
+        pos_ma[k] = ma(keys[k, 0], pos, keys[k, 1])
+        neg_ma[k] = ma(keys[k, 0], neg, keys[k, 1])
+    return pos_ma, neg_ma
+
+
+@kernel((P_2D, P_2D, P_2D, I8, I8, F8), parallel=True)
+def _dx_stage(
+    atr: NDArray,
+    pos_ma: NDArray,
+    neg_ma: NDArray,
+    atr_index: NDArray,
+    dm_index: NDArray,
+    scalars: NDArray
+) -> tuple[NDArray, NDArray, NDArray]:
+    shape = (scalars.shape[0], atr.shape[1])
+    dmp = np.empty(shape, atr.dtype)
+    dmn = np.empty(shape, atr.dtype)
+    dx = np.empty(shape, atr.dtype)
+    for k in prange(scalars.shape[0]):
+        dmp[k], dmn[k], dx[k] = _directional_index(
+            atr[atr_index[k]],
+            pos_ma[dm_index[k]],
+            neg_ma[dm_index[k]],
+            scalars[k]
+        )
+    return dmp, dmn, dx
+
+
+@kernel((P_2D, I8, I8, I8), parallel=True)
+def _adx_stage(
+    dx: NDArray,
+    dx_index: NDArray,
+    mamodes: NDArray,
+    lensigs: NDArray
+) -> NDArray:
+    out = np.empty((dx_index.shape[0], dx.shape[1]), dx.dtype)
+    for c in prange(dx_index.shape[0]):
+        out[c] = ma(mamodes[c], dx[dx_index[c]], lensigs[c])
+    return out
+
+
+@kernel((P, P, I8), parallel=True)
+def _sma_stage(
+    close: NDArray,
+    volume: NDArray,
+    lengths: NDArray
+) -> NDArray:
+    # (lengths x [close, volume, close * volume] x bars)
+    price_volume = close * volume
+    out = np.empty((lengths.shape[0], 3, close.shape[0]), close.dtype)
+    for k in prange(lengths.shape[0]):
+        out[k, 0] = sma(close, lengths[k])
+        out[k, 1] = sma(volume, lengths[k])
+        out[k, 2] = sma(price_volume, lengths[k])
+    return out
+
+
+@kernel((P, P_3D, I8, I8, I8, F8), parallel=True)
+def _avsl_stage(
+    low: NDArray,
+    smas: NDArray,
+    fast_index: NDArray,
+    slow_index: NDArray,
+    length_slow: NDArray,
+    stand_div: NDArray
+) -> NDArray:
+    out = np.empty((fast_index.shape[0], low.shape[0]), low.dtype)
+    for c in prange(fast_index.shape[0]):
+        fast = smas[fast_index[c]]
+        slow = smas[slow_index[c]]
+        out[c] = _avsl_from_smas(
+            low, fast[0], slow[0], fast[1], slow[1], fast[2], slow[2],
+            length_slow[c], stand_div[c]
+        )
+    return out
+
+
+@kernel((P, B1, I8, F8, I8, I8), parallel=True)
+def _clouds_rsi_stage(
+    avg: NDArray,
+    talib: NDArray,
+    lengths: NDArray,
+    scalars: NDArray,
+    drifts: NDArray,
+    offsets: NDArray
+) -> NDArray:
+    out = np.empty((lengths.shape[0], avg.shape[0]), avg.dtype)
+    for k in prange(lengths.shape[0]):
+        out[k] = _clouds_rsi(
+            avg, lengths[k], scalars[k], drifts[k], talib[k], offsets[k]
+        )
+    return out
+
+
+@kernel((P_2D, I8, I8, I8, I8, B1), parallel=True)
+def _clouds_macd_stage(
+    rsi: NDArray,
+    rsi_index: NDArray,
+    fast: NDArray,
+    slow: NDArray,
+    signal: NDArray,
+    talib: NDArray
+) -> tuple[NDArray, NDArray, NDArray]:
+    shape = (rsi_index.shape[0], rsi.shape[1])
+    macd_line = np.empty(shape, rsi.dtype)
+    macd_signal = np.empty(shape, rsi.dtype)
+    histogram = np.empty(shape, rsi.dtype)
+    for c in prange(rsi_index.shape[0]):
+        macd_line[c], macd_signal[c], histogram[c] = _clouds_macd(
+            rsi[rsi_index[c]], fast[c], slow[c], signal[c], talib[c]
+        )
+    return macd_line, macd_signal, histogram
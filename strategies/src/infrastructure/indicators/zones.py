@@ -0,0 +1,324 @@
+from typing import Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+from strategies.src.domain.entities import OrderBlockDM, OrderBlockZoneDM
+from strategies.src.infrastructure._types import PriceDataFrame
+from strategies.src.infrastructure.indicators.jit import F8, I8, f8, kernel, prange
+
+_KINDS = {"peak": 1, "valley": -1}
+_KIND_NAMES = {1: "peak", -1: "valley"}
+
+
+class OrderBlockZones:
+    """
+    Store of active order block zones per instrument.
+
+    Every instrument keeps its zones sorted by lower bound 
+      together with a running arg-max of the upper bounds. The 
+      zone reaching highest among those starting at or below a 
+      price contains the price if any zone does, so a stabbing 
+      query is one binary search: O(log n).
+
+    Bulk queries run over a flattened (CSR) copy of every 
+      instrument, rebuilt lazily after updates, in a single 
+      parallel kernel call.
+
+    Zones are created from confirmed order blocks and leave the 
+      store when mitigated (price trades through them: above a 
+      peak zone, below a valley zone) or when they expire.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self._zones: list[dict[str, NDArray]] = []
+        self._next_zone = 0
+        self._flat: dict[str, NDArray] | None = None
+
+    def instrument_ids(self, instruments: Sequence[str]) -> NDArray:
+        """
+        Codes of instruments for `query_many`, -1 for unknown ones.
+        """
+        return np.fromiter(
+            (self._ids.get(name, -1) for name in instruments),
+            dtype=np.int64,
+            count=len(instruments),
+        )
+
+    def add_zone(
+        self, 
+        instId: str, 
+        kind: str, 
+        lower: float, 
+        upper: float, 
+        bar: int
+    ) -> int:
+        """
+        Adds one zone.
+        Args:
+            instId (str): Instrument.
+            kind (str): "peak" (supply) or "valley" (demand).
+            lower (float): Lower price of the zone.
+            upper (float): Upper price of the zone.
+            bar (int): Bar that formed the zone.
+        Returns:
+            int: Zone id.
+        Raises:
+            ValueError: If `kind` is unknown or `lower > upper`.
+        """
+        if kind not in _KINDS:
+            raise ValueError(f"Unknown zone kind '{kind}'")
+        if lower > upper:
+            raise ValueError(f"Zone bounds are inverted: {lower} > {upper}")
+        zone_id = self._next_zone
+        self._next_zone += 1
+        zones = self._instrument(instId)
+        at = int(np.searchsorted(zones["lower"], lower, side="right"))
+        self._store(instId, {
+            "lower": np.insert(zones["lower"], at, lower),
+            "upper": np.insert(zones["upper"], at, upper),
+            "bar": np.insert(zones["bar"], at, bar),
+            "kind": np.insert(zones["kind"], at, _KINDS[kind]),
+            "zone_id": np.insert(zones["zone_id"], at, zone_id),
+        })
+        return zone_id
+
+    def add_blocks(
+        self, 
+        instId: str, 
+        blocks: Sequence[OrderBlockDM], 
+        data: PriceDataFrame
+    ) -> list[int]:
+        """
+        Adds a zone per order block, spanning the low-high range 
+          of the candle that formed it.
+        Args:
+            instId (str): Instrument.
+            blocks (Sequence[OrderBlockDM]): Confirmed order blocks.
+            data (PriceDataFrame): Prices the block bars refer to.
+        Returns:
+            list[int]: Zone ids.
+        """
+        low = data.low_prices
+        high = data.high_prices
+        return [
+            self.add_zone(
+                instId, block.kind, 
+                float(low[block.bar]), float(high[block.bar]), block.bar
+            )
+            for block in blocks
+        ]
+
+    def query(self, instId: str, price: float) -> OrderBlockZoneDM | None:
+        """
+        Finds a zone of the instrument containing `price`.
+        Returns:
+            OrderBlockZoneDM | None: The containing zone reaching 
+              highest, or None.
+        """
+        if instId not in self._ids:
+            return None
+        zones = self._zones[self._ids[instId]]
+        at = _stab(zones["lower"], zones["upper"], zones["reach"], price)
+        return None if at < 0 else _zone(zones, at)
+
+    def query_many(
+        self, 
+        instruments: Sequence[str] | NDArray, 
+        prices: NDArray
+    ) -> dict[str, NDArray]:
+        """
+        Stabbing queries for many instrument/price pairs at once.
+        Args:
+            instruments (Sequence[str] | np.ndarray): Instruments,
+              or their codes from `instrument_ids`.
+            prices (np.ndarray): Price per query.
+        Returns:
+            dict[str, np.ndarray]: "zone_id" (-1 when no zone 
+              contains the price), "kind" (1 peak, -1 valley, 
+              0 none), "lower" and "upper" (NaN when none).
+        """
+        codes = np.asarray(instruments)
+        if codes.dtype.kind not in "iu":
+            codes = self.instrument_ids(list(instruments))
+        flat = self._flatten()
+        if flat["lower"].shape[0] == 0:
+            # No active zone: every query misses
+            n = codes.shape[0]
+            return {
+                "zone_id": np.full(n, -1, dtype=np.int64),
+                "kind": np.zeros(n, dtype=np.int8),
+                "lower": np.full(n, np.nan),
+                "upper": np.full(n, np.nan),
+            }
+        at = _stab_many(
+            flat["offsets"], flat["lower"], flat["upper"], flat["reach"],
+            np.ascontiguousarray(codes, dtype=np.int64),
+            np.ascontiguousarray(prices, dtype=np.float64),
+        )
+        found = at >= 0
+        return {
+            "zone_id": np.where(found, flat["zone_id"][at], -1),
+            "kind": np.where(found, flat["kind"][at], 0).astype(np.int8),
+            "lower": np.where(found, flat["lower"][at], np.nan),
+            "upper": np.where(found, flat["upper"][at], np.nan),
+        }
+
+    def mitigate(self, instId: str, price: float) -> list[OrderBlockZoneDM]:
+        """
+        Removes the zones the price has traded through: peak 
+          zones below it and valley zones above it.
+        Returns:
+            list[OrderBlockZoneDM]: Mitigated zones.
+        """
+        if instId not in self._ids:
+            return []
+        zones = self._zones[self._ids[instId]]
+        broken = (
+            (zones["kind"] == 1) & (zones["upper"] < price)
+        ) | (
+            (zones["kind"] == -1) & (zones["lower"] > price)
+        )
+        return self._drop(instId, broken)
+
+    def expire(self, instId: str, before_bar: int) -> list[OrderBlockZoneDM]:
+        """
+        Removes the zones formed before `before_bar`.
+        Returns:
+            list[OrderBlockZoneDM]: Expired zones.
+        """
+        if instId not in self._ids:
+            return []
+        zones = self._zones[self._ids[instId]]
+        return self._drop(instId, zones["bar"] < before_bar)
+
+    def zones(self, instId: str) -> list[OrderBlockZoneDM]:
+        """
+        Active zones of an instrument, by lower bound.
+        """
+        if instId not in self._ids:
+            return []
+        zones = self._zones[self._ids[instId]]
+        return [_zone(zones, i) for i in range(zones["lower"].shape[0])]
+
+    def _instrument(self, instId: str) -> dict[str, NDArray]:
+        if instId not in self._ids:
+            self._ids[instId] = len(self._zones)
+            self._zones.append({
+                "lower": np.empty(0),
+                "upper": np.empty(0),
+                "bar": np.empty(0, dtype=np.int64),
+                "kind": np.empty(0, dtype=np.int8),
+                "zone_id": np.empty(0, dtype=np.int64),
+                "reach": np.empty(0, dtype=np.int64),
+            })
+        return self._zones[self._ids[instId]]
+
+    def _store(self, instId: str, zones: dict[str, NDArray]) -> None:
+        zones["reach"] = _running_argmax(zones["upper"])
+        self._zones[self._ids[instId]] = zones
+        self._flat = None
+
+    def _drop(self, instId: str, mask: NDArray) -> list[OrderBlockZoneDM]:
+        zones = self._zones[self._ids[instId]]
+        if not mask.any():
+            return []
+        dropped = [_zone(zones, i) for i in np.flatnonzero(mask)]
+        self._store(instId, {
+            name: values[~mask] 
+            for name, values in zones.items() if name != "reach"
+        })
+        return dropped
+
+    def _flatten(self) -> dict[str, NDArray]:
+        """
+        CSR copy of every instrument for `query_many`, with 
+          `reach` pointing into the flat arrays.
+        """
+        if self._flat is None:
+            sizes = [zones["lower"].shape[0] for zones in self._zones]
+            offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+            np.cumsum(sizes, out=offsets[1:])
+            flat = {
+                name: np.concatenate(
+                    [zones[name] for zones in self._zones] 
+                    or [np.empty(0)]
+                )
+                for name in ("lower", "upper", "kind", "zone_id")
+            }
+            flat["reach"] = np.concatenate(
+                [
+                    zones["reach"] + offsets[i] 
+                    for i, zones in enumerate(self._zones)
+                ] or [np.empty(0, dtype=np.int64)]
+            )
+            flat["offsets"] = offsets
+            self._flat = flat
+        return self._flat
+
+
+def _zone(zones: dict[str, NDArray], i: int) -> OrderBlockZoneDM:
+    return OrderBlockZoneDM(
+        zone_id=int(zones["zone_id"][i]),
+        kind=_KIND_NAMES[int(zones["kind"][i])],
+        lower=float(zones["lower"][i]),
+        upper=float(zones["upper"][i]),
+        bar=int(zones["bar"][i]),
+    )
+
+
+def _running_argmax(values: NDArray) -> NDArray:
+    """
+    Index of the largest value in every prefix.
+    """
+    n = values.shape[0]
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    running = np.maximum.accumulate(values)
+    # Position where each running maximum was first reached
+    first = np.flatnonzero(np.r_[True, running[1:] != running[:-1]])
+    return first[np.searchsorted(first, np.arange(n), side="right") - 1]
+
+
+@kernel((F8, F8, I8, f8))
+def _stab(lower: NDArray, upper: NDArray, reach: NDArray, price: float) -> int:
+    """
+    Binary search for a zone containing `price`, -1 if none.
+    """
+    k = np.searchsorted(lower, price, side="right")
+    if k == 0:
+        return -1
+    at = reach[k - 1]
+    return at if upper[at] >= price else -1
+
+
+@kernel((I8, F8, F8, I8, I8, F8), parallel=True)
+def _stab_many(
+    offsets: NDArray,
+    lower: NDArray,
+    upper: NDArray,
+    reach: NDArray,
+    codes: NDArray,
+    prices: NDArray
+) -> NDArray:
+    """
+    Runs `_stab` for every query in parallel, within the CSR 
+      segment of its instrument. Returns flat indices.
+    """
+    out = np.full(codes.shape[0], -1, dtype=np.int64)
+    for q in prange(codes.shape[0]):
+        code = codes[q]
+        if code < 0 or code >= offsets.shape[0] - 1:
+            continue
+        start = offsets[code]
+        k = np.searchsorted(
+            lower[start:offsets[code + 1]], prices[q], side="right"
+        )
+        if k == 0:
+            continue
+        # `reach` already points into the flat arrays
+        at = reach[start + k - 1]
+        if upper[at] >= prices[q]:
+            out[q] = at
+    return out
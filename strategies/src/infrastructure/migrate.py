@@ -0,0 +1,265 @@
+"""
+Copies per-instrument candle tables into the single candles table.
+
+    python -m strategies.src.infrastructure.migrate --url http://127.0.0.1:9000/exec
+    python -m strategies.src.infrastructure.migrate --url ... --workers 8 \\
+        --only BTC-USDT_1m_data ETH-USDT_1m_data
+
+Every `{instId}_{bar}_data` table is copied inside QuestDB with one
+`INSERT INTO candles SELECT ...`, so no candle passes through the
+client; `--workers` tables are copied at a time. The candles
+table is created if it is missing and deduplicates on
+(date, instId, bar), so a rerun after a failure copies the
+failed tables again without duplicating the others. A copy
+takes the candles up to the newest date of the source when it
+starts; candles written to the source during the migration are
+left to the writers. QuestDB applies the copied rows from the
+WAL asynchronously: the distinct dates of the source up to that
+date are compared with the rows of the target until they match
+or `--wait` seconds pass. Source tables created without DEDUP
+may repeat a date; the target keeps one candle per date. The
+source tables are left in place.
+"""
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Sequence
+
+import httpx
+
+from strategies.src.config import QuestConfig
+from strategies.src.domain.entities import CreateTableDM
+from strategies.src.infrastructure.database import DataQueryRepo
+
+# {instId}_{bar}_data; instIds (BTC-USDT-SWAP) have no underscore
+_TABLE = re.compile(r"^(?P<inst_id>[^_]+)_(?P<bar>[^_]+)_data$")
+
+
+@dataclass(slots=True, frozen=True)
+class MigratedTable:
+    """
+    Outcome of the copy of one table: `rows` distinct dates up
+      to `until`, the newest date when the copy started.
+      `copied` is None while the target does not hold all
+      `rows` yet.
+    """
+    table: str
+    inst_id: str
+    bar: str
+    rows: int
+    copied: int | None
+    seconds: float
+    error: str | None = None
+    until: str | None = None
+
+
+async def _exec(
+    client: httpx.AsyncClient,
+    config: QuestConfig,
+    query: str
+) -> dict[str, Any]:
+    response = await client.post(config.url, params={"query": query})
+    if response.status_code != 200:
+        raise ValueError(f"Error {response.status_code}: {response.text}")
+    return response.json()
+
+
+def _quote(value: str) -> str:
+    return value.replace("'", "''")
+
+
+def _identifier(name: str) -> str:
+    return name.replace('"', '""')
+
+
+async def candle_tables(
+    client: httpx.AsyncClient,
+    config: QuestConfig
+) -> list[str]:
+    """
+    Names of the per-instrument candle tables.
+    """
+    payload = await _exec(client, config, "SELECT table_name FROM tables()")
+    return sorted(
+        name for name, in payload["dataset"] if _TABLE.match(name)
+    )
+
+
+async def _count(
+    client: httpx.AsyncClient,
+    config: QuestConfig,
+    query: str
+) -> int:
+    payload = await _exec(client, config, query)
+    return int(payload["dataset"][0][0])
+
+
+async def _snapshot(
+    client: httpx.AsyncClient,
+    config: QuestConfig,
+    table: str
+) -> tuple[int, str | None]:
+    """
+    Distinct dates of a table and its newest date, None when
+      the table is empty.
+    """
+    payload = await _exec(
+        client, config,
+        f'SELECT count_distinct(date), max(date) FROM "{_identifier(table)}"'
+    )
+    rows, until = payload["dataset"][0]
+    return int(rows or 0), until
+
+
+async def migrate_table(
+    client: httpx.AsyncClient,
+    config: QuestConfig,
+    table: str
+) -> MigratedTable:
+    """
+    Copies one per-instrument table into `config.candles_table`.
+    Raises:
+        ValueError: If the name is not a candle table or QuestDB
+          rejects a query.
+    """
+    match = _TABLE.match(table)
+    if match is None:
+        raise ValueError(f"'{table}' is not a candle table")
+    inst_id, bar = match["inst_id"], match["bar"]
+    started = time.perf_counter()
+    # Candles written while the table is copied are not waited for
+    rows, until = await _snapshot(client, config, table)
+    if until is not None:
+        await _exec(client, config, f"""
+            INSERT INTO "{_identifier(config.candles_table)}"
+                (instId, bar, date, open_price, close_price, high_price,
+                 low_price, volume, turnover)
+            SELECT '{_quote(inst_id)}', '{_quote(bar)}', date, open_price,
+                close_price, high_price, low_price, volume, turnover
+            FROM "{_identifier(table)}"
+            WHERE date <= '{_quote(until)}'
+        """)
+    return MigratedTable(
+        table=table,
+        inst_id=inst_id,
+        bar=bar,
+        rows=rows,
+        copied=None if until is not None else 0,
+        seconds=time.perf_counter() - started,
+        until=until,
+    )
+
+
+async def _copied(
+    client: httpx.AsyncClient,
+    config: QuestConfig,
+    result: MigratedTable
+) -> int:
+    return await _count(client, config, f"""
+        SELECT count() FROM "{_identifier(config.candles_table)}"
+        WHERE instId = '{_quote(result.inst_id)}'
+        AND bar = '{_quote(result.bar)}'
+        AND date <= '{_quote(result.until or "")}'
+    """)
+
+
+async def migrate(
+    config: QuestConfig,
+    tables: Sequence[str] | None = None,
+    workers: int = 4,
+    wait: float = 60.0,
+    partition: str | None = None
+) -> list[MigratedTable]:
+    """
+    Copies per-instrument tables into the candles table.
+    Args:
+        config (QuestConfig): QuestDB and the candles table name.
+        tables (Sequence[str] | None): Tables to copy, every
+          candle table when omitted.
+        workers (int): Tables copied at a time.
+        wait (float): Seconds to wait for the copies to be
+          applied.
+        partition (str | None): Partitioning of a new candles
+          table, DAY when omitted.
+    Returns:
+        list[MigratedTable]: One result per table; a failed copy
+          carries its error instead of raising.
+    """
+    semaphore = asyncio.Semaphore(workers)
+    async with httpx.AsyncClient(timeout=None) as client:
+        target = DataQueryRepo(
+            client, config.model_copy(update={"layout": "single"})
+        )
+        await target.create_datatable(
+            CreateTableDM(instId="", bar="", partition=partition)
+        )
+        if tables is None:
+            tables = await candle_tables(client, config)
+
+        async def copy(table: str) -> MigratedTable:
+            async with semaphore:
+                try:
+                    return await migrate_table(client, config, table)
+                except (ValueError, httpx.HTTPError) as error:
+                    return MigratedTable(
+                        table=table, inst_id="", bar="", rows=0,
+                        copied=None, seconds=0.0, error=str(error)[:200],
+                    )
+
+        results = list(await asyncio.gather(*(copy(t) for t in tables)))
+        deadline = time.monotonic() + wait
+        while True:
+            for i, result in enumerate(results):
+                if result.error is None and result.copied is None:
+                    copied = await _copied(client, config, result)
+                    if copied >= result.rows:
+                        results[i] = replace(result, copied=copied)
+            pending = [
+                result for result in results
+                if result.error is None and result.copied is None
+            ]
+            if not pending or time.monotonic() >= deadline:
+                return results
+            await asyncio.sleep(1.0)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m strategies.src.infrastructure.migrate",
+        description="Copy per-instrument candle tables into one table.",
+    )
+    parser.add_argument("--url", required=True, help="QuestDB /exec URL.")
+    parser.add_argument("--table", default="candles")
+    parser.add_argument("--only", nargs="*", help="Tables to copy.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--wait", type=float, default=60.0)
+    parser.add_argument("--partition", help="DAY when omitted.")
+    parser.add_argument("--out", help="JSON report path.")
+    args = parser.parse_args(argv)
+
+    config = QuestConfig(url=args.url, candles_table=args.table)
+    results = asyncio.run(
+        migrate(config, args.only, args.workers, args.wait, args.partition)
+    )
+    for row in results:
+        state = (
+            f"failed: {row.error}" if row.error is not None
+            else "not applied yet" if row.copied is None
+            else f"{row.copied} rows"
+        )
+        print(
+            f"{row.table:40} {row.rows:12} rows {row.seconds:8.2f} s  {state}"
+        )
+    if args.out:
+        with open(args.out, "w") as out:
+            json.dump([asdict(row) for row in results], out, indent=2)
+    complete = all(row.copied is not None for row in results)
+    return 0 if complete else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,392 @@
+"""
+Higher-timeframe candles derived from base candles in memory.
+
+Only the base timeframe (1m) of an instrument has to be stored
+and ingested: `resample` folds a history of base candles into
+3m ... 1D candles in one vectorized pass, and `BarResampler`
+keeps the higher timeframes up to date as every base bar
+closes. Both return `PriceDataFrame`s, so their output goes
+straight into the indicator classes.
+
+Bars are aligned to the UTC epoch: a 1H bar starts on the hour,
+a 1D bar at 00:00 UTC (OKX "1Dutc"). Missing base bars (no
+trades) leave the higher bar with the bars that exist; a bucket
+without any base bar produces no bar, as in QuestDB SAMPLE BY.
+"""
+from typing import Sequence
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+from strategies.src.domain.entities import GetLastRecordsDM
+from strategies.src.infrastructure._types import PriceDataFrame, _price_dtype
+
+_MINUTE_US = 60_000_000
+# OKX bar names and their length in epoch microseconds
+BAR_US: dict[str, int] = {
+    "1m": _MINUTE_US,
+    "3m": 3 * _MINUTE_US,
+    "5m": 5 * _MINUTE_US,
+    "15m": 15 * _MINUTE_US,
+    "30m": 30 * _MINUTE_US,
+    "1H": 60 * _MINUTE_US,
+    "2H": 120 * _MINUTE_US,
+    "4H": 240 * _MINUTE_US,
+    "6H": 360 * _MINUTE_US,
+    "12H": 720 * _MINUTE_US,
+    "1D": 1_440 * _MINUTE_US,
+}
+BASE_BAR = "1m"
+
+
+def bar_length(bar: str) -> int:
+    """
+    Length of a bar in epoch microseconds.
+    Raises:
+        ValueError: If `bar` is not one of `BAR_US`.
+    """
+    if bar not in BAR_US:
+        raise ValueError(
+            f"Unknown bar '{bar}', expected one of {tuple(BAR_US)}"
+        )
+    return BAR_US[bar]
+
+
+def resample(data: PriceDataFrame, bar: str) -> PriceDataFrame:
+    """
+    Folds base candles into candles of timeframe `bar`.
+    Args:
+        data (PriceDataFrame): Base candles in chronological
+          order.
+        bar (str): Target timeframe, e.g. "15m" or "4H".
+    Returns:
+        PriceDataFrame: One candle per bucket with base bars, of
+          the price dtype of `data`. The last one is still
+          forming unless its last base bar is in `data`.
+    Raises:
+        ValueError: If `bar` is unknown.
+    """
+    length = bar_length(bar)
+    if data.empty:
+        return data
+    bucket = data.epoch - data.epoch % length
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(data)] - 1
+    return PriceDataFrame.from_arrays(
+        date=bucket[starts],
+        open_price=data.open_price[starts],
+        close_price=data.close_prices[ends],
+        high_price=np.maximum.reduceat(data.high_prices, starts),
+        low_price=np.minimum.reduceat(data.low_prices, starts),
+        volume=np.add.reduceat(data.volumes, starts),
+        # Turnover sums stay float64 in compact mode too
+        turnover=np.add.reduceat(data.turnover, starts, dtype=np.float64),
+        dtype=data.dtype,
+    )
+
+
+def base_records(
+    params: GetLastRecordsDM,
+    base: str = BASE_BAR
+) -> GetLastRecordsDM:
+    """
+    Request of the base candles that cover the last `params.n`
+      closed candles of `params.bar` and the forming one.
+    Raises:
+        ValueError: If a bar is unknown or `params.bar` is not
+          a multiple of `base`.
+    """
+    ratio = _ratio(params.bar, base)
+    return GetLastRecordsDM(
+        instId=params.instId, bar=base, n=(params.n + 1) * ratio
+    )
+
+
+def _ratio(bar: str, base: str) -> int:
+    """
+    Raises:
+        ValueError: If a bar is unknown or `bar` is not a
+          multiple of `base`.
+    """
+    ratio, rest = divmod(bar_length(bar), bar_length(base))
+    if ratio == 0 or rest:
+        raise ValueError(f"Bar '{bar}' is not a multiple of '{base}'")
+    return ratio
+
+
+class BarResampler:
+    """
+    Higher-timeframe candles of one instrument, updated as its
+      base candles close.
+
+    Every timeframe keeps its last `lookback` closed candles in
+      preallocated columns and the forming candle as a few
+      scalars, so an `update` costs O(1) per timeframe. A
+      candle closes when the base bar that ends its bucket
+      arrives, or when a base bar of a later bucket does (the
+      last base bars were missing). A backfill followed by
+      updates yields the candles of `resample` over the whole
+      history, exactly up to the summation order of turnover.
+    """
+
+    def __init__(
+        self,
+        bars: Sequence[str],
+        base: str = BASE_BAR,
+        lookback: int = 1_000,
+        dtype: DTypeLike = np.float64
+    ) -> None:
+        """
+        Args:
+            bars (Sequence[str]): Timeframes to maintain.
+            base (str): Timeframe of the incoming candles.
+            lookback (int): Closed candles kept per timeframe,
+              e.g. `IndicatorSignals.lookback` of the strategy.
+            dtype (DTypeLike): Price dtype, float64 or float32.
+        Raises:
+            ValueError: If a bar is unknown or not a multiple
+              of `base`, `lookback` is not positive or the
+              dtype is not float64 or float32.
+        """
+        if lookback < 1:
+            raise ValueError(f"lookback must be positive, got {lookback}")
+        for bar in bars:
+            _ratio(bar, base)
+        self._base = bar_length(base)
+        self._series = {
+            bar: _BarSeries(bar_length(bar), lookback, _price_dtype(dtype))
+            for bar in bars
+        }
+        self._last_epoch: int | None = None
+
+    @property
+    def bars(self) -> tuple[str, ...]:
+        return tuple(self._series)
+
+    def backfill(self, data: PriceDataFrame) -> None:
+        """
+        Feeds a block of base candles, vectorized per timeframe.
+        Args:
+            data (PriceDataFrame): Base candles in chronological
+              order, newer than any candle fed before.
+        Raises:
+            ValueError: If `data` starts before the last candle
+              fed.
+        """
+        if data.empty:
+            return
+        self._check_order(int(data.epoch[0]))
+        last = int(data.epoch[-1])
+        for bar, series in self._series.items():
+            series.extend(resample(data, bar), last + self._base)
+        self._last_epoch = last
+
+    def update(
+        self,
+        date: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: int,
+        turnover: float
+    ) -> list[str]:
+        """
+        Feeds one closed base candle.
+        Args:
+            date (int): Open time of the candle, epoch
+              microseconds.
+        Returns:
+            list[str]: Timeframes whose candle closed with it.
+        Raises:
+            ValueError: If the candle is not newer than the last
+              candle fed.
+        """
+        date = int(date)
+        self._check_order(date)
+        self._last_epoch = date
+        end = date + self._base
+        bar = (
+            date, float(open_), float(high), float(low),
+            float(close), int(volume), float(turnover),
+        )
+        return [
+            name for name, series in self._series.items()
+            if series.update(bar, end)
+        ]
+
+    def frame(self, bar: str, forming: bool = False) -> PriceDataFrame:
+        """
+        Candles of one timeframe for the indicator classes.
+        Args:
+            bar (str): One of `bars`.
+            forming (bool): Append the candle still forming.
+        Returns:
+            PriceDataFrame: Up to `lookback` closed candles (plus
+              the forming one), oldest first. The columns are
+              views of the resampler buffers, valid until the
+              next `backfill` or `update`.
+        Raises:
+            KeyError: If `bar` is not maintained.
+        """
+        return self._series[bar].frame(forming)
+
+    def _check_order(self, date: int) -> None:
+        if self._last_epoch is not None and date <= self._last_epoch:
+            raise ValueError(
+                f"Base candle at {date} is not newer than the last "
+                f"one at {self._last_epoch}"
+            )
+
+
+class _BarSeries:
+    """
+    Closed candles of one timeframe and the one forming.
+
+    Columns hold `2 * lookback` rows; when they fill up the last
+      `lookback` rows are moved to the front, so appends are
+      amortized O(1). Row `n` is kept free for the forming
+      candle of `frame(forming=True)`.
+    """
+
+    def __init__(self, length: int, lookback: int, dtype: np.dtype) -> None:
+        self._length = length
+        self._lookback = lookback
+        capacity = 2 * lookback + 1
+        self._epoch = np.empty(capacity, dtype=np.int64)
+        self._columns = {
+            name: np.empty(capacity, dtype=dtype)
+            for name in ("open", "high", "low", "close")
+        }
+        # Turnover stays float64 in compact mode, as in `resample`
+        self._columns["turnover"] = np.empty(capacity, dtype=np.float64)
+        self._volume = np.empty(capacity, dtype=np.int64)
+        self._n = 0
+        # (bucket, open, high, low, close, volume, turnover)
+        self._forming: list | None = None
+
+    def update(self, bar: tuple, end: int) -> bool:
+        """
+        Merges a base candle ending at `end`.
+        Returns:
+            bool: Whether a candle closed.
+        """
+        date, open_, high, low, close, volume, turnover = bar
+        bucket = date - date % self._length
+        forming = self._forming
+        closed = False
+        if forming is not None and forming[0] != bucket:
+            self._close()
+            closed = True
+            forming = None
+        if forming is None:
+            self._forming = [
+                bucket, open_, high, low, close, volume, turnover
+            ]
+        else:
+            forming[2] = max(forming[2], high)
+            forming[3] = min(forming[3], low)
+            forming[4] = close
+            forming[5] += volume
+            forming[6] += turnover
+        if end >= bucket + self._length:
+            self._close()
+            closed = True
+        return closed
+
+    def extend(self, bars: PriceDataFrame, end: int) -> None:
+        """
+        Merges the resampled candles of a block of base candles
+          whose last one ends at `end`.
+        """
+        first = _row(bars, 0)
+        # The first candle may continue the forming one and is
+        # closed when a later one follows
+        closes = first[0] + self._length if len(bars) > 1 else end
+        self.update(first, closes)
+        if len(bars) > 1:
+            self._append_many(bars[1:-1])
+            self._forming = list(_row(bars, len(bars) - 1))
+            if end >= self._forming[0] + self._length:
+                self._close()
+
+    def frame(self, forming: bool) -> PriceDataFrame:
+        stop = self._n
+        if forming and self._forming is not None:
+            self._write(stop, self._forming)
+            stop += 1
+        start = max(self._n - self._lookback, 0)
+        window = slice(start, stop)
+        columns = self._columns
+        return PriceDataFrame.from_arrays(
+            date=self._epoch[window],
+            open_price=columns["open"][window],
+            close_price=columns["close"][window],
+            high_price=columns["high"][window],
+            low_price=columns["low"][window],
+            volume=self._volume[window],
+            turnover=columns["turnover"][window],
+            dtype=columns["close"].dtype,
+        )
+
+    def _close(self) -> None:
+        self._reserve(1)
+        self._write(self._n, self._forming)
+        self._n += 1
+        self._forming = None
+
+    def _append_many(self, bars: PriceDataFrame) -> None:
+        count = len(bars)
+        if count == 0:
+            return
+        if count >= self._lookback:
+            # Older candles would be dropped anyway
+            bars = bars.tail(self._lookback)
+            count = self._lookback
+            self._n = 0
+        self._reserve(count)
+        rows = slice(self._n, self._n + count)
+        self._epoch[rows] = bars.epoch
+        self._columns["open"][rows] = bars.open_price
+        self._columns["high"][rows] = bars.high_prices
+        self._columns["low"][rows] = bars.low_prices
+        self._columns["close"][rows] = bars.close_prices
+        self._columns["turnover"][rows] = bars.turnover
+        self._volume[rows] = bars.volumes
+        self._n += count
+
+    def _reserve(self, count: int) -> None:
+        """
+        Frees `count` rows plus the forming row, dropping
+          candles older than `lookback`.
+        """
+        if self._n + count < self._epoch.shape[0]:
+            return
+        keep = max(self._lookback - count, 0)
+        src = slice(self._n - keep, self._n)
+        self._epoch[:keep] = self._epoch[src]
+        self._volume[:keep] = self._volume[src]
+        for column in self._columns.values():
+            column[:keep] = column[src]
+        self._n = keep
+
+    def _write(self, row: int, bar: list) -> None:
+        self._epoch[row] = bar[0]
+        self._columns["open"][row] = bar[1]
+        self._columns["high"][row] = bar[2]
+        self._columns["low"][row] = bar[3]
+        self._columns["close"][row] = bar[4]
+        self._volume[row] = bar[5]
+        self._columns["turnover"][row] = bar[6]
+
+
+def _row(bars: PriceDataFrame, i: int) -> tuple:
+    return (
+        int(bars.epoch[i]),
+        float(bars.open_price[i]),
+        float(bars.high_prices[i]),
+        float(bars.low_prices[i]),
+        float(bars.close_prices[i]),
+        int(bars.volumes[i]),
+        float(bars.turnover[i]),
+    )
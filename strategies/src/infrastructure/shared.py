@@ -0,0 +1,221 @@
+"""
+Candles of one instrument in a shared memory ring buffer.
+
+The writer (the process ingesting candles) appends bars; any
+number of processes attach to the buffer by name and read the
+newest bars as a `PriceDataFrame` whose columns are views of
+the shared memory, so candles never have to be pickled to the
+processes that evaluate indicators.
+
+Every column holds each bar twice, at `slot` and at
+`slot + capacity`: the last `n <= capacity` bars are then always
+one contiguous slice, whatever the position of the ring. The bar
+count in the header is published after the bar is written. A
+reader that takes the last `n` bars may keep using them while
+the writer appends up to `capacity - n` more; later appends
+overwrite them.
+"""
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from numpy.typing import DTypeLike, NDArray
+
+from strategies.src.infrastructure._types import PriceDataFrame, _price_dtype
+
+# Header: bars written, capacity, price dtype code
+_COUNT, _CAPACITY, _DTYPE = range(3)
+_HEADER = 4
+_DTYPES = (np.dtype(np.float64), np.dtype(np.float32))
+_INT_COLUMNS = ("epoch", "volume")
+_PRICE_COLUMNS = ("open", "high", "low", "close")
+# Turnover is float64 whatever the price dtype, as in PriceDataFrame
+_WIDE_COLUMNS = (*_INT_COLUMNS, "turnover")
+
+
+class SharedCandles:
+    """
+    Ring buffer of the last `capacity` candles of one instrument
+      in `multiprocessing.shared_memory`.
+
+    Create it in the writer with `create`, attach to it in other
+      processes with `attach(name)`. Only one process may write.
+      The creator calls `unlink` once every process is done.
+    """
+
+    def __init__(self, shm: SharedMemory) -> None:
+        self._shm = shm
+        self._header = np.ndarray(
+            _HEADER, dtype=np.int64, buffer=shm.buf
+        )
+        capacity = int(self._header[_CAPACITY])
+        dtype = _DTYPES[int(self._header[_DTYPE])]
+        offset = self._header.nbytes
+        self._columns: dict[str, NDArray] = {}
+        for name in (*_WIDE_COLUMNS, *_PRICE_COLUMNS):
+            column_dtype = (
+                np.int64 if name in _INT_COLUMNS
+                else np.float64 if name == "turnover"
+                else dtype
+            )
+            column = np.ndarray(
+                2 * capacity, dtype=column_dtype, buffer=shm.buf,
+                offset=offset,
+            )
+            self._columns[name] = column
+            offset += column.nbytes
+
+    @classmethod
+    def create(
+        cls,
+        capacity: int,
+        dtype: DTypeLike = np.float64,
+        name: str | None = None
+    ) -> "SharedCandles":
+        """
+        Allocates an empty buffer.
+        Args:
+            capacity (int): Bars kept.
+            dtype (DTypeLike): Price dtype, float64 or float32.
+            name (str | None): Shared memory name, generated
+              when omitted.
+        Raises:
+            ValueError: If `capacity` is not positive or the
+              dtype is not float64 or float32.
+            FileExistsError: If the name is taken.
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        dtype = _price_dtype(dtype)
+        size = 8 * (
+            _HEADER
+            + 2 * capacity * len(_WIDE_COLUMNS)
+        ) + dtype.itemsize * 2 * capacity * len(_PRICE_COLUMNS)
+        shm = SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray(_HEADER, dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[_CAPACITY] = capacity
+        header[_DTYPE] = _DTYPES.index(dtype)
+        del header
+        return cls(shm)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedCandles":
+        """
+        Opens a buffer created by another process.
+        Raises:
+            FileNotFoundError: If there is no buffer `name`.
+        """
+        return cls(SharedMemory(name=name))
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def capacity(self) -> int:
+        return int(self._header[_CAPACITY])
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._columns["close"].dtype
+
+    @property
+    def bars_written(self) -> int:
+        return int(self._header[_COUNT])
+
+    def append(self, data: PriceDataFrame) -> None:
+        """
+        Writes a block of candles after the last one; only the
+          last `capacity` of them are kept.
+        Args:
+            data (PriceDataFrame): Candles in chronological order.
+        """
+        capacity = self.capacity
+        data = data.tail(capacity)
+        count = self.bars_written
+        slots = np.arange(count, count + len(data)) % capacity
+        mirror = slots + capacity
+        for name, values in (
+            ("epoch", data.epoch),
+            ("open", data.open_price),
+            ("high", data.high_prices),
+            ("low", data.low_prices),
+            ("close", data.close_prices),
+            ("volume", data.volumes),
+            ("turnover", data.turnover),
+        ):
+            column = self._columns[name]
+            column[slots] = values
+            column[mirror] = values
+        # Publish the bars once they are written
+        self._header[_COUNT] = count + len(data)
+
+    def update(
+        self,
+        date: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: int,
+        turnover: float
+    ) -> None:
+        """
+        Writes one closed candle.
+        Args:
+            date (int): Open time, epoch microseconds.
+        """
+        count = self.bars_written
+        capacity = self.capacity
+        columns = self._columns
+        for slot in (count % capacity, count % capacity + capacity):
+            columns["epoch"][slot] = date
+            columns["open"][slot] = open_
+            columns["high"][slot] = high
+            columns["low"][slot] = low
+            columns["close"][slot] = close
+            columns["volume"][slot] = volume
+            columns["turnover"][slot] = turnover
+        self._header[_COUNT] = count + 1
+
+    def frame(self, n: int | None = None) -> PriceDataFrame:
+        """
+        The newest candles, oldest first.
+        Args:
+            n (int | None): Candles to read, at most `capacity`;
+              all kept candles when omitted.
+        Returns:
+            PriceDataFrame: Views of the shared columns, see the
+              module docstring for how long they stay valid.
+        """
+        count = self.bars_written
+        capacity = self.capacity
+        n = min(count, capacity, capacity if n is None else n)
+        start = (count - n) % capacity
+        window = slice(start, start + n)
+        columns = self._columns
+        return PriceDataFrame.from_arrays(
+            date=columns["epoch"][window],
+            open_price=columns["open"][window],
+            close_price=columns["close"][window],
+            high_price=columns["high"][window],
+            low_price=columns["low"][window],
+            volume=columns["volume"][window],
+            turnover=columns["turnover"][window],
+            dtype=self.dtype,
+        )
+
+    def close(self) -> None:
+        """
+        Detaches this process; frames read before must no
+          longer be used.
+        """
+        self._header = None
+        self._columns = {}
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """
+        Frees the shared memory once every process closed it.
+        """
+        self._shm.unlink()
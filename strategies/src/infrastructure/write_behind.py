@@ -0,0 +1,359 @@
+"""
+Write-behind buffer in front of the candle repository.
+
+Live ingestion stores one candle per instrument and timeframe at
+every bar close; `DataQueryRepo.insert_record` turns each of them
+into an HTTP round trip. `WriteBehindBuffer` takes the records
+instead, groups them per table and stores a group with
+`insert_many_data` calls of at most `max_batch` records once it
+holds `max_batch` records, its oldest record is `max_age` seconds
+old, or the buffer closes.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from strategies.src.application.interfaces import IDataQuery
+from strategies.src.domain.entities import (
+    CreateTableDM,
+    Data,
+    GetLastRecordsDM,
+    GetRangeRecordsDM,
+    InsertManyRecordsDM,
+    InsertRecordDM,
+)
+from strategies.src.infrastructure._types import PriceDataFrame
+
+logger = logging.getLogger(__name__)
+
+# Table of a record: (instId, bar)
+TableKey = tuple[str, str]
+
+
+@dataclass(slots=True, frozen=True)
+class WriteBehindStats:
+    """
+    Counters of a `WriteBehindBuffer`.
+    `pending` records wait in `pending_tables` groups; flush
+    latencies are the seconds of the last `insert_many_data`
+    calls (up to `latency_window`).
+    """
+    pending: int
+    pending_tables: int
+    flushed: int
+    flushes: int
+    failed_flushes: int
+    last_latency: float
+    mean_latency: float
+    max_latency: float
+
+
+class _Group:
+    __slots__ = ("records", "since")
+
+    def __init__(self, since: float) -> None:
+        self.records: list[Data] = []
+        # Loop time the oldest record arrived
+        self.since = since
+
+
+class WriteBehindBuffer(IDataQuery):
+    """
+    Coalesces single-record inserts into batched inserts.
+
+    `insert_record` returns as soon as the record is buffered; only
+      when `max_pending` records are waiting does it block until a
+      flush makes room (backpressure). A flush sends at most
+      `max_batch` records; the rest of the group stays queued
+      for the next one. A failed flush puts its records back in
+      front of their group and is retried by the next flush of
+      that group. Flushes of a table run one at a time, in
+      order; reads of a table first wait for its flush in flight
+      and flush all its records still waiting in the buffer.
+
+    Start it with `start` (or `async with`) and `close` it to
+      flush what is left.
+    """
+
+    def __init__(
+        self,
+        repo: IDataQuery,
+        max_batch: int = 500,
+        max_age: float = 1.0,
+        max_pending: int = 50_000,
+        latency_window: int = 1_000
+    ) -> None:
+        """
+        Args:
+            repo (IDataQuery): Repository the batches go to.
+            max_batch (int): Records of a table that trigger its
+              flush, and the most records one flush sends.
+            max_age (float): Seconds a record may wait.
+            max_pending (int): Records buffered before
+              `insert_record` blocks.
+            latency_window (int): Flush latencies kept for `stats`.
+        """
+        self._repo = repo
+        self._max_batch = max_batch
+        self._max_age = max_age
+        self._max_pending = max_pending
+        self._groups: dict[TableKey, _Group] = {}
+        # Held while a flush of the table is in flight
+        self._flushing: dict[TableKey, asyncio.Lock] = {}
+        self._pending = 0
+        self._room = asyncio.Condition()
+        self._wakeup = asyncio.Event()
+        self._flusher: asyncio.Task | None = None
+        self._closed = False
+        self._flushed = 0
+        self._flushes = 0
+        self._failed = 0
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+
+    async def __aenter__(self) -> "WriteBehindBuffer":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._pending
+
+    def stats(self) -> WriteBehindStats:
+        latencies = self._latencies
+        return WriteBehindStats(
+            pending=self._pending,
+            pending_tables=len(self._groups),
+            flushed=self._flushed,
+            flushes=self._flushes,
+            failed_flushes=self._failed,
+            last_latency=latencies[-1] if latencies else 0.0,
+            mean_latency=(
+                sum(latencies) / len(latencies) if latencies else 0.0
+            ),
+            max_latency=max(latencies, default=0.0),
+        )
+
+    def start(self) -> None:
+        """
+        Starts the background flush on the running loop.
+        """
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run())
+
+    async def insert_record(self, params: InsertRecordDM) -> bool:
+        """
+        Buffers one record; waits for room while the buffer is
+          full.
+        Returns:
+            bool: Always True; the record is stored by a later
+              flush.
+        Raises:
+            RuntimeError: If the buffer is closed.
+        """
+        if self._closed:
+            raise RuntimeError("WriteBehindBuffer is closed")
+        async with self._room:
+            if self._pending >= self._max_pending:
+                self._wakeup.set()
+                await self._room.wait_for(
+                    lambda: self._pending < self._max_pending
+                )
+            key = (params.instId, params.bar)
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = _Group(self._now())
+                # A new deadline may be earlier than the one awaited
+                self._wakeup.set()
+            group.records.append(params)
+            self._pending += 1
+            if len(group.records) >= self._max_batch:
+                self._wakeup.set()
+        return True
+
+    async def insert_many_data(self, params: InsertManyRecordsDM) -> bool:
+        """
+        Stores a batch directly, after the pending records of its
+          table, in parts of at most `max_batch` records.
+        """
+        key = (params.instId, params.bar)
+        async with self._flush_lock(key):
+            while await self._flush_pending(key):
+                pass
+            stored = True
+            for start in range(0, len(params.data), self._max_batch):
+                stored &= await self._repo.insert_many_data(
+                    InsertManyRecordsDM(
+                        instId=params.instId,
+                        bar=params.bar,
+                        data=params.data[start:start + self._max_batch],
+                    )
+                )
+            return stored
+
+    async def flush(self) -> None:
+        """
+        Flushes every table.
+        Raises:
+            Exception: The first error of a failed flush; its
+              records stay buffered.
+        """
+        results = await asyncio.gather(
+            *(self._flush_group(key) for key in list(self._groups)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def close(self) -> None:
+        """
+        Stops accepting records and flushes the rest.
+        Raises:
+            Exception: If the final flush fails.
+        """
+        self._closed = True
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+
+    async def create_datatable(self, params: CreateTableDM) -> bool:
+        return await self._repo.create_datatable(params)
+
+    async def get_last_records(
+        self,
+        params: GetLastRecordsDM
+    ) -> PriceDataFrame:
+        await self._flush_group((params.instId, params.bar))
+        return await self._repo.get_last_records(params)
+
+    async def get_records_by_date_range(
+        self,
+        params: GetRangeRecordsDM
+    ) -> PriceDataFrame:
+        await self._flush_group((params.instId, params.bar))
+        return await self._repo.get_records_by_date_range(params)
+
+    async def iter_records_by_date_range(
+        self,
+        params: GetRangeRecordsDM,
+        chunk_size: int = 100_000
+    ) -> AsyncIterator[PriceDataFrame]:
+        await self._flush_group((params.instId, params.bar))
+        async for chunk in self._repo.iter_records_by_date_range(
+            params, chunk_size
+        ):
+            yield chunk
+
+    async def _run(self) -> None:
+        while True:
+            timeout = None
+            if self._groups:
+                oldest = min(group.since for group in self._groups.values())
+                timeout = max(oldest + self._max_age - self._now(), 0.0)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            now = self._now()
+            due = [
+                key for key, group in self._groups.items()
+                if len(group.records) >= self._max_batch
+                or now - group.since >= self._max_age
+                or self._pending >= self._max_pending
+            ]
+            results = await asyncio.gather(
+                *(self._flush_batch(key) for key in due),
+                return_exceptions=True,
+            )
+            for key, result in zip(due, results):
+                if isinstance(result, Exception):
+                    logger.error(
+                        "Write-behind flush of %s_%s failed: %s",
+                        *key, result,
+                    )
+            if any(isinstance(result, Exception) for result in results):
+                # Back off before retrying the failed groups
+                await asyncio.sleep(self._max_age)
+            elif any(result is True for result in results):
+                # Groups with records left are due again at once
+                self._wakeup.set()
+
+    async def _flush_batch(self, key: TableKey) -> bool:
+        """
+        Flushes one batch of a table after its flush in flight,
+          if any.
+        Returns:
+            bool: Whether records of the table are left.
+        """
+        async with self._flush_lock(key):
+            return await self._flush_pending(key)
+
+    async def _flush_group(self, key: TableKey) -> None:
+        """
+        Flushes every record of a table after its flush in
+          flight, if any.
+        """
+        async with self._flush_lock(key):
+            while await self._flush_pending(key):
+                pass
+
+    def _flush_lock(self, key: TableKey) -> asyncio.Lock:
+        lock = self._flushing.get(key)
+        if lock is None:
+            lock = self._flushing[key] = asyncio.Lock()
+        return lock
+
+    async def _flush_pending(self, key: TableKey) -> bool:
+        """
+        Stores the oldest `max_batch` records of a table.
+        Returns:
+            bool: Whether records of the table are left.
+        """
+        group = self._groups.get(key)
+        if group is None:
+            return False
+        records = group.records[:self._max_batch]
+        if len(records) < len(group.records):
+            # The rest keeps its place and age
+            group.records = group.records[len(records):]
+        else:
+            del self._groups[key]
+        started = time.perf_counter()
+        try:
+            await self._repo.insert_many_data(
+                InsertManyRecordsDM(instId=key[0], bar=key[1], data=records)
+            )
+        except Exception:
+            self._failed += 1
+            # Back in front of what is left or arrived meanwhile
+            current = self._groups.get(key)
+            if current is None:
+                group.records = records
+                self._groups[key] = group
+            else:
+                current.records[:0] = records
+                current.since = min(current.since, group.since)
+            raise
+        self._latencies.append(time.perf_counter() - started)
+        self._flushes += 1
+        self._flushed += len(records)
+        self._pending -= len(records)
+        async with self._room:
+            self._room.notify_all()
+        return key in self._groups
+
+    @staticmethod
+    def _now() -> float:
+        return asyncio.get_running_loop().time()
@@ -1,10 +1,16 @@
 from typing import AsyncIterable
 
-from dishka import Provider, Scope, provide
+from dishka import Provider, Scope, from_context, provide
+from faststream.rabbit import RabbitBroker
 from httpx import AsyncClient
 
+from strategies.src.config import Config
+
 
 class MyProvider(Provider):
+    config = from_context(provides=Config, scope=Scope.APP)
+    broker = from_context(provides=RabbitBroker, scope=Scope.APP)
+
     @provide(scope=Scope.REQUEST)
     async def get_session(
         self, 
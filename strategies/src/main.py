@@ -0,0 +1,78 @@
+import asyncio
+import logging
+import time
+
+from dishka import make_async_container
+from dishka.integrations.faststream import setup_dishka
+from faststream import FastStream
+from faststream.rabbit import RabbitBroker
+
+from strategies.src.config import Config
+from strategies.src.controllers.amqp import controller
+from strategies.src.infrastructure.broker import new_broker
+from strategies.src.infrastructure.indicators.jit import warm_up
+from strategies.src.ioc import MyProvider
+
+logger = logging.getLogger(__name__)
+
+
+def startup(precisions: tuple[str, ...] = ("float64",)) -> None:
+    """
+    Compiles the indicator kernels (or loads them from the
+    numba cache) before the service reports ready, so the
+    first evaluations after a deploy do not stall. Add
+    "float32" to `precisions` when candles are loaded in the
+    compact mode.
+    Blocks for the whole warm-up (minutes with a cold cache),
+    so it is a plain function, called by `get_faststream_app`
+    before the event loop starts, and not a coroutine. It must
+    run on the main thread: numba starts its parallel thread
+    pool while loading the kernels, and a pool started from a
+    worker thread (`asyncio.to_thread`) hangs the interpreter
+    on exit.
+    """
+    started = time.perf_counter()
+    stats = warm_up(logger.debug, precisions)
+    slowest = max(stats, key=lambda stat: stat.seconds)
+    logger.info(
+        "%d numba kernels ready in %.1f s (%d/%d signatures cached, "
+        "slowest %s %.2f s)",
+        len(stats),
+        time.perf_counter() - started,
+        sum(stat.cached for stat in stats),
+        sum(stat.signatures for stat in stats),
+        slowest.name,
+        slowest.seconds,
+    )
+
+
+def get_faststream_app() -> FastStream:
+    """
+    The strategies service; its kernels are ready before the
+    broker consumes the first message.
+
+        faststream run strategies.src.main:get_faststream_app --factory
+    """
+    config = Config()
+    startup(config.kernels.precisions)
+    broker = new_broker(config.rabbit)
+    container = make_async_container(
+        MyProvider(),
+        context={
+            Config: config,
+            RabbitBroker: broker
+        }
+    )
+    faststream_app = FastStream(broker)
+    setup_dishka(
+        container=container,
+        app=faststream_app,
+        auto_inject=True
+    )
+    broker.include_router(controller)
+    return faststream_app
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(get_faststream_app().run())
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from strategies.benchmarks.synthetic import REGIMES, synthetic_ohlcv
+from strategies.src.infrastructure.indicators.avsl import (
+    EXACT_WINDOW,
+    _compute_price_v,
+)
+
+# Prefix sums of long windows stay within a few ulp of the per-window sum
+LONG_WINDOW_RTOL = 2e-15
+
+
+def _price_v_formula(low, vpr, lenV, VPCc):
+    # The per-window price function the prefix sums replaced
+    out = np.empty(low.shape[0], dtype=np.float64)
+    for i in range(low.shape[0]):
+        L = lenV[i]
+        if L > 0:
+            window = slice(max(0, i - L + 1), i + 1)
+            s = np.sum(
+                np.divide(
+                    low[window],
+                    VPCc[i] * vpr[window],
+                    out=np.zeros_like(low[window]),
+                    where=(VPCc[i] != 0) & (vpr[window] != 0),
+                )
+            )
+            out[i] = s / L / 100.0
+        else:
+            out[i] = low[i]
+    return out
+
+
+def _inputs(regime: str, seed: int, max_len: int):
+    rng = np.random.default_rng(seed)
+    low = synthetic_ohlcv(5_000, regime, seed).low_prices.copy()
+    low[rng.integers(0, len(low), 5)] = np.nan
+    vpr = rng.normal(1.0, 0.01, len(low))
+    vpr[rng.integers(0, len(low), 50)] = 0.0
+    lenV = rng.integers(-2, max_len, len(low))
+    VPCc = rng.choice([-7.0, -1.0, 0.0, 1.0, 2.5], len(low))
+    return low, vpr, lenV, VPCc
+
+
+@pytest.mark.parametrize("regime", REGIMES)
+@pytest.mark.parametrize("int_type", [np.int64, np.int32])
+def test_short_windows_match_the_formula_exactly(regime, int_type) -> None:
+    for seed in range(3):
+        low, vpr, lenV, VPCc = _inputs(regime, seed, EXACT_WINDOW)
+        lenV = lenV.astype(int_type)
+        np.testing.assert_array_equal(
+            _compute_price_v(low, vpr, lenV, VPCc),
+            _price_v_formula(low, vpr, lenV, VPCc),
+        )
+
+
+@pytest.mark.parametrize("regime", REGIMES)
+def test_long_windows_match_the_formula_to_rtol(regime) -> None:
+    for seed in range(3):
+        low, vpr, lenV, VPCc = _inputs(regime, seed, 300)
+        np.testing.assert_allclose(
+            _compute_price_v(low, vpr, lenV, VPCc),
+            _price_v_formula(low, vpr, lenV, VPCc),
+            rtol=LONG_WINDOW_RTOL,
+            atol=0,
+        )
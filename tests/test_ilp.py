@@ -0,0 +1,162 @@
+import asyncio
+import math
+import socket
+
+import pytest
+
+from strategies.src.domain.entities import Data, InsertManyRecordsDM
+from strategies.src.infrastructure.ilp import IlpWriter, encode_records
+
+
+class _Server:
+    """Local ILP endpoint: collects the lines of every connection."""
+
+    def __init__(self) -> None:
+        self.lines: list[bytes] = []
+        self.connections = 0
+        self._writers: list[asyncio.StreamWriter] = []
+        self._server: asyncio.Server | None = None
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def __aenter__(self) -> "_Server":
+        self._server = await asyncio.start_server(
+            self._handle, "127.0.0.1", 0
+        )
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self.drop_connections()
+        self._server.close()
+        await self._server.wait_closed()
+
+    def drop_connections(self) -> None:
+        for writer in self._writers:
+            writer.close()
+        self._writers.clear()
+
+    async def wait_for(self, count: int, timeout: float = 5.0) -> None:
+        async with asyncio.timeout(timeout):
+            while len(self.lines) < count:
+                await asyncio.sleep(0.01)
+
+    async def _handle(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        self._writers.append(writer)
+        while line := await reader.readline():
+            self.lines.append(line)
+
+
+def _batch(start: int, count: int) -> InsertManyRecordsDM:
+    return InsertManyRecordsDM(
+        instId="BTC-USDT",
+        bar="1m",
+        data=[
+            Data(
+                date=f"2024-01-01T00:{minute:02d}:00.000000Z",
+                open_price=1.0,
+                close_price=2.0,
+                high_price=3.0,
+                low_price=0.5,
+                volume=minute,
+                turnover=6.0,
+            )
+            for minute in range(start, start + count)
+        ],
+    )
+
+
+def _unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_flushes_when_the_buffer_reaches_max_bytes() -> None:
+    async def scenario() -> None:
+        async with _Server() as server:
+            line = len(encode_records("BTC-USDT_1m_data", _batch(0, 1).data))
+            async with IlpWriter(
+                port=server.port, max_bytes=5 * line, flush_interval=0
+            ) as writer:
+                await writer.write(_batch(0, 4))
+                assert writer.pending_bytes == 4 * line
+                await writer.write(_batch(4, 1))
+                assert writer.pending_bytes == 0
+                await server.wait_for(5)
+                assert server.lines[0].startswith(b"BTC-USDT_1m_data ")
+                assert b"volume=4i" in server.lines[4]
+
+    asyncio.run(scenario())
+
+
+def test_reconnects_after_the_server_closes() -> None:
+    async def scenario() -> None:
+        async with _Server() as server:
+            async with IlpWriter(
+                port=server.port, flush_interval=0, retry_delay=0.01
+            ) as writer:
+                await writer.write(_batch(0, 3))
+                await writer.flush()
+                await server.wait_for(3)
+                server.drop_connections()
+                await asyncio.sleep(0.05)
+
+                await writer.write(_batch(3, 2))
+                await writer.flush()
+                assert writer.pending_bytes == 0
+                # The batch sent before the close is in doubt and
+                # goes again, ahead of the new one
+                await server.wait_for(8)
+                assert server.connections == 2
+                assert [b"volume=%di" % i in line for i, line in zip(
+                    (0, 1, 2, 0, 1, 2, 3, 4), server.lines
+                )] == [True] * 8
+
+    asyncio.run(scenario())
+
+
+def test_write_past_the_buffer_cap_raises() -> None:
+    async def scenario() -> None:
+        line = len(encode_records("BTC-USDT_1m_data", _batch(0, 1).data))
+        # Nothing listens: flushes fail, the buffer only grows
+        writer = IlpWriter(
+            port=_unused_port(),
+            max_bytes=2 * line,
+            flush_interval=0,
+            retries=0,
+            # Writes only buffer until the failed flush is retried
+            retry_delay=60.0,
+            max_buffer_bytes=4 * line,
+        )
+        await writer.write(_batch(0, 1))
+        with pytest.raises(ConnectionError):
+            await writer.write(_batch(1, 1))
+        await writer.write(_batch(2, 2))
+        assert writer.pending_bytes == 4 * line
+        with pytest.raises(BufferError):
+            await writer.write(_batch(4, 1))
+        assert writer.pending_bytes == 4 * line
+
+    asyncio.run(scenario())
+
+
+def test_non_finite_values_are_rejected() -> None:
+    batch = _batch(0, 2)
+    batch.data[1] = Data(
+        date=batch.data[1].date,
+        open_price=1.0,
+        close_price=math.nan,
+        high_price=3.0,
+        low_price=0.5,
+        volume=1,
+        turnover=math.inf,
+    )
+    with pytest.raises(ValueError):
+        encode_records("BTC-USDT_1m_data", batch.data)
@@ -0,0 +1,23 @@
+import pytest
+
+pytest.importorskip("talib")
+pytest.importorskip("pandas_ta")
+
+from strategies.benchmarks import parity  # noqa: E402
+from strategies.benchmarks.synthetic import REGIMES, synthetic_ohlcv  # noqa: E402
+
+try:
+    parity.check_pandas_ta()
+except RuntimeError as error:
+    pytest.skip(str(error), allow_module_level=True)
+
+PAIRS = {**parity.PRIMITIVES, **parity.INDICATORS}
+
+
+@pytest.mark.parametrize("regime", REGIMES)
+@pytest.mark.parametrize("name", list(PAIRS))
+def test_compiled_matches_reference(name: str, regime: str) -> None:
+    data = synthetic_ohlcv(2_000, regime, 0)
+    compiled, reference = PAIRS[name]
+    result = parity.compare(compiled(data), reference(data))
+    assert result["ok"], result
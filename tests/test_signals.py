@@ -0,0 +1,53 @@
+import numpy as np
+
+from strategies.benchmarks.synthetic import REGIMES, synthetic_ohlcv
+from strategies.src.domain.entities import (
+    AcceletrationBandsDM,
+    RsiCloudsConfigDM,
+    ScrsiConfigDM,
+    StochRsiConfigDM,
+)
+from strategies.src.infrastructure.indicators.signals import IndicatorSignals
+
+SIGNAL_CONFIGS = (
+    AcceletrationBandsDM(length=20, drift=1, offset=0),
+    RsiCloudsConfigDM(),
+    ScrsiConfigDM(),
+    StochRsiConfigDM(
+        timeperiod=14, fastk_period=14, fastd_period=3, fastd_matype=0
+    ),
+    StochRsiConfigDM(
+        timeperiod=14, fastk_period=5, fastd_period=3, fastd_matype=1
+    ),
+)
+
+
+def _assert_last_matches_full(configs, step: int = 7) -> None:
+    signals = IndicatorSignals()
+    lookback = signals.lookback(configs)
+    for regime in REGIMES:
+        for seed in range(3):
+            data = synthetic_ohlcv(lookback + 1_500, regime, seed)
+            full = signals.evaluate(data, configs)
+            for end in range(lookback + 1, len(data) + 1, step):
+                last = signals.last(data[:end], configs)
+                assert last.tolist() == full[:, end - 1].tolist(), (
+                    regime, seed, end
+                )
+
+
+def test_last_matches_full_history() -> None:
+    # Alone, each config is evaluated on its own (shortest) tail
+    for config in SIGNAL_CONFIGS:
+        _assert_last_matches_full((config,))
+    _assert_last_matches_full(SIGNAL_CONFIGS)
+
+
+def test_last_matches_full_history_in_compact_mode() -> None:
+    signals = IndicatorSignals()
+    lookback = signals.lookback(SIGNAL_CONFIGS)
+    data = synthetic_ohlcv(lookback + 1_500, REGIMES[0], 0).astype(np.float32)
+    full = signals.evaluate(data, SIGNAL_CONFIGS)
+    for end in range(lookback + 1, len(data) + 1, 7):
+        last = signals.last(data[:end], SIGNAL_CONFIGS)
+        assert last.tolist() == full[:, end - 1].tolist(), end
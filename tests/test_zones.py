@@ -0,0 +1,34 @@
+import numpy as np
+
+from strategies.src.infrastructure.indicators.zones import OrderBlockZones
+
+
+def _assert_all_miss(result: dict[str, np.ndarray], n: int) -> None:
+    assert result["zone_id"].tolist() == [-1] * n
+    assert result["kind"].dtype == np.int8
+    assert result["kind"].tolist() == [0] * n
+    assert np.isnan(result["lower"]).all() and result["lower"].shape == (n,)
+    assert np.isnan(result["upper"]).all() and result["upper"].shape == (n,)
+
+
+def test_query_many_on_empty_store() -> None:
+    store = OrderBlockZones()
+    _assert_all_miss(
+        store.query_many(["BTC-USDT", "ETH-USDT"], np.array([1.0, 2.0])), 2
+    )
+
+
+def test_query_many_after_every_zone_left() -> None:
+    store = OrderBlockZones()
+    peak = store.add_zone("BTC-USDT", "peak", 10.0, 12.0, bar=5)
+    store.add_zone("ETH-USDT", "valley", 1.0, 2.0, bar=3)
+
+    result = store.query_many(["BTC-USDT", "ETH-USDT"], np.array([11.0, 3.0]))
+    assert result["zone_id"].tolist() == [peak, -1]
+    assert result["kind"].tolist() == [1, 0]
+
+    store.mitigate("BTC-USDT", 13.0)
+    store.expire("ETH-USDT", before_bar=4)
+    _assert_all_miss(
+        store.query_many(["BTC-USDT", "ETH-USDT"], np.array([11.0, 1.5])), 2
+    )